@@ -14,24 +14,14 @@ const useOwnerData = (pundId, role) => {
     
     setLoading(true);
     try {
-      // Fetch fund summary
-      const fundResponse = await api.get(`/finance/pund/${pundId}/fund-summary/`);
-      console.log('Fund Summary:', fundResponse.data);
-      setFundSummary(fundResponse.data);
-
-      // Fetch saving summary
-      const savingResponse = await api.get(`/finance/pund/${pundId}/saving-summary/`);
-      console.log('Saving Summary:', savingResponse.data);
-      setSavingSummary(savingResponse.data);
-
-      // Fetch all loans in pund
-      const loansResponse = await api.get(`/finance/pund/${pundId}/loans/`);
-      console.log('Loans:', loansResponse.data);
-      setLoans(loansResponse.data);
-
-      // Fetch audit logs
-      const auditResponse = await api.get(`/finance/pund/${pundId}/audit-logs/`);
-      setAuditLogs(auditResponse.data);
+      // Fund, savings, loans and audit logs in one round-trip
+      const response = await api.get(`/punds/${pundId}/dashboard/`, {
+        params: { include: 'fund,savings,loans,audit' },
+      });
+      setFundSummary(response.data.fund);
+      setSavingSummary(response.data.savings);
+      setLoans(response.data.loans);
+      setAuditLogs(response.data.audit.results);
     } catch (error) {
       console.error('Error fetching owner data:', error);
       toast.error('Failed to load owner data');
@@ -242,11 +242,16 @@ const ChangePassword = () => {
     if (!validate()) return;
     setLoading(true);
     try {
-      await api.post('/users/change-password/', {
+      const res = await api.post('/users/change-password/', {
         current_password: formData.old_password,
         new_password:     formData.new_password,
         confirm_password: formData.confirm_password,
       });
+      // Older tokens are revoked by a password change; keep this session on the new ones
+      if (res.data?.access) {
+        localStorage.setItem('access_token', res.data.access);
+        localStorage.setItem('refresh_token', res.data.refresh);
+      }
       toast.success('Password changed successfully');
       setFormData({ old_password: '', new_password: '', confirm_password: '' });
       setErrors({});
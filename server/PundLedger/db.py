@@ -0,0 +1,146 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_routing    = ContextVar("db_routing", default=None)
+_lag_checks = {}  # alias -> (checked_at, lag seconds or None when unreachable)
+
+
+class _RequestRouting:
+    __slots__ = ("alias", "wrote", "atomic_depth")
+
+    def __init__(self, alias=None):
+        self.alias        = alias
+        self.wrote        = False
+        self.atomic_depth = len(connections["default"].atomic_blocks)
+
+
+def replica_aliases():
+    return list(getattr(settings, "REPLICA_DATABASES", ()))
+
+
+def replica_lag(alias):
+    """
+    Replication delay of ``alias`` in seconds, or None when it cannot be reached.
+
+    Measured at most every REPLICA_LAG_CHECK_SECONDS per process; a replica
+    that has replayed everything it received counts as zero lag.
+    """
+    now     = time.monotonic()
+    checked = _lag_checks.get(alias)
+    if checked and now - checked[0] < getattr(settings, "REPLICA_LAG_CHECK_SECONDS", 5):
+        return checked[1]
+
+    connection = connections[alias]
+    try:
+        if connection.vendor != "postgresql":
+            lag = 0.0
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+    except DatabaseError:
+        connection.close()
+        lag = None
+    _lag_checks[alias] = (now, lag)
+    return lag
+
+
+def pick_replica():
+    """A random replica within REPLICA_MAX_LAG_SECONDS, or None to stay on the primary."""
+    max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5)
+    healthy = [alias for alias in replica_aliases() if (lag := replica_lag(alias)) is not None and lag <= max_lag]
+    return random.choice(healthy) if healthy else None
+
+
+def _pin_key(user_id):
+    return f"db-primary-pin:{user_id}"
+
+
+def _token_user_id(request):
+    """User id from a valid bearer token, without touching the database."""
+    header = request.META.get("HTTP_AUTHORIZATION", "").split()
+    if len(header) != 2 or header[0] not in jwt_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        return AccessToken(header[1]).get(jwt_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica chosen for the current request, if any; everything else to ``default``.
+
+    Once a request writes, or while it has a transaction open on the
+    primary, its reads stay on the primary too.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.alias is None or state.wrote:
+            return "default"
+        if len(connections["default"].atomic_blocks) > state.atomic_depth:
+            return "default"
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe requests from a healthy replica, with read-your-writes stickiness.
+
+    A successful write pins its user to the primary for REPLICA_STICKY_SECONDS
+    through the default cache. Settings refuse DB_REPLICAS without REDIS_URL,
+    so that cache is shared and every worker honours the pin.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+
+        user_id = _token_user_id(request)
+        alias   = None
+        if request.method in SAFE_METHODS and not (user_id and cache.get(_pin_key(user_id))):
+            alias = pick_replica()
+
+        token = _routing.set(_RequestRouting(alias))
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if request.method not in SAFE_METHODS and user_id and response.status_code < 400:
+            cache.set(_pin_key(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+        return response
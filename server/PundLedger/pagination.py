@@ -0,0 +1,16 @@
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+class ListPagination(PageNumberPagination):
+    page_size_query_param = "page_size"
+    max_page_size         = 100
+
+
+def list_response(request, queryset, serialize):
+    """Serialize a listing; paginated only when the client asks with ?page=."""
+    if "page" not in request.query_params:
+        return Response([serialize(obj) for obj in queryset])
+    paginator = ListPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response([serialize(obj) for obj in page])
@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up within the pool's timeout."""
+
+
+def ping(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections with checkout health checks.
+
+    ``getconn(connect)`` hands out the most recently returned idle
+    connection after a ``check`` (pre-ping), opening a new one with
+    ``connect`` while fewer than ``max_size`` exist, and otherwise waits up
+    to ``timeout`` seconds. Idle connections beyond ``min_size`` are closed
+    after ``max_idle`` seconds, and any connection after ``max_lifetime``.
+    """
+
+    def __init__(self, name, min_size=0, max_size=10, timeout=10.0, max_idle=300.0,
+                 max_lifetime=3600.0, check=ping, reset=None):
+        self.name         = name
+        self.min_size     = min_size
+        self.max_size     = max_size
+        self.timeout      = timeout
+        self.max_idle     = max_idle
+        self.max_lifetime = max_lifetime
+        self.check        = check
+        self.reset        = reset
+        self._init_state()
+
+    def _init_state(self):
+        self._cond    = threading.Condition()
+        self._idle    = deque()  # (connection, returned_at)
+        self._born    = {}       # id(connection) -> opened_at
+        self._size    = 0        # idle + in use + being opened
+        self._waiting = 0
+        self._stats   = dict.fromkeys(
+            ("requests", "waits", "timeouts", "opened", "closed", "failed_checks"), 0
+        )
+        self._wait_total = 0.0
+        self._wait_max   = 0.0
+
+    def _expired(self, connection, returned_at, now):
+        if now - self._born.get(id(connection), now) > self.max_lifetime:
+            return True
+        return self._size > self.min_size and now - returned_at > self.max_idle
+
+    def _take_idle(self):
+        """Newest usable idle connection (caller holds the lock); expired ones are closed."""
+        now = time.monotonic()
+        while self._idle:
+            connection, returned_at = self._idle.pop()
+            if not self._expired(connection, returned_at, now):
+                return connection
+            self._drop(connection)
+        return None
+
+    def _drop(self, connection):
+        """Close ``connection`` and free its slot (caller holds the lock)."""
+        self._born.pop(id(connection), None)
+        self._size -= 1
+        self._stats["closed"] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._cond.notify()
+
+    def _record_wait(self, started):
+        waited = time.monotonic() - started
+        with self._cond:
+            self._wait_total += waited
+            self._wait_max    = max(self._wait_max, waited)
+
+    def _open(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._born[id(connection)] = time.monotonic()
+            self._stats["opened"] += 1
+        return connection
+
+    def getconn(self, connect):
+        started  = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            self._stats["requests"] += 1
+
+        while True:
+            with self._cond:
+                connection = self._take_idle()
+                if connection is None and self._size >= self.max_size:
+                    self._stats["waits"] += 1
+                    self._waiting += 1
+                    try:
+                        while not self._idle and self._size >= self.max_size:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                self._stats["timeouts"] += 1
+                                raise PoolTimeout(
+                                    f"No connection in pool '{self.name}' became free within {self.timeout}s"
+                                )
+                            self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                    continue
+                if connection is None:
+                    self._size += 1  # reserve the slot before connecting outside the lock
+
+            if connection is None:
+                connection = self._open(connect)
+                self._record_wait(started)
+                return connection
+
+            try:
+                if not getattr(connection, "closed", False) and self.check:
+                    self.check(connection)
+                if getattr(connection, "closed", False):
+                    raise ConnectionError("connection closed")
+            except Exception:
+                with self._cond:
+                    self._stats["failed_checks"] += 1
+                    self._drop(connection)
+                continue
+
+            self._record_wait(started)
+            return connection
+
+    def putconn(self, connection, close=False):
+        """Return a checked-out connection; broken or ``close``-flagged ones are discarded."""
+        with self._cond:
+            if id(connection) not in self._born:  # inherited from the parent process
+                _inherited.append(connection)
+                return
+        if not close and not getattr(connection, "closed", False) and self.reset:
+            try:
+                close = self.reset(connection) is False
+            except Exception:
+                close = True
+        with self._cond:
+            if close or getattr(connection, "closed", False):
+                self._drop(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+
+    def prefill(self, connect):
+        """Open connections until ``min_size`` exist."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            connection = self._open(connect)
+            self.putconn(connection)
+
+    def close_all(self):
+        with self._cond:
+            while self._idle:
+                self._drop(self._idle.pop()[0])
+
+    def forget_after_fork(self):
+        """
+        Start over empty in a forked child.
+
+        The inherited sockets belong to the parent's sessions; closing them
+        here would terminate those sessions, so they are only kept alive.
+        """
+        _inherited.extend(connection for connection, _ in self._idle)
+        self._init_state()
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "name":          self.name,
+                "min_size":      self.min_size,
+                "max_size":      self.max_size,
+                "size":          self._size,
+                "idle":          idle,
+                "in_use":        self._size - idle,
+                "waiting":       self._waiting,
+                **self._stats,
+                "wait_ms_total": round(self._wait_total * 1000, 3),
+                "wait_ms_max":   round(self._wait_max * 1000, 3),
+            }
+
+
+_pools      = {}
+_pools_lock = threading.Lock()
+_inherited  = []
+
+
+def get_pool(name, params=(), **config):
+    """
+    The process-wide pool for ``name`` and connection ``params``, created with ``config`` on first use.
+
+    ``params`` is a hashable digest of what the connections are opened with,
+    so a wrapper pointed at another database never gets this pool's sockets.
+    """
+    key  = (name, params)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, ConnectionPool(name, **config))
+    return pool
+
+
+def close_pools(name=None):
+    """Close the idle connections of every pool called ``name`` (all pools when None)."""
+    for (pool_name, _), pool in list(_pools.items()):
+        if name is None or pool_name == name:
+            pool.close_all()
+
+
+def pool_stats():
+    return [pool.stats() for pool in list(_pools.values())]
+
+
+def _after_fork_in_child():
+    for pool in list(_pools.values()):
+        pool.forget_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
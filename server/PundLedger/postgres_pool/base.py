@@ -0,0 +1,103 @@
+from functools import partial
+
+from django.core.signals import setting_changed
+from django.db.backends.postgresql import base as postgresql
+from django.dispatch import receiver
+
+from PundLedger.pool import close_pools, get_pool, ping
+
+from .creation import DatabaseCreation
+
+try:
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+except ImportError:  # psycopg 3
+    from psycopg.pq import TransactionStatus
+    TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN = TransactionStatus.IDLE, TransactionStatus.UNKNOWN
+
+
+def _reset(connection):
+    """Roll back whatever a returned connection left open; False when it must be discarded."""
+    status = connection.info.transaction_status
+    if status == TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def _check(connection):
+    """
+    Ping a connection on checkout and leave it outside a transaction.
+
+    Prefilled connections have not been through Django's ``connect()`` yet, so
+    they are not in autocommit and the ping opens a transaction; Django's
+    ``set_autocommit`` then fails with "set_session cannot be used inside a
+    transaction" unless it is rolled back here.
+    """
+    ping(connection)
+    if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+def _pool_key(conn_params):
+    return tuple(sorted((name, repr(value)) for name, value in conn_params.items()))
+
+
+class DatabaseWrapper(postgresql.DatabaseWrapper):
+    """
+    PostgreSQL backend that borrows connections from a per-process pool.
+
+    Sized by the ``POOL`` entry of the database settings (``min_size``,
+    ``max_size``, ``timeout``, ``max_idle``, ``max_lifetime``); run it with
+    ``CONN_MAX_AGE = 0`` so every request hands its connection back.
+
+    Pools are keyed by alias and connection parameters. Only the end-of-request
+    cleanup returns a connection to its pool; an explicit ``close()``
+    (``connections.close_all()``, worker threads finishing) or a connection
+    with errors really closes that one connection. The other pooled
+    connections stay open; ``close_pool()`` drains them, which test
+    database setup and teardown do.
+    """
+
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool         = None
+        self._handing_back  = False
+
+    def get_new_connection(self, conn_params):
+        self._pool = get_pool(
+            self.alias, _pool_key(conn_params), check=_check, reset=_reset, **self.settings_dict.get("POOL", {})
+        )
+        connect = partial(super().get_new_connection, conn_params)
+        self._pool.prefill(connect)
+        return self._pool.getconn(connect)
+
+    def close_if_unusable_or_obsolete(self):
+        self._handing_back = True
+        try:
+            super().close_if_unusable_or_obsolete()
+        finally:
+            self._handing_back = False
+
+    def close_pool(self):
+        """Close the idle connections of every pool this alias has used."""
+        close_pools(self.alias)
+
+    def _close(self):
+        if self.connection is None:
+            return
+        keep = (
+            self._handing_back
+            and not self.errors_occurred
+            and self.autocommit == self.settings_dict["AUTOCOMMIT"]
+        )
+        with self.wrap_database_errors:
+            self._pool.putconn(self.connection, close=not keep)
+
+
+@receiver(setting_changed)
+def close_pools_on_database_change(*, setting, **kwargs):
+    if setting == "DATABASES":
+        close_pools()
@@ -0,0 +1,20 @@
+from django.db.backends.postgresql import creation as postgresql
+
+
+class DatabaseCreation(postgresql.DatabaseCreation):
+    """
+    Drain the alias's pools before the test database is created, cloned or
+    dropped; CREATE/DROP DATABASE fail while pooled sessions are attached.
+    """
+
+    def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        self.connection.close_pool()
+        return super()._create_test_db(verbosity, autoclobber, keepdb)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self.connection.close_pool()
+        return super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        self.connection.close_pool()
+        return super()._destroy_test_db(test_database_name, verbosity)
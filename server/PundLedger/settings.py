@@ -2,7 +2,8 @@
 
 from datetime import timedelta
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 # ─────────────────────────────────────────────────────────────
 #  BASE DIRECTORIES
@@ -61,6 +62,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "PundLedger.db.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "PundLedger.urls"
@@ -96,9 +98,141 @@ DATABASES = {
         "HOST": config("DB_HOST"),
         "PORT": config("DB_PORT"),
         "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": config("DB_CONNECT_TIMEOUT", default=5, cast=int),
+        },
     }
 }
 
+# Pooled connections (PundLedger.postgres_pool): each process keeps between
+# DB_POOL_MIN_SIZE and DB_POOL_MAX_SIZE connections, pings them on checkout and
+# hands them back at the end of every request. DB_POOL_MAX_SIZE=0 falls back to
+# one persistent connection per thread.
+DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", default=4, cast=int)
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"].update({
+        "ENGINE":       "PundLedger.postgres_pool",
+        "CONN_MAX_AGE": 0,
+        "POOL": {
+            "min_size":     config("DB_POOL_MIN_SIZE", default=1, cast=int),
+            "max_size":     DB_POOL_MAX_SIZE,
+            "timeout":      config("DB_POOL_TIMEOUT", default=10, cast=float),
+            "max_idle":     config("DB_POOL_MAX_IDLE", default=300, cast=float),
+            "max_lifetime": config("DB_POOL_MAX_LIFETIME", default=3600, cast=float),
+        },
+    })
+
+# Server-side cap on a single statement; 0 leaves the server default
+DB_STATEMENT_TIMEOUT_MS = config("DB_STATEMENT_TIMEOUT_MS", default=0, cast=int)
+if DB_STATEMENT_TIMEOUT_MS:
+    DATABASES["default"]["OPTIONS"]["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+# Behind a transaction-pooling proxy (e.g. PgBouncer pool_mode=transaction) a
+# session can change between statements: no server-side cursors. psycopg2 never
+# prepares statements, and Django already disables psycopg 3 prepares.
+if config("DB_TRANSACTION_POOLING", default=False, cast=bool):
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Read replicas: comma-separated HOST[:PORT] entries using the primary's credentials.
+# Safe requests read from a replica within REPLICA_MAX_LAG_SECONDS; a user's
+# write pins their reads to the primary for REPLICA_STICKY_SECONDS.
+for _number, _replica in enumerate(config("DB_REPLICAS", default="", cast=Csv()), start=1):
+    _host, _, _port = _replica.partition(":")
+    DATABASES[f"replica{_number}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+REPLICA_DATABASES         = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS          = ["PundLedger.db.ReplicaRouter"]
+REPLICA_STICKY_SECONDS    = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+REPLICA_MAX_LAG_SECONDS   = config("REPLICA_MAX_LAG_SECONDS", default=5, cast=float)
+REPLICA_LAG_CHECK_SECONDS = config("REPLICA_LAG_CHECK_SECONDS", default=5, cast=float)
+
+# ─────────────────────────────────────────────────────────────
+#  CACHES
+#  Redis when REDIS_URL is set (shared across workers), local memory otherwise
+#  (except OTPs, which fall back to a database table)
+# ─────────────────────────────────────────────────────────────
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND":    "django_redis.cache.RedisCache",
+            "LOCATION":   REDIS_URL,
+            "KEY_PREFIX": "pundx",
+        },
+        "summaries": {
+            "BACKEND":    "django_redis.cache.RedisCache",
+            "LOCATION":   REDIS_URL,
+            "KEY_PREFIX": "pundx-summary",
+            "TIMEOUT":    3600,
+        },
+        "otp": {
+            "BACKEND":    "django_redis.cache.RedisCache",
+            "LOCATION":   REDIS_URL,
+            "KEY_PREFIX": "pundx-otp",
+        },
+        "throttle": {
+            "BACKEND":    "django_redis.cache.RedisCache",
+            "LOCATION":   REDIS_URL,
+            "KEY_PREFIX": "pundx-throttle",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND":  "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pundx-default",
+        },
+        "summaries": {
+            "BACKEND":  "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pundx-summaries",
+            "TIMEOUT":  3600,
+        },
+        # OTPs must be visible to every worker: database table (python manage.py createcachetable)
+        "otp": {
+            "BACKEND":  "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "pundx_otp_cache",
+        },
+        # stand-in for the shared store: limits only hold per process without REDIS_URL
+        "throttle": {
+            "BACKEND":  "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pundx-throttle",
+        },
+    }
+
+# Read-your-writes pins live in the default cache; a per-process cache would
+# let the next request on another worker read a lagging replica
+if REPLICA_DATABASES and not REDIS_URL:
+    raise ImproperlyConfigured("DB_REPLICAS requires REDIS_URL (a cache shared by every worker)")
+
+SUMMARY_CACHE_ALIAS  = "summaries"
+OTP_CACHE_ALIAS      = "otp"
+THROTTLE_CACHE_ALIAS = "throttle"
+
+# Token versions must be seen by every worker at once for revocation to be
+# immediate: cached in Redis only, read from the user row otherwise. Without
+# REDIS_URL stateless JWT auth therefore still costs one (narrow) user query
+# per request; only with Redis does it avoid the database entirely.
+TOKEN_STATE_CACHE_ALIAS = "default" if REDIS_URL else None
+
+# Rows per INSERT / COPY chunk when a cycle is generated
+CYCLE_INSERT_BATCH_SIZE = config("CYCLE_INSERT_BATCH_SIZE", default=2000, cast=int)
+
+# Rows fetched per server-side cursor round trip when streaming an export
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Journal entries between per-pund balance snapshots (bounds an as-of query's scan)
+LEDGER_SNAPSHOT_INTERVAL = config("LEDGER_SNAPSHOT_INTERVAL", default=200, cast=int)
+
+# Seconds a (user, pund) role lookup may be served from cache; 0 disables it
+PUND_ROLE_CACHE_TIMEOUT = config("PUND_ROLE_CACHE_TIMEOUT", default=30, cast=int)
+
 # ─────────────────────────────────────────────────────────────
 #  PASSWORD VALIDATION
 # ─────────────────────────────────────────────────────────────
@@ -139,6 +273,7 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_HEADERS = ["*"]
 CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["ETag"]
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
 CSRF_TRUSTED_ORIGINS = [
@@ -151,28 +286,40 @@ SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 # ─────────────────────────────────────────────────────────────
 #  DJANGO REST FRAMEWORK
 # ─────────────────────────────────────────────────────────────
+# "stateless" trusts signed claims (no user query per request); "database" loads the user row
+JWT_AUTH_MODE = config("JWT_AUTH_MODE", default="stateless")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.StatelessJWTAuthentication" if JWT_AUTH_MODE == "stateless"
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "users.throttles.AnonThrottle",
+        "users.throttles.UserThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "50/minute",
         "user": "500/minute",
         "login": "10/minute",
-        "otp": "5/minute",
+        "otp": "5/minute",             # per IP
+        "otp_email": "5/minute",       # per submitted email
         "password_reset": "5/minute",
+        "password_reset_email": "5/minute",
     },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
 }
 
+# Multiplies a view's throttle_cost per caller kind (users.throttles.SlidingWindowThrottle.get_weight)
+THROTTLE_COST_WEIGHTS = {
+    "anon": config("THROTTLE_ANON_WEIGHT", default=1, cast=int),
+    "user": config("THROTTLE_USER_WEIGHT", default=1, cast=int),
+}
+
 # ─────────────────────────────────────────────────────────────
 #  SIMPLE JWT
 # ─────────────────────────────────────────────────────────────
@@ -189,6 +336,12 @@ SIMPLE_JWT = {
 # ─────────────────────────────────────────────────────────────
 RESEND_API_KEY = config("RESEND_API_KEY")
 FRONTEND_URL = "https://pundx.co.in"
+EMAIL_FROM = "PUNDX <dlegacy@pundx.co.in>"
+
+# Outbox delivery (python manage.py deliver_emails)
+EMAIL_TRANSPORT           = config("EMAIL_TRANSPORT", default="users.outbox.ResendTransport")
+EMAIL_OUTBOX_BATCH_SIZE   = config("EMAIL_OUTBOX_BATCH_SIZE", default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=6, cast=int)
 
 # ─────────────────────────────────────────────────────────────
 #  LOGGING
@@ -0,0 +1,214 @@
+import sqlite3
+import threading
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from PundLedger.db import ReplicaRouter, ReplicaRoutingMiddleware
+from PundLedger.pool import ConnectionPool, PoolTimeout, _pools
+from finance.models import Payment
+
+User = get_user_model()
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def connect(self):
+        return sqlite3.connect(":memory:", check_same_thread=False)
+
+    def test_checkout_reuse_and_timeout(self):
+
+        pool = ConnectionPool("test", max_size=1, timeout=0.05, check=lambda c: c.execute("SELECT 1"))
+        first = pool.getconn(self.connect)
+        self.assertEqual(pool.stats()["in_use"], 1)
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn(self.connect)
+
+        pool.putconn(first)
+        self.assertIs(pool.getconn(self.connect), first)
+
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["opened"], stats["waits"], stats["timeouts"]), (1, 1, 1, 1))
+        self.assertGreater(stats["wait_ms_total"], 0)
+
+    def test_failed_health_check_replaces_connection(self):
+
+        pool = ConnectionPool("test", min_size=1, max_size=2, check=lambda c: c.execute("SELECT 1"))
+        pool.prefill(self.connect)
+        stale = pool.getconn(self.connect)
+        stale.close()
+        pool.putconn(stale)
+
+        fresh = pool.getconn(self.connect)
+        self.assertIsNot(fresh, stale)
+        stats = pool.stats()
+        self.assertEqual((stats["failed_checks"], stats["opened"], stats["closed"]), (1, 2, 1))
+
+    def test_waiter_gets_returned_connection(self):
+
+        pool  = ConnectionPool("test", max_size=1, timeout=2)
+        first = pool.getconn(self.connect)
+        threading.Timer(0.05, pool.putconn, args=[first]).start()
+        self.assertIs(pool.getconn(self.connect), first)
+        self.assertEqual(pool.stats()["waiting"], 0)
+
+
+class PooledBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        self.opened = []
+        for patcher in (
+            mock.patch("psycopg2.connect", side_effect=self.fake_connect),
+            mock.patch("psycopg2.extras.register_default_jsonb"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: [_pools.pop(key) for key in list(_pools) if key[0] == "pooled"])
+
+    def fake_connect(self, **params):
+        raw = mock.MagicMock(closed=False)
+        raw.info.server_version = 150000
+        raw.info.transaction_status = 0  # idle
+        self.opened.append(raw)
+        return raw
+
+    def wrapper(self, name="ledger"):
+        handler = ConnectionHandler({
+            "default": {"ENGINE": "django.db.backends.dummy"},
+            "pooled":  {"ENGINE": "PundLedger.postgres_pool", "NAME": name, "CONN_MAX_AGE": 0,
+                        "POOL": {"min_size": 0, "max_size": 2}},
+        })
+        wrapper = handler["pooled"]
+        wrapper.check_database_version_supported = lambda: None
+        wrapper.init_connection_state = lambda: None
+        return wrapper
+
+    def test_request_end_returns_connection_and_close_drains(self):
+
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close_if_unusable_or_obsolete()  # end of request
+        raw.close.assert_not_called()
+
+        wrapper.ensure_connection()
+        self.assertIs(wrapper.connection, raw)
+
+        wrapper.close()  # e.g. before DROP DATABASE in test teardown
+        raw.close.assert_called_once()
+        self.assertEqual(wrapper._pool.stats()["size"], 0)
+
+    def test_closing_one_connection_keeps_the_others(self):
+
+        failed, healthy = self.wrapper(), self.wrapper()  # two threads sharing one pool
+        failed.ensure_connection()
+        healthy.ensure_connection()
+        healthy_raw = healthy.connection
+        healthy.close_if_unusable_or_obsolete()  # back in the pool
+
+        failed.errors_occurred = True
+        failed.close()
+        self.opened[0].close.assert_called_once()
+        healthy_raw.close.assert_not_called()
+        self.assertEqual(healthy._pool.stats()["idle"], 1)
+
+    def test_pools_are_keyed_by_connection_params(self):
+
+        ledger = self.wrapper("ledger")
+        ledger.ensure_connection()
+        ledger.close_if_unusable_or_obsolete()
+
+        other = self.wrapper("postgres")  # same alias, another database
+        other.ensure_connection()
+        self.assertIsNot(other.connection, self.opened[0])
+        self.assertIsNot(other._pool, ledger._pool)
+        other.close()
+        self.assertEqual(ledger._pool.stats()["idle"], 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "needs the PostgreSQL driver")
+class PooledBackendDriverTests(SimpleTestCase):
+    """The pooled backend against the real driver and the test database."""
+
+    def setUp(self):
+        self.addCleanup(lambda: [_pools.pop(key) for key in list(_pools) if key[0] == "pooled"])
+
+    def wrapper(self):
+        handler = ConnectionHandler({
+            "default": {"ENGINE": "django.db.backends.dummy"},
+            "pooled":  {**connection.settings_dict, "ENGINE": "PundLedger.postgres_pool",
+                        "CONN_MAX_AGE": 0, "POOL": {"min_size": 1, "max_size": 2}},
+        })
+        return handler["pooled"]
+
+    def test_prefilled_connection_is_usable(self):
+
+        wrapper = self.wrapper()
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.fetchone(), (1,))
+        self.assertTrue(wrapper.get_autocommit())
+        raw = wrapper.connection
+        wrapper.close_if_unusable_or_obsolete()  # end of request
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertIs(wrapper.connection, raw)
+        self.assertEqual(wrapper._pool.stats()["opened"], 1)
+
+
+@override_settings(REPLICA_DATABASES=["replica1", "replica2"], REPLICA_MAX_LAG_SECONDS=5)
+class ReplicaRoutingTests(TestCase):
+
+    def setUp(self):
+        caches["default"].clear()
+        self.router  = ReplicaRouter()
+        self.factory = RequestFactory()
+        user = User.objects.create_user(email="reader@test.com")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+        self.lags = {"replica1": 0.2, "replica2": 30.0}
+
+    def route(self, method, status_code=200, write=False):
+        seen = {}
+
+        def view(request):
+            seen["read"] = self.router.db_for_read(Payment)
+            if write:
+                self.router.db_for_write(Payment)
+                seen["after_write"] = self.router.db_for_read(Payment)
+            return HttpResponse(status=status_code)
+
+        request = getattr(self.factory, method)("/finance/", **self.auth)
+        with mock.patch("PundLedger.db.replica_lag", side_effect=self.lags.get):
+            ReplicaRoutingMiddleware(view)(request)
+        return seen
+
+    def test_reads_go_to_a_replica_within_lag(self):
+
+        self.assertEqual(self.route("get")["read"], "replica1")
+        self.assertEqual(self.router.db_for_read(Payment), "default")  # outside a request
+
+        self.lags["replica1"] = None  # unreachable
+        self.assertEqual(self.route("get")["read"], "default")
+
+    def test_writes_pin_the_user_to_the_primary(self):
+
+        seen = self.route("get", write=True)
+        self.assertEqual((seen["read"], seen["after_write"]), ("replica1", "default"))
+
+        self.route("post", status_code=400)
+        self.assertEqual(self.route("get")["read"], "replica1")
+
+        self.assertEqual(self.route("post")["read"], "default")
+        self.assertEqual(self.route("get")["read"], "default")
+
+        caches["default"].clear()
+        self.assertEqual(self.route("get")["read"], "replica1")
@@ -0,0 +1,13 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .pool import pool_stats
+
+
+class DatabasePoolStatsView(APIView):
+    """Per-process connection pool figures: size, in use, waiting and time spent waiting."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"pools": pool_stats()})
@@ -1,3 +1,4 @@
 pip install -r requirements.txt
 python manage.py migrate
+python manage.py createcachetable
 python manage.py collectstatic --noinput
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PundStructure, Payment, Loan, LoanInstallment
+from .models import LedgerEntry, PundStructure, Payment, Loan, LoanInstallment, PundFundBalance
 
 
 @admin.register(PundStructure)
@@ -33,4 +33,31 @@ class LoanAdmin(admin.ModelAdmin):
 @admin.register(LoanInstallment)
 class LoanInstallmentAdmin(admin.ModelAdmin):
     list_display = ("loan", "cycle_number", "emi_amount", "penalty_amount", "is_paid", "due_date")
-    list_filter  = ("is_paid",)
\ No newline at end of file
+    list_filter  = ("is_paid",)
+
+
+@admin.register(PundFundBalance)
+class PundFundBalanceAdmin(admin.ModelAdmin):
+    list_display    = ("pund", "total_savings", "total_penalties", "active_loan_outstanding",
+                       "available_fund", "updated_at")
+    search_fields   = ("pund__name",)
+    readonly_fields = ("pund", "total_savings", "total_penalties", "unpaid_savings",
+                       "active_loan_outstanding", "active_loan_principal",
+                       "active_loan_payable", "available_fund", "updated_at")
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display  = ("pund", "seq", "kind", "cycle_number", "reference", "available_fund", "created_at")
+    list_filter   = ("kind",)
+    search_fields = ("pund__name", "reference")
+    ordering      = ("pund", "-seq")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
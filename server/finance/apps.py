@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 
 class FinanceConfig(AppConfig):
-    name = "finance"
\ No newline at end of file
+    name = "finance"
+
+    def ready(self):
+        from . import timeline  # noqa: F401  registers the structure signal handlers
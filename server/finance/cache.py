@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import caches
+
+SUMMARY_KINDS = ("fund", "savings", "my_summary")
+
+
+def _cache():
+    return caches[getattr(settings, "SUMMARY_CACHE_ALIAS", "default")]
+
+
+def summary_key(kind, pund_id, version, user_id=None):
+    key = f"summary:{kind}:{pund_id}:v{version}"
+    return f"{key}:u{user_id}" if user_id is not None else key
+
+
+def _count(kind, outcome):
+    key = f"summary-stats:{kind}:{outcome}"
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def cached_summary(kind, pund_id, version, compute, user_id=None):
+    """
+    Return ``compute()`` through the summary cache.
+
+    Keys embed the pund's version, which every finance and membership
+    write bumps, so a write makes earlier entries unreachable and they
+    simply age out.
+    """
+    cache = _cache()
+    key   = summary_key(kind, pund_id, version, user_id)
+    value = cache.get(key)
+    if value is not None:
+        _count(kind, "hits")
+        return value
+
+    _count(kind, "misses")
+    value = compute()
+    cache.set(key, value)
+    return value
+
+
+def summary_cache_stats():
+    """Hit and miss counters per summary kind, shared by every process using the cache."""
+    keys   = [f"summary-stats:{kind}:{outcome}" for kind in SUMMARY_KINDS for outcome in ("hits", "misses")]
+    counts = _cache().get_many(keys)
+    return {
+        kind: {outcome: counts.get(f"summary-stats:{kind}:{outcome}", 0) for outcome in ("hits", "misses")}
+        for kind in SUMMARY_KINDS
+    }
+
+
+# ─── Cached summaries ────────────────────────────────────────
+
+def cached_fund_summary(pund):
+    from .services import fund_summary
+    return cached_summary("fund", pund.id, pund.version, lambda: fund_summary(pund))
+
+
+def cached_saving_summary(pund, member_count=None):
+    from .services import saving_summary
+    return cached_summary(
+        "savings", pund.id, pund.version,
+        lambda: saving_summary(pund, member_count=member_count),
+    )
+
+
+def cached_my_financial_summary(user, pund):
+    from .services import my_financial_summary
+    return cached_summary(
+        "my_summary", pund.id, pund.version,
+        lambda: my_financial_summary(user, pund.id),
+        user_id=user.id,
+    )
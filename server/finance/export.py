@@ -0,0 +1,222 @@
+import csv
+import re
+import zipfile
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import FinanceAuditLog, LoanInstallment, Payment
+
+EXPORT_KINDS   = ("payments", "installments", "audit")
+EXPORT_COLUMNS = (
+    "record", "id", "cycle", "date", "member", "category",
+    "amount", "penalty", "status", "paid_at", "details",
+)
+
+
+def _chunk_size():
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _when(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat(timespec="seconds")
+    return value.isoformat() if value else ""
+
+
+# ─── rows ───────────────────────────────────────────────────
+
+def _payment_rows(pund, from_date, to_date, cycle):
+    payments = Payment.objects.filter(pund=pund)
+    if cycle is not None:
+        payments = payments.filter(cycle_number=cycle)
+    if from_date:
+        payments = payments.filter(due_date__gte=from_date)
+    if to_date:
+        payments = payments.filter(due_date__lte=to_date)
+
+    rows = payments.order_by("cycle_number", "id").values_list(
+        "id", "cycle_number", "due_date", "member__email", "payment_type",
+        "amount", "penalty_amount", "is_paid", "paid_at",
+    )
+    for pk, number, due, email, kind, amount, penalty, is_paid, paid_at in rows.iterator(chunk_size=_chunk_size()):
+        yield (
+            "payment", pk, number, _when(due), email, kind,
+            amount, penalty, "PAID" if is_paid else "PENDING", _when(paid_at), "",
+        )
+
+
+def _installment_rows(pund, from_date, to_date, cycle):
+    installments = LoanInstallment.objects.filter(loan__pund=pund)
+    if cycle is not None:
+        installments = installments.filter(cycle_number=cycle)
+    if from_date:
+        installments = installments.filter(due_date__gte=from_date)
+    if to_date:
+        installments = installments.filter(due_date__lte=to_date)
+
+    rows = installments.order_by("due_date", "id").values_list(
+        "id", "cycle_number", "due_date", "loan__member__email", "loan_id",
+        "emi_amount", "penalty_amount", "status", "is_paid", "paid_at",
+    )
+    for pk, number, due, email, loan_id, emi, penalty, state, is_paid, paid_at in rows.iterator(chunk_size=_chunk_size()):
+        yield (
+            "installment", pk, number, _when(due), email, "EMI",
+            emi, penalty, "PAID" if is_paid else state, _when(paid_at), f"Loan {loan_id}",
+        )
+
+
+def _audit_rows(pund, from_date, to_date, cycle):
+    if cycle is not None:  # audit entries do not belong to a cycle
+        return
+    logs = FinanceAuditLog.objects.filter(pund=pund)
+    if from_date:
+        logs = logs.filter(created_at__gte=_start_of_day(from_date))
+    if to_date:
+        logs = logs.filter(created_at__lt=_start_of_day(to_date + timedelta(days=1)))
+
+    rows = logs.order_by("created_at", "id").values_list("id", "created_at", "user__email", "action", "description")
+    for pk, created, email, action, description in rows.iterator(chunk_size=_chunk_size()):
+        yield ("audit", pk, "", _when(created), email or "", action, "", "", "", "", description)
+
+
+ROW_SOURCES = {
+    "payments":     _payment_rows,
+    "installments": _installment_rows,
+    "audit":        _audit_rows,
+}
+
+
+def statement_rows(pund, kinds=EXPORT_KINDS, from_date=None, to_date=None, cycle=None):
+    """
+    Header plus one row per payment, installment and audit entry of ``pund``.
+
+    Each source is read through a server-side cursor in EXPORT_CHUNK_SIZE
+    batches as values tuples, so memory does not grow with the pund.
+    """
+    yield EXPORT_COLUMNS
+    for kind in kinds:
+        yield from ROW_SOURCES[kind](pund, from_date, to_date, cycle)
+
+
+# ─── CSV ────────────────────────────────────────────────────
+
+class _Echo:
+    """File-like object whose ``write`` hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+# ─── XLSX ───────────────────────────────────────────────────
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Statement" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Sink:
+    """
+    Write-only target for ``zipfile``; ``drain`` returns what was written so far.
+
+    Having ``tell`` but no ``seek`` makes zipfile write data descriptors
+    instead of going back to patch headers, which is what lets it stream.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def write(self, data):
+        if data:
+            self.chunks.append(bytes(data))
+            self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, Decimal)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_XML_ILLEGAL.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def stream_xlsx(rows, flush_every=500):
+    """Single-sheet workbook built on the fly; bytes go out every ``flush_every`` rows."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, body in _XLSX_PARTS.items():
+            workbook.writestr(name, body)
+        yield sink.drain()
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(_SHEET_HEAD.encode())
+            for count, row in enumerate(rows, start=1):
+                sheet.write(f"<row>{''.join(_xlsx_cell(v) for v in row)}</row>".encode())
+                if count % flush_every == 0 and sink.chunks:
+                    yield sink.drain()
+            sheet.write(_SHEET_TAIL.encode())
+    yield sink.drain()
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Sum
+
+from .models import BALANCE_FIELDS, LedgerEntry, LedgerSnapshot
+
+ZERO = Decimal("0")
+
+
+def _snapshot_interval():
+    return getattr(settings, "LEDGER_SNAPSHOT_INTERVAL", 200)
+
+
+def balances_at(pund_id, seq):
+    """
+    Cumulative fund figures right after journal entry ``seq``.
+
+    Starts from the nearest snapshot at or before ``seq`` (one index probe)
+    and adds the entries after it, of which there are fewer than
+    LEDGER_SNAPSHOT_INTERVAL.
+    """
+    snapshot = LedgerSnapshot.objects.filter(pund_id=pund_id, seq__lte=seq).order_by("-seq").first()
+    entries  = LedgerEntry.objects.filter(pund_id=pund_id, seq__gt=snapshot.seq if snapshot else 0, seq__lte=seq)
+    sums     = entries.aggregate(**{field: Sum(field) for field in BALANCE_FIELDS})
+    return {
+        field: (getattr(snapshot, field) if snapshot else ZERO) + (sums[field] or ZERO)
+        for field in BALANCE_FIELDS
+    }
+
+
+def record_ledger_entry(pund, kind, deltas, cycle_number=None, reference="", opening=None):
+    """
+    Append a journal entry for one fund movement, snapshotting every LEDGER_SNAPSHOT_INTERVAL entries.
+
+    Call right after the pund's PundFundBalance row was updated: that row
+    lock serialises writers of the pund, so ``seq`` has no gaps. A pund's
+    first entry is preceded by an OPENING entry carrying ``opening(pund)``
+    minus ``deltas``, i.e. whatever happened before the journal existed.
+    """
+    last    = LedgerEntry.objects.filter(pund_id=pund.id).order_by("-seq").values_list("seq", flat=True).first()
+    entries = []
+    if last is None:
+        last = 0
+        if opening is not None:
+            totals  = opening(pund)
+            balance = {field: totals[field] - deltas.get(field, ZERO) for field in BALANCE_FIELDS}
+            if any(balance.values()):
+                entries.append(LedgerEntry(pund_id=pund.id, seq=1, kind="OPENING", **balance))
+
+    entries.append(LedgerEntry(
+        pund_id=pund.id, seq=last + len(entries) + 1, kind=kind,
+        cycle_number=cycle_number, reference=reference, **deltas,
+    ))
+    LedgerEntry.objects.bulk_create(entries)
+
+    interval = _snapshot_interval()
+    for entry in entries:
+        if entry.seq % interval == 0:
+            LedgerSnapshot.objects.create(
+                pund_id=pund.id, seq=entry.seq, created_at=entry.created_at,
+                **balances_at(pund.id, entry.seq),
+            )
+    return entries[-1]
+
+
+def record_ledger_adjustment(pund, totals, pending=None):
+    """
+    Journal the gap between ``totals`` and the journal's running figures as an ADJUSTMENT entry.
+
+    Called when PundFundBalance is rebuilt from the underlying rows, so the
+    journal ends where the rebuilt row does. ``pending`` are deltas already
+    reflected in ``totals`` that the caller is about to journal itself. A
+    pund without a journal gets nothing: its first entry's OPENING covers it.
+    """
+    last = LedgerEntry.objects.filter(pund_id=pund.id).order_by("-seq").values_list("seq", flat=True).first()
+    if last is None:
+        return None
+    pending = pending or {}
+    current = balances_at(pund.id, last)
+    deltas  = {field: totals[field] - pending.get(field, ZERO) - current[field] for field in BALANCE_FIELDS}
+    deltas  = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return None
+    return record_ledger_entry(pund, "ADJUSTMENT", deltas)
+
+
+def balance_as_of(pund, before=None, cycle=None):
+    """
+    Fund figures as they stood before ``before`` and/or at the end of ``cycle``.
+
+    The end of a cycle is the moment the next cycle was generated (or now,
+    if it has not been yet). Returns ``(entry, balances)`` for the last
+    journal entry in range, or ``(None, None)`` when no entry precedes it.
+    """
+    entries = LedgerEntry.objects.filter(pund_id=pund.id)
+    if cycle is not None:
+        next_cycle = (
+            entries.filter(kind="CYCLE_GENERATED", cycle_number__gt=cycle)
+            .order_by("cycle_number", "seq").values_list("seq", flat=True).first()
+        )
+        if next_cycle is not None:
+            entries = entries.filter(seq__lt=next_cycle)
+    if before is not None:
+        entries = entries.filter(created_at__lt=before).order_by("-created_at", "-seq")
+    else:
+        entries = entries.order_by("-seq")
+
+    entry = entries.first()
+    if entry is None:
+        return None, None
+    return entry, balances_at(pund.id, entry.seq)
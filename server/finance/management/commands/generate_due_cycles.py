@@ -0,0 +1,30 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from finance.services import generate_due_cycles
+
+
+class Command(BaseCommand):
+    help = "Generate the next saving cycle for every active pund whose cycle is due."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--time-budget", type=float,
+                            help="Seconds after which remaining punds are deferred to the next run.")
+        parser.add_argument("--date", type=date.fromisoformat,
+                            help="Treat this ISO date as today (default: today).")
+
+    def handle(self, *args, **options):
+        totals = generate_due_cycles(
+            today=options["date"],
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            time_budget=options["time_budget"],
+        )
+        self.stdout.write(
+            f"{totals['generated']} cycle(s) generated across {totals['punds']} pund(s), "
+            f"{totals['deferred']} deferred, {totals['failed']} failed"
+        )
+        self.stdout.write(self.style.SUCCESS("Due cycle generation complete"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from punds.models import Pund
+from finance.services import rebuild_fund_balance
+
+
+class Command(BaseCommand):
+    help = "Recompute PundFundBalance rows from Payment and Loan history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pund", type=int, action="append", dest="pund_ids",
+                            help="Only rebuild this pund id (repeatable).")
+
+    def handle(self, *args, **options):
+        punds = Pund.objects.order_by("id")
+        if options["pund_ids"]:
+            punds = punds.filter(id__in=options["pund_ids"])
+
+        count = 0
+        for pund in punds.iterator():
+            with transaction.atomic():
+                rebuild_fund_balance(pund)
+                Pund.objects.filter(id=pund.id).bump_version()  # drop cached summaries / ETags
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} fund balance(s)"))
@@ -0,0 +1,70 @@
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from punds.models import Pund
+from finance.reconcile import CHECKS, init_worker, reconcile_pund
+
+
+class Command(BaseCommand):
+    help = (
+        "Check every loan's remaining_amount against its paid installments and every "
+        "EMI payment against the installment it mirrors; writes discrepancies as JSON lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pund", type=int, action="append", dest="pund_ids",
+                            help="Only reconcile this pund id (repeatable).")
+        parser.add_argument("--chunk-size", type=int, default=5000,
+                            help="Loan / payment ids checked per query (default: 5000).")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Reconcile punds in this many processes (default: 1, in-process).")
+        parser.add_argument("--output", default="-",
+                            help="Report file, one JSON object per discrepancy (default: stdout).")
+        parser.add_argument("--fail-on-discrepancy", action="store_true",
+                            help="Exit non-zero when anything disagrees.")
+
+    def _results(self, pund_ids, chunk_size, workers):
+        check = partial(reconcile_pund, chunk_size=chunk_size)
+        if workers <= 1:
+            yield from map(check, pund_ids)
+            return
+
+        # forked workers must not share the parent's database sockets
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            yield from pool.map(check, pund_ids, chunksize=16)
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        punds = Pund.objects.order_by("id").values_list("id", flat=True)
+        if options["pund_ids"]:
+            punds = punds.filter(id__in=options["pund_ids"])
+        pund_ids = list(punds)
+
+        to_stdout = options["output"] == "-"
+        report    = self.stdout if to_stdout else open(options["output"], "w", encoding="utf-8")
+        summary   = self.stderr if to_stdout else self.stdout
+        counts    = Counter()
+        try:
+            for rows in self._results(pund_ids, options["chunk_size"], options["workers"]):
+                for row in rows:
+                    report.write(json.dumps(row) + ("" if to_stdout else "\n"))
+                    counts[row["check"]] += 1
+        finally:
+            if not to_stdout:
+                report.close()
+
+        for check in CHECKS:
+            summary.write(f"{check}: {counts[check]} discrepancy(ies)")
+        total = sum(counts.values())
+        message = f"Reconciled {len(pund_ids)} pund(s), {total} discrepancy(ies)"
+        if total and options["fail_on_discrepancy"]:
+            raise CommandError(message)
+        summary.write(self.style.SUCCESS(message) if not total else self.style.WARNING(message))
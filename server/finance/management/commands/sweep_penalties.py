@@ -0,0 +1,23 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from finance.services import sweep_penalties
+
+
+class Command(BaseCommand):
+    help = "Apply missed-saving and missed-loan penalties to overdue unpaid rows in all punds."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--date", type=date.fromisoformat,
+                            help="Treat this ISO date as today (default: today).")
+
+    def handle(self, *args, **options):
+        counts = sweep_penalties(
+            today=options["date"],
+            batch_size=options["batch_size"],
+        )
+        for target, updated in counts.items():
+            self.stdout.write(f"{target}: {updated} row(s) penalised")
+        self.stdout.write(self.style.SUCCESS("Penalty sweep complete"))
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.29 on 2026-10-17 14:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("punds", "0002_initial"),
+        ("finance", "0005_alter_payment_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PundFundBalance",
+            fields=[
+                (
+                    "pund",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="fund_balance",
+                        serialize=False,
+                        to="punds.pund",
+                    ),
+                ),
+                (
+                    "total_savings",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "total_penalties",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "unpaid_savings",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "active_loan_outstanding",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "active_loan_principal",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "active_loan_payable",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "available_fund",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="loan",
+            name="amount_given",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name="loan",
+            name="interest_amount",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.29 on 2026-10-17 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0006_pundfundbalance"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PenaltySweepMark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[
+                            ("LOAN_INSTALLMENT", "Loan Installment"),
+                            ("SAVING_PAYMENT", "Saving Payment"),
+                        ],
+                        max_length=20,
+                        unique=True,
+                    ),
+                ),
+                ("swept_before", models.DateField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
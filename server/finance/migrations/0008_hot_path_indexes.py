@@ -0,0 +1,77 @@
+# Generated by Django 4.2.29 on 2026-10-17 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0007_penaltysweepmark"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="financeauditlog",
+            index=models.Index(
+                fields=["pund", "created_at"], name="auditlog_pund_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loan",
+            index=models.Index(
+                fields=["pund", "is_active"], name="loan_pund_active_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loan",
+            index=models.Index(fields=["pund", "status"], name="loan_pund_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="loan",
+            index=models.Index(
+                fields=["member", "is_active"], name="loan_member_active_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loaninstallment",
+            index=models.Index(
+                fields=["loan", "is_paid", "due_date"], name="installment_loan_paid_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loaninstallment",
+            index=models.Index(
+                condition=models.Q(("is_paid", False), ("penalty_amount", 0)),
+                fields=["due_date"],
+                name="installment_overdue_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["pund", "payment_type", "cycle_number", "is_paid"],
+                name="payment_pund_type_cycle_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["member", "pund", "payment_type"],
+                name="payment_member_pund_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("is_paid", False), ("penalty_amount", 0)),
+                fields=["due_date"],
+                name="payment_unpaid_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pundstructure",
+            index=models.Index(
+                fields=["pund", "effective_from"], name="structure_pund_from_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.29 on 2026-10-17 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0008_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="financeauditlog",
+            name="auditlog_pund_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="financeauditlog",
+            index=models.Index(
+                fields=["pund", "-created_at", "-id"], name="auditlog_pund_keyset_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.29 on 2026-10-17 16:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0010_ledger_journal"),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name="PenaltySweepMark",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.29 on 2026-10-17 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0011_remove_penaltysweepmark'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='kind',
+            field=models.CharField(choices=[('OPENING', 'Opening balance'), ('CYCLE_GENERATED', 'Cycle generated'), ('SAVING_PAID', 'Saving paid'), ('LOAN_APPROVED', 'Loan approved'), ('EMI_PAID', 'EMI paid'), ('ADJUSTMENT', 'Balance rebuild adjustment')], max_length=20),
+        ),
+    ]
@@ -16,6 +16,9 @@ class PundStructure(models.Model):
 
     class Meta:
         ordering = ["-effective_from"]
+        indexes  = [
+            models.Index(fields=["pund", "effective_from"], name="structure_pund_from_idx"),
+        ]
 
     def __str__(self):
         return f"{self.pund.name} Structure from {self.effective_from}"
@@ -42,6 +45,14 @@ class Payment(models.Model):
     class Meta:
         unique_together = ("pund", "member", "cycle_number", "payment_type")
         ordering = ["-cycle_number"]
+        indexes  = [
+            models.Index(fields=["pund", "payment_type", "cycle_number", "is_paid"], name="payment_pund_type_cycle_idx"),
+            models.Index(fields=["member", "pund", "payment_type"], name="payment_member_pund_idx"),
+            models.Index(
+                fields=["due_date"], name="payment_unpaid_due_idx",
+                condition=models.Q(is_paid=False, penalty_amount=0),
+            ),
+        ]
 
 
 class Loan(models.Model):
@@ -74,6 +85,11 @@ class Loan(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes  = [
+            models.Index(fields=["pund", "is_active"], name="loan_pund_active_idx"),
+            models.Index(fields=["pund", "status"], name="loan_pund_status_idx"),
+            models.Index(fields=["member", "is_active"], name="loan_member_active_idx"),
+        ]
 
     def __str__(self):
         return f"{self.member.email} - {self.principal_amount} ({self.status})"
@@ -98,6 +114,13 @@ class LoanInstallment(models.Model):
     class Meta:
         unique_together = ("loan", "cycle_number")
         ordering        = ["cycle_number"]
+        indexes         = [
+            models.Index(fields=["loan", "is_paid", "due_date"], name="installment_loan_paid_idx"),
+            models.Index(
+                fields=["due_date"], name="installment_overdue_idx",
+                condition=models.Q(is_paid=False, penalty_amount=0),
+            ),
+        ]
 
     def __str__(self):
         return f"Loan {self.loan.id} - Cycle {self.cycle_number}"
@@ -112,6 +135,121 @@ class FinanceAuditLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes  = [
+            models.Index(fields=["pund", "-created_at", "-id"], name="auditlog_pund_keyset_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.action} - {self.pund.name}"
\ No newline at end of file
+        return f"{self.action} - {self.pund.name}"
+
+class PundFundBalance(models.Model):
+    pund                    = models.OneToOneField(Pund, on_delete=models.CASCADE, primary_key=True, related_name="fund_balance")
+    total_savings           = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_penalties         = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unpaid_savings          = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_outstanding = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_principal   = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_payable     = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available_fund          = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at              = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.pund.name} Fund ({self.available_fund})"
+
+
+BALANCE_FIELDS = (
+    "total_savings",
+    "total_penalties",
+    "unpaid_savings",
+    "active_loan_outstanding",
+    "active_loan_principal",
+    "active_loan_payable",
+    "available_fund",
+)
+
+
+class AppendOnlyError(Exception):
+    """Raised on any attempt to change or remove journal rows."""
+
+
+class AppendOnlyQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        raise AppendOnlyError(f"{self.model.__name__} rows are append-only")
+
+    def delete(self):
+        raise AppendOnlyError(f"{self.model.__name__} rows are append-only")
+
+
+class AppendOnlyModel(models.Model):
+    objects = AppendOnlyQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise AppendOnlyError(f"{type(self).__name__} rows are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise AppendOnlyError(f"{type(self).__name__} rows are append-only")
+
+
+class LedgerEntry(AppendOnlyModel):
+    """One fund movement: signed deltas of every PundFundBalance figure."""
+
+    KIND_CHOICES = [
+        ("OPENING",         "Opening balance"),
+        ("CYCLE_GENERATED", "Cycle generated"),
+        ("SAVING_PAID",     "Saving paid"),
+        ("LOAN_APPROVED",   "Loan approved"),
+        ("EMI_PAID",        "EMI paid"),
+        ("ADJUSTMENT",      "Balance rebuild adjustment"),
+    ]
+
+    pund                    = models.ForeignKey(Pund, on_delete=models.CASCADE, related_name="ledger_entries")
+    seq                     = models.PositiveBigIntegerField()
+    kind                    = models.CharField(max_length=20, choices=KIND_CHOICES)
+    cycle_number            = models.IntegerField(null=True, blank=True)
+    reference               = models.CharField(max_length=50, blank=True)
+    total_savings           = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_penalties         = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unpaid_savings          = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_outstanding = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_principal   = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_payable     = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available_fund          = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    created_at              = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("pund", "seq")
+        ordering        = ["seq"]
+        indexes         = [
+            models.Index(fields=["pund", "created_at"], name="ledger_pund_created_idx"),
+            models.Index(fields=["pund", "kind", "cycle_number"], name="ledger_pund_kind_cycle_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.pund_id} #{self.seq} {self.kind}"
+
+
+class LedgerSnapshot(AppendOnlyModel):
+    """Cumulative PundFundBalance figures right after journal entry ``seq``."""
+
+    pund                    = models.ForeignKey(Pund, on_delete=models.CASCADE, related_name="ledger_snapshots")
+    seq                     = models.PositiveBigIntegerField()
+    total_savings           = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_penalties         = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unpaid_savings          = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_outstanding = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_principal   = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_loan_payable     = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available_fund          = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    created_at              = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("pund", "seq")
+        ordering        = ["seq"]
+
+    def __str__(self):
+        return f"{self.pund_id} snapshot at #{self.seq}"
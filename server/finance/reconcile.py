@@ -0,0 +1,143 @@
+from decimal import Decimal
+
+from django.db.models import DecimalField, Exists, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Loan, LoanInstallment, Payment
+
+CHECKS = (
+    "loan_balance",
+    "loan_status",
+    "missing_emi_payment",
+    "emi_payment_mismatch",
+    "orphan_emi_payment",
+)
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def _money(value):
+    return str(Decimal(value).quantize(Decimal("0.01")))
+
+
+def _id_ranges(queryset, chunk_size):
+    """
+    Keyset bounds ``(after, upto)`` covering ``queryset`` in ``chunk_size`` steps.
+
+    Each step costs one index-only lookup of the chunk's last id; the final
+    range has ``upto=None``. Ranges are half-open on the left: ``after < id <= upto``.
+    """
+    after = 0
+    while True:
+        ids  = queryset.filter(id__gt=after).order_by("id").values_list("id", flat=True)
+        upto = next(iter(ids[chunk_size - 1:chunk_size]), None)
+        yield after, upto
+        if upto is None:
+            return
+        after = upto
+
+
+def _within(queryset, field, after, upto):
+    queryset = queryset.filter(**{f"{field}__gt": after})
+    return queryset if upto is None else queryset.filter(**{f"{field}__lte": upto})
+
+
+def _loan_rows(pund_id, after, upto):
+    paid = (
+        LoanInstallment.objects.filter(loan=OuterRef("pk"), is_paid=True)
+        .values("loan").annotate(total=Sum("emi_amount")).values("total")
+    )
+    loans = (
+        _within(Loan.objects.filter(pund_id=pund_id, status__in=("APPROVED", "CLOSED")), "id", after, upto)
+        .annotate(paid_emi=Coalesce(Subquery(paid, output_field=MONEY), Value(Decimal("0")), output_field=MONEY))
+        .annotate(expected=Greatest(F("total_payable") - F("paid_emi"), Value(Decimal("0")), output_field=MONEY))
+        .filter(
+            ~Q(remaining_amount=F("expected"))
+            | Q(status="CLOSED", remaining_amount__gt=0)
+            | Q(status="CLOSED", is_active=True)
+            | Q(status="APPROVED", remaining_amount__lte=0)
+            | Q(status="APPROVED", is_active=False)
+        )
+        .values_list("id", "status", "is_active", "remaining_amount", "expected")
+    )
+    for loan_id, state, is_active, remaining, expected in loans:
+        if remaining != expected:
+            yield {"check": "loan_balance", "pund": pund_id, "loan": loan_id,
+                   "expected": _money(expected), "actual": _money(remaining)}
+        if (state == "CLOSED") != (remaining <= 0) or (state == "CLOSED") == is_active:
+            yield {"check": "loan_status", "pund": pund_id, "loan": loan_id, "status": state,
+                   "is_active": is_active, "remaining_amount": _money(remaining)}
+
+
+def _installment_rows(pund_id, after, upto):
+    payment = Payment.objects.filter(
+        pund_id=pund_id, member=OuterRef("loan__member"),
+        cycle_number=OuterRef("cycle_number"), payment_type="EMI",
+    )
+    installments = (
+        _within(LoanInstallment.objects.filter(loan__pund_id=pund_id, is_paid=True), "loan_id", after, upto)
+        .annotate(
+            payment_id=Subquery(payment.values("id")[:1]),
+            payment_amount=Subquery(payment.values("amount")[:1]),
+            payment_penalty=Subquery(payment.values("penalty_amount")[:1]),
+            payment_paid=Subquery(payment.values("is_paid")[:1]),
+        )
+        .filter(
+            Q(payment_id__isnull=True)
+            | ~Q(payment_amount=F("emi_amount"))
+            | ~Q(payment_penalty=F("penalty_amount"))
+            | Q(payment_paid=False)
+        )
+        .values_list("id", "loan_id", "cycle_number", "emi_amount", "penalty_amount",
+                     "payment_id", "payment_amount", "payment_penalty", "payment_paid")
+    )
+    for pk, loan_id, number, emi, penalty, payment_id, amount, payment_penalty, payment_paid in installments:
+        row = {"pund": pund_id, "loan": loan_id, "installment": pk, "cycle": number}
+        if payment_id is None:
+            yield {"check": "missing_emi_payment", **row, "expected": _money(emi)}
+        else:
+            yield {"check": "emi_payment_mismatch", **row, "payment": payment_id,
+                   "expected": {"amount": _money(emi), "penalty": _money(penalty), "is_paid": True},
+                   "actual":   {"amount": _money(amount), "penalty": _money(payment_penalty), "is_paid": payment_paid}}
+
+
+def _orphan_payment_rows(pund_id, after, upto):
+    paid = LoanInstallment.objects.filter(
+        loan__pund_id=pund_id, loan__member=OuterRef("member"),
+        cycle_number=OuterRef("cycle_number"), is_paid=True,
+    )
+    payments = (
+        _within(Payment.objects.filter(pund_id=pund_id, payment_type="EMI"), "id", after, upto)
+        .filter(~Exists(paid))
+        .values_list("id", "member_id", "cycle_number", "amount")
+    )
+    for pk, member_id, number, amount in payments:
+        yield {"check": "orphan_emi_payment", "pund": pund_id, "payment": pk,
+               "member": member_id, "cycle": number, "actual": _money(amount)}
+
+
+def reconcile_pund(pund_id, chunk_size=5000):
+    """
+    Discrepancies between loans, their installments and EMI payments of one pund.
+
+    Loans (with their installments) and EMI payments are walked in keyset
+    chunks of ``chunk_size`` ids; each chunk is checked by one aggregate
+    query that only returns the rows that disagree. Returns a list of
+    JSON-serialisable dicts, one per discrepancy.
+    """
+    found = []
+    loans = Loan.objects.filter(pund_id=pund_id)
+    for after, upto in _id_ranges(loans, chunk_size):
+        found.extend(_loan_rows(pund_id, after, upto))
+        found.extend(_installment_rows(pund_id, after, upto))
+
+    payments = Payment.objects.filter(pund_id=pund_id, payment_type="EMI")
+    for after, upto in _id_ranges(payments, chunk_size):
+        found.extend(_orphan_payment_rows(pund_id, after, upto))
+    return found
+
+
+def init_worker():
+    """Process-pool initializer; a no-op when the worker was forked from a set-up parent."""
+    import django
+    django.setup()
@@ -28,4 +28,13 @@ class LoanRequestSerializer(serializers.Serializer):
 
 
 class LoanApproveSerializer(serializers.Serializer):
-    cycles = serializers.IntegerField(required=False)
\ No newline at end of file
+    cycles = serializers.IntegerField(required=False)
+
+class BulkMarkPaidSerializer(serializers.Serializer):
+    payment_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    all_except  = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, data):
+        if ("payment_ids" in data) == ("all_except" in data):
+            raise serializers.ValidationError("Provide either payment_ids or all_except")
+        return data
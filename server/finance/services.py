@@ -0,0 +1,752 @@
+import binascii
+import csv
+import io
+import logging
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connection, connections, models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from punds.models import Membership, Pund
+from .ledger import record_ledger_adjustment, record_ledger_entry
+from .models import Loan, LoanInstallment, Payment, PundFundBalance, PundStructure
+from .timeline import StructureTimeline
+
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+
+
+class CycleError(Exception):
+    """Raised when a pund's next cycle cannot be generated."""
+
+
+# ─── Cycle ledger ───────────────────────────────────────────
+
+def cycle_ledger(pund, from_cycle=None, to_cycle=None):
+    """
+    Return per-cycle saving figures for a pund, in cycle order.
+
+    Totals come from one grouped query and payment rows from one joined
+    query, so the cost does not grow with the number of cycles.
+    """
+    payments = Payment.objects.filter(pund=pund, payment_type="SAVING")
+    if from_cycle is not None:
+        payments = payments.filter(cycle_number__gte=from_cycle)
+    if to_cycle is not None:
+        payments = payments.filter(cycle_number__lte=to_cycle)
+
+    paid = models.Q(is_paid=True)
+    totals = (
+        payments.values("cycle_number")
+        .annotate(
+            total_expected=models.Sum("amount"),
+            paid_amount=models.Sum("amount", filter=paid),
+            paid_penalty=models.Sum("penalty_amount", filter=paid),
+            total_penalties=models.Sum("penalty_amount"),
+            paid_count=models.Count("id", filter=paid),
+            total_count=models.Count("id"),
+            due_date=models.Min("due_date"),
+        )
+        .order_by("cycle_number")
+    )
+
+    rows = {}
+    for p in payments.select_related("member").order_by("cycle_number", "id"):
+        rows.setdefault(p.cycle_number, []).append({
+            "id":             p.id,
+            "member_id":      p.member_id,
+            "member_name":    p.member.name,
+            "member_email":   p.member.email,
+            "amount":         str(p.amount),
+            "penalty_amount": str(p.penalty_amount),
+            "is_paid":        p.is_paid,
+            "due_date":       p.due_date,
+            "paid_at":        p.paid_at,
+        })
+
+    cycles = []
+    for t in totals:
+        total_collected = (t["paid_amount"] or ZERO) + (t["paid_penalty"] or ZERO)
+        paid_count, total_count = t["paid_count"], t["total_count"]
+        cycles.append({
+            "cycle_number":    t["cycle_number"],
+            "total_expected":  str(t["total_expected"] or ZERO),
+            "total_collected": str(total_collected),
+            "total_penalties": str(t["total_penalties"] or ZERO),
+            "paid_count":      paid_count,
+            "total_count":     total_count,
+            "progress":        round(paid_count / total_count * 100, 2) if total_count else 0,
+            "due_date":        t["due_date"],
+            "payments":        rows.get(t["cycle_number"], []),
+        })
+    return cycles
+
+
+# ─── Loan listings ──────────────────────────────────────────
+
+def annotated_loans(queryset):
+    """
+    Annotate loans with their installment repayment figures in one query.
+
+    Adds ``emi_paid``, ``penalty_paid``, ``paid_installments`` and
+    ``total_installments``; member and pund are joined. Each figure is a
+    correlated subquery on ``loan_id``, so only the listed loans'
+    installments are read (through ``installment_loan_paid_idx``).
+    """
+    money        = models.DecimalField(max_digits=12, decimal_places=2)
+    zero         = models.Value(ZERO, output_field=money)
+    installments = LoanInstallment.objects.filter(loan=models.OuterRef("pk"))
+    paid         = installments.filter(is_paid=True)
+    return queryset.select_related("member", "pund").annotate(
+        emi_paid=Coalesce(_grouped_subquery(paid, "loan", models.Sum("emi_amount"), money), zero),
+        penalty_paid=Coalesce(_grouped_subquery(paid, "loan", models.Sum("penalty_amount"), money), zero),
+        paid_installments=Coalesce(
+            _grouped_subquery(paid, "loan", models.Count("id"), models.IntegerField()), 0
+        ),
+        total_installments=Coalesce(
+            _grouped_subquery(installments, "loan", models.Count("id"), models.IntegerField()), 0
+        ),
+    )
+
+
+def loan_progress(loan):
+    """Repayment progress (0-100) of an ``annotated_loans`` row."""
+    if not loan.total_payable:
+        return 0
+    return round(float(loan.emi_paid / loan.total_payable * 100), 2)
+
+
+# ─── Summaries ──────────────────────────────────────────────
+
+def active_member_count(pund):
+    return Membership.objects.filter(pund=pund, role="MEMBER", is_active=True).count()
+
+
+def _grouped_subquery(queryset, group_by, aggregate, output_field):
+    """Correlated ``aggregate`` over ``queryset`` grouped by ``group_by`` (one value per outer row)."""
+    return models.Subquery(
+        queryset.order_by().values(group_by).annotate(total=aggregate).values("total")[:1],
+        output_field=output_field,
+    )
+
+
+def pund_listing(user, figures=False):
+    """
+    A user's memberships with their punds and active member counts, in one query.
+
+    With ``figures`` each row also carries ``current_cycle``,
+    ``my_unpaid_dues`` and ``my_loan_outstanding``, all computed by
+    correlated subqueries so the cost does not grow with the pund count.
+    """
+    money = models.DecimalField(max_digits=12, decimal_places=2)
+    zero  = models.Value(ZERO, output_field=money)
+    pund  = models.OuterRef("pund")
+
+    memberships = (
+        Membership.objects.filter(user=user)
+        .select_related("pund")
+        .order_by("id")
+        .annotate(member_count=Coalesce(_grouped_subquery(
+            Membership.objects.filter(pund=pund, role="MEMBER", is_active=True),
+            "pund", models.Count("id"), models.IntegerField(),
+        ), 0))
+    )
+    if not figures:
+        return memberships
+
+    mine = {"pund": pund, "member": models.OuterRef("user")}
+    return memberships.annotate(
+        current_cycle=models.Subquery(
+            Payment.objects.filter(pund=pund, payment_type="SAVING")
+            .order_by("-cycle_number").values("cycle_number")[:1]
+        ),
+        my_unpaid_dues=Coalesce(_grouped_subquery(
+            Payment.objects.filter(payment_type="SAVING", is_paid=False, **mine),
+            "pund", models.Sum(models.F("amount") + models.F("penalty_amount")), money,
+        ), zero),
+        my_loan_outstanding=Coalesce(_grouped_subquery(
+            Loan.objects.filter(is_active=True, **mine),
+            "pund", models.Sum("remaining_amount"), money,
+        ), zero),
+    )
+
+
+def serialize_pund_listing(membership):
+    data = {
+        "pund_id":           membership.pund.id,
+        "pund_name":         membership.pund.name,
+        "pund_type":         membership.pund.pund_type,
+        "pund_active":       membership.pund.is_active,
+        "membership_active": membership.is_active,
+        "role":              membership.role,
+        "member_count":      membership.member_count,
+    }
+    if hasattr(membership, "current_cycle"):
+        data.update({
+            "current_cycle":       membership.current_cycle or 0,
+            "my_unpaid_dues":      str(membership.my_unpaid_dues),
+            "my_loan_outstanding": str(membership.my_loan_outstanding),
+        })
+    return data
+
+
+def fund_summary(pund):
+    balance = get_fund_balance(pund)
+    return {
+        "total_collected":         str(balance.total_savings + balance.total_penalties),
+        "total_savings":           str(balance.total_savings),
+        "total_penalties":         str(balance.total_penalties),
+        "active_loan_outstanding": str(balance.active_loan_outstanding),
+        "active_loan_principal":   str(balance.active_loan_principal),
+        "active_loan_interest":    str(balance.active_loan_payable - balance.active_loan_principal),
+        "available_fund":          str(balance.available_fund),
+    }
+
+
+def saving_summary(pund, member_count=None):
+    """Saving totals for a pund in one aggregate; pass ``member_count`` if already known."""
+    paid, unpaid = models.Q(is_paid=True), models.Q(is_paid=False)
+    agg = Payment.objects.filter(pund=pund, payment_type="SAVING").aggregate(
+        total_cycles=models.Count("cycle_number", distinct=True),
+        total_expected=models.Sum("amount"),
+        paid_amount=models.Sum("amount", filter=paid),
+        paid_penalty=models.Sum("penalty_amount", filter=paid),
+        total_unpaid=models.Sum("amount", filter=unpaid),
+        total_penalty=models.Sum("penalty_amount"),
+    )
+    if member_count is None:
+        member_count = active_member_count(pund)
+    return {
+        "total_cycles":              agg["total_cycles"],
+        "total_members":             member_count,
+        "total_expected_savings":    str(agg["total_expected"] or ZERO),
+        "total_paid_savings":        str((agg["paid_amount"] or ZERO) + (agg["paid_penalty"] or ZERO)),
+        "total_unpaid_savings":      str(agg["total_unpaid"] or ZERO),
+        "total_penalties_collected": str(agg["total_penalty"] or ZERO),
+    }
+
+
+def my_financial_summary(user, pund_id):
+    """A member's own saving totals and active loan in a pund."""
+    paid, unpaid = models.Q(is_paid=True), models.Q(is_paid=False)
+    savings = Payment.objects.filter(member=user, pund_id=pund_id, payment_type="SAVING").aggregate(
+        total_savings_paid=models.Sum("amount", filter=paid),
+        total_saving_penalty=models.Sum("penalty_amount"),
+        total_unpaid_savings=models.Sum("amount", filter=unpaid),
+    )
+
+    loan_data   = None
+    active_loan = (
+        Loan.objects.filter(member=user, pund_id=pund_id, is_active=True)
+        .annotate(
+            total_emi_paid=models.Sum("installments__emi_amount", filter=models.Q(installments__is_paid=True)),
+            total_loan_penalty=models.Sum("installments__penalty_amount"),
+        )
+        .first()
+    )
+    if active_loan:
+        loan_data = {
+            "loan_id":            active_loan.id,
+            "principal":          str(active_loan.principal_amount),
+            "remaining_amount":   str(active_loan.remaining_amount),
+            "total_payable":      str(active_loan.total_payable),
+            "status":             active_loan.status,
+            "total_emi_paid":     str(active_loan.total_emi_paid or ZERO),
+            "total_loan_penalty": str(active_loan.total_loan_penalty or ZERO),
+        }
+
+    return {
+        "saving_summary": {k: str(v or ZERO) for k, v in savings.items()},
+        "loan_summary":   loan_data,
+    }
+
+
+def serialize_pund_loan(loan):
+    """Owner-facing row for an ``annotated_loans`` loan."""
+    return {
+        "loan_id":         loan.id,
+        "member":          loan.member.email,
+        "principal":       str(loan.principal_amount),
+        "remaining":       str(loan.total_payable - loan.emi_paid),
+        "total_payable":   str(loan.total_payable),
+        "interest_amount": str(loan.total_payable - loan.principal_amount),
+        "paid_amount":     str(loan.emi_paid + loan.penalty_paid),
+        "emi_paid":        str(loan.emi_paid),
+        "penalties_paid":  str(loan.penalty_paid),
+        "status":          loan.status,
+        "progress":        loan_progress(loan),
+    }
+
+
+def serialize_my_loan(loan):
+    """Borrower-facing row for an ``annotated_loans`` loan."""
+    return {
+        "loan_id":            loan.id,
+        "pund":               loan.pund.name,
+        "principal":          str(loan.principal_amount),
+        "remaining":          str(loan.total_payable - loan.emi_paid),
+        "total_payable":      str(loan.total_payable),
+        "status":             loan.status,
+        "is_active":          loan.is_active,
+        "paid_amount":        str(loan.emi_paid + loan.penalty_paid),
+        "emi_paid":           str(loan.emi_paid),
+        "penalties_paid":     str(loan.penalty_paid),
+        "progress":           loan_progress(loan),
+        "paid_installments":  loan.paid_installments,
+        "total_installments": loan.total_installments,
+    }
+
+
+# ─── Audit log pages ────────────────────────────────────────
+
+def encode_audit_cursor(log):
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_audit_cursor(cursor):
+    """Return ``(created_at, id)`` from an audit-log cursor; raises ValueError when malformed."""
+    try:
+        created_at, log_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError(cursor) from exc
+    return datetime.fromisoformat(created_at), int(log_id)
+
+
+def audit_log_page(logs, limit, cursor=None):
+    """One newest-first page of a FinanceAuditLog queryset, keyed on (created_at, id)."""
+    if cursor:
+        created_at, log_id = decode_audit_cursor(cursor)
+        logs = logs.filter(
+            models.Q(created_at__lt=created_at) | models.Q(created_at=created_at, id__lt=log_id)
+        )
+
+    page = list(logs.select_related("user").order_by("-created_at", "-id")[:max(limit, 1) + 1])
+    has_more, page = len(page) > limit, page[:limit]
+
+    return {
+        "next_cursor": encode_audit_cursor(page[-1]) if has_more else None,
+        "results": [{
+            "id":           log.id,
+            "action":       log.action,
+            "description":  log.description,
+            "performed_by": log.user.email if log.user else None,
+            "timestamp":    log.created_at,
+        } for log in page],
+    }
+
+
+# ─── Fund balance ───────────────────────────────────────────
+
+def compute_fund_totals(pund):
+    """Recompute every PundFundBalance figure for a pund from Payment and Loan rows."""
+    savings = Payment.objects.filter(pund=pund, payment_type="SAVING").aggregate(
+        total_savings=models.Sum("amount", filter=models.Q(is_paid=True)),
+        total_penalties=models.Sum("penalty_amount", filter=models.Q(is_paid=True)),
+        unpaid_savings=models.Sum("amount", filter=models.Q(is_paid=False)),
+    )
+    loans = Loan.objects.filter(pund=pund, is_active=True).aggregate(
+        active_loan_outstanding=models.Sum("remaining_amount"),
+        active_loan_principal=models.Sum("principal_amount"),
+        active_loan_payable=models.Sum("total_payable"),
+    )
+    totals = {k: v or ZERO for k, v in {**savings, **loans}.items()}
+    totals["available_fund"] = (
+        totals["total_savings"] + totals["total_penalties"] - totals["active_loan_outstanding"]
+    )
+    return totals
+
+
+def rebuild_fund_balance(pund, pending=None):
+    """
+    Overwrite the pund's running balance with freshly aggregated totals.
+
+    Whatever the rebuild corrects is appended to the journal as an
+    ADJUSTMENT entry in the same transaction, so ``balance_as_of`` keeps
+    agreeing with the balance row. ``pending`` are deltas already in the
+    rows that the caller journals itself.
+    """
+    totals = compute_fund_totals(pund)
+    with transaction.atomic():
+        balance, _ = PundFundBalance.objects.update_or_create(pund=pund, defaults=totals)
+        record_ledger_adjustment(pund, totals, pending)
+    return balance
+
+
+def get_fund_balance(pund, for_update=False):
+    """Return the pund's PundFundBalance, building it on first use."""
+    qs = PundFundBalance.objects.all()
+    if for_update:
+        qs = qs.select_for_update()
+    balance = qs.filter(pund=pund).first()
+    if balance is None:
+        balance = rebuild_fund_balance(pund)
+    return balance
+
+
+def adjust_fund_balance(pund, kind, cycle_number=None, reference="", **deltas):
+    """
+    Apply signed deltas to the running balance with F() expressions.
+
+    Call after the underlying rows are written, inside the same transaction.
+    A pund without a balance row yet is rebuilt instead, which already
+    reflects the write. The movement is also appended to the pund's
+    ``LedgerEntry`` journal as ``kind``.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    updated = PundFundBalance.objects.filter(pund=pund).update(
+        updated_at=timezone.now(),
+        **{field: models.F(field) + delta for field, delta in deltas.items()},
+    )
+    if not updated:
+        rebuild_fund_balance(pund, pending=deltas)
+    record_ledger_entry(
+        pund, kind, deltas, cycle_number=cycle_number, reference=reference, opening=compute_fund_totals,
+    )
+
+
+# ─── Penalty sweep ──────────────────────────────────────────
+
+_PENALTY_SWEEP_SQL = """
+    UPDATE {target} AS t
+       SET penalty_amount = s.{penalty_column}
+      FROM {extra_from}{pund} AS p, {structure} AS s
+     WHERE {join}
+       AND s.pund_id = p.id
+       AND s.id = (
+           SELECT s2.id FROM {structure} AS s2
+            WHERE s2.pund_id = p.id AND s2.effective_from <= %s
+            ORDER BY s2.effective_from DESC, s2.id DESC
+            LIMIT 1
+       )
+       AND p.pund_type = %s
+       AND p.is_active = %s
+       AND t.is_paid = %s
+       AND t.penalty_amount = 0
+       AND t.due_date < %s
+       AND t.id BETWEEN %s AND %s
+"""
+
+
+def _penalty_sweep_targets():
+    tables = {
+        "pund":      Pund._meta.db_table,
+        "structure": PundStructure._meta.db_table,
+    }
+    return {
+        "LOAN_INSTALLMENT": (
+            LoanInstallment.objects.all(),
+            # a primary-key lookup per row; a join lets the planner hash all loans
+            models.Subquery(Loan.objects.filter(pk=models.OuterRef("loan_id")).values("pund_id")),
+            _PENALTY_SWEEP_SQL.format(
+                target=LoanInstallment._meta.db_table,
+                penalty_column="missed_loan_penalty",
+                extra_from=f"{Loan._meta.db_table} AS l, ",
+                join="t.loan_id = l.id AND l.pund_id = p.id",
+                **tables,
+            ),
+            [],
+        ),
+        "SAVING_PAYMENT": (
+            Payment.objects.filter(payment_type="SAVING"),
+            "pund_id",
+            _PENALTY_SWEEP_SQL.format(
+                target=Payment._meta.db_table,
+                penalty_column="missed_saving_penalty",
+                extra_from="",
+                join="t.pund_id = p.id AND t.payment_type = %s",
+                **tables,
+            ),
+            ["SAVING"],
+        ),
+    }
+
+
+def sweep_penalties(today=None, batch_size=1000):
+    """
+    Apply missed-saving and missed-loan penalties to overdue unpaid rows.
+
+    Candidates are walked in id order in batches of ``batch_size``; each
+    batch is one UPDATE ... FROM per pund type against the structure in
+    force on ``today``. Every run looks at all unpaid, unpenalised overdue
+    rows (served by the partial due-date indexes), so rows created late
+    with a past due date, or skipped while their pund was inactive, are
+    still caught. Returns the number of rows penalised per target.
+    """
+    today = today or timezone.now().date()
+    counts = {}
+
+    for target, (candidates, pund_field, sql, join_params) in _penalty_sweep_targets().items():
+        candidates = candidates.filter(is_paid=False, penalty_amount=0, due_date__lt=today)
+
+        updated, last_id = 0, 0
+        while True:
+            batch = list(
+                candidates.filter(id__gt=last_id).order_by("id").values_list("id", pund_field)[:batch_size]
+            )
+            if not batch:
+                break
+            first_id, last_id = batch[0][0], batch[-1][0]
+            with transaction.atomic(), connection.cursor() as cursor:
+                batch_updated = 0
+                for pund_type, _ in Pund.PUND_TYPE_CHOICES:
+                    cursor.execute(sql, [*join_params, today, pund_type, True, False, today, first_id, last_id])
+                    batch_updated += cursor.rowcount
+                if batch_updated:
+                    Pund.objects.filter(id__in={pund_id for _, pund_id in batch}).bump_version()
+            updated += batch_updated
+
+        counts[target] = updated
+
+    return counts
+
+
+# ─── Cycle generation ───────────────────────────────────────
+
+def cycle_due_date(pund, structure, cycle_number):
+    """Due date of ``cycle_number`` counted from the structure's effective date."""
+    base = structure.effective_from
+    if pund.pund_type == "DAILY":
+        return base + timedelta(days=cycle_number)
+    if pund.pund_type == "MONTHLY":
+        return base + relativedelta(months=cycle_number)
+    return base + timedelta(weeks=cycle_number)  # WEEKLY (default)
+
+
+def latest_structure(pund):
+    return StructureTimeline.for_pund(pund).latest()
+
+
+def _latest_saving_cycle(pund):
+    """The pund's newest SAVING rows first; one probe of ``payment_pund_type_cycle_idx``."""
+    return Payment.objects.filter(pund=pund, payment_type="SAVING").order_by("-cycle_number")
+
+
+def _saving_cycle_state(pund):
+    """``last_cycle`` and its ``last_due_date`` (both None before the first cycle)."""
+    latest = _latest_saving_cycle(pund).values("cycle_number", "due_date").first() or {}
+    return {"last_cycle": latest.get("cycle_number"), "last_due_date": latest.get("due_date")}
+
+
+_PAYMENT_COPY_COLUMNS = (
+    "pund_id", "member_id", "cycle_number", "payment_type", "amount",
+    "penalty_amount", "is_paid", "due_date", "created_at",
+)
+
+
+def _copy_saving_rows(rows):
+    """Stream rows into the payments table with COPY (PostgreSQL only)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    sql = (
+        f"COPY {Payment._meta.db_table} ({', '.join(_PAYMENT_COPY_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):      # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:                                # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _insert_saving_rows(pund, member_ids, cycles, amount, batch_size):
+    """Insert one unpaid SAVING row per member for each ``(cycle_number, due_date)``."""
+    now = timezone.now()
+    for cycle_number, due_date in cycles:
+        for start in range(0, len(member_ids), batch_size):
+            chunk = member_ids[start:start + batch_size]
+            if connection.vendor == "postgresql":
+                _copy_saving_rows(
+                    (pund.id, member_id, cycle_number, "SAVING", amount, ZERO, False, due_date, now.isoformat())
+                    for member_id in chunk
+                )
+            else:
+                Payment.objects.bulk_create([
+                    Payment(
+                        pund_id=pund.id,
+                        member_id=member_id,
+                        cycle_number=cycle_number,
+                        payment_type="SAVING",
+                        amount=amount,
+                        due_date=due_date,
+                        penalty_amount=ZERO,
+                        is_paid=False,
+                        created_at=now,
+                    )
+                    for member_id in chunk
+                ])
+
+
+def generate_cycles(pund, count=1, structure=None, batch_size=None, today=None):
+    """
+    Create the pund's next ``count`` saving cycles; returns ``[(cycle_number, due_date), ...]``.
+
+    Must run inside a transaction: the pund row is locked so concurrent
+    callers (owner and scheduler) cannot generate the same cycle twice.
+    Unpaid rows of the cycle before the first new one get the
+    missed-saving penalty once their due date is before ``today``, the
+    same rule ``sweep_penalties`` applies; rows due today are left to a
+    later sweep. Rows are inserted from member ids alone, in
+    ``batch_size`` chunks (COPY on PostgreSQL).
+    """
+    batch_size = batch_size or settings.CYCLE_INSERT_BATCH_SIZE
+    today      = today or timezone.now().date()
+    Pund.objects.select_for_update().filter(id=pund.id).first()
+
+    structure = structure or latest_structure(pund)
+    if not structure:
+        raise CycleError("Structure not set")
+
+    member_ids = list(
+        Membership.objects.filter(pund=pund, role="MEMBER", is_active=True)
+        .order_by("user_id").values_list("user_id", flat=True)
+    )
+    if not member_ids:
+        raise CycleError("No active members in this pund")
+
+    previous = _saving_cycle_state(pund)["last_cycle"] or 0
+    if previous:
+        Payment.objects.filter(
+            pund=pund, payment_type="SAVING", cycle_number=previous, is_paid=False, penalty_amount=0,
+            due_date__lt=today,
+        ).update(penalty_amount=structure.missed_saving_penalty)
+
+    cycles = [
+        (number, cycle_due_date(pund, structure, number))
+        for number in range(previous + 1, previous + 1 + count)
+    ]
+    _insert_saving_rows(pund, member_ids, cycles, structure.saving_amount, batch_size)
+
+    for number, _ in cycles:
+        adjust_fund_balance(
+            pund, "CYCLE_GENERATED", cycle_number=number, reference=f"cycle:{number}",
+            unpaid_savings=structure.saving_amount * len(member_ids),
+        )
+    Pund.objects.filter(id=pund.id).bump_version()
+    return cycles
+
+
+def generate_cycle(pund, structure=None, today=None):
+    """Create the pund's next saving cycle and return ``(cycle_number, due_date)``."""
+    return generate_cycles(pund, structure=structure, today=today)[0]
+
+
+def _cycle_is_due(structure_from, last_cycle, last_due_date, today):
+    """The first cycle opens when the structure takes effect; later ones once the previous falls due."""
+    if not last_cycle:
+        return structure_from <= today
+    return last_due_date is not None and last_due_date <= today
+
+
+def due_cycle_punds(today=None):
+    """
+    Ids of active punds whose next saving cycle is due on ``today``.
+
+    Each pund's latest structure and latest cycle come from correlated
+    LIMIT 1 subqueries on their indexes, so a run costs the same however
+    much payment history the punds have.
+    """
+    today  = today or timezone.now().date()
+    latest = PundStructure.objects.filter(pund=models.OuterRef("pk")).order_by("-effective_from")
+    cycle  = _latest_saving_cycle(models.OuterRef("pk"))
+    punds = (
+        Pund.objects.filter(is_active=True)
+        .annotate(
+            structure_from=models.Subquery(latest.values("effective_from")[:1]),
+            last_cycle=models.Subquery(cycle.values("cycle_number")[:1]),
+            last_due_date=models.Subquery(cycle.values("due_date")[:1]),
+        )
+        .filter(structure_from__isnull=False)
+        .order_by("id")
+        .values_list("id", "structure_from", "last_cycle", "last_due_date")
+    )
+    return [pund_id for pund_id, *state in punds if _cycle_is_due(*state, today)]
+
+
+def _generate_due_for_pund(pund_id, today):
+    """Generate every cycle a pund is owed, each one in its own transaction."""
+    generated = 0
+    while True:
+        with transaction.atomic():
+            pund = Pund.objects.select_for_update().filter(id=pund_id, is_active=True).first()
+            structure = pund and latest_structure(pund)
+            if not structure:
+                return generated
+            state = _saving_cycle_state(pund)
+            if not _cycle_is_due(structure.effective_from, state["last_cycle"], state["last_due_date"], today):
+                return generated
+            try:
+                generate_cycle(pund, structure, today=today)
+            except CycleError:
+                return generated
+        generated += 1
+
+
+def _generate_due_batch(pund_ids, today, deadline):
+    results = {"generated": 0, "punds": 0, "deferred": 0, "failed": 0}
+    # warm the cache: one query for the versions, one for the whole batch's structures
+    StructureTimeline.for_punds(Pund.objects.filter(id__in=pund_ids).only("id", "version"))
+    for pund_id in pund_ids:
+        if deadline and time.monotonic() >= deadline:
+            results["deferred"] += 1
+            continue
+        try:
+            created = _generate_due_for_pund(pund_id, today)
+        except Exception:
+            logger.exception("Cycle generation failed for pund %s", pund_id)
+            results["failed"] += 1
+            continue
+        results["generated"] += created
+        results["punds"] += bool(created)
+    return results
+
+
+def _generate_due_batch_in_thread(pund_ids, today, deadline):
+    try:
+        return _generate_due_batch(pund_ids, today, deadline)
+    finally:
+        connections.close_all()
+
+
+def generate_due_cycles(today=None, workers=4, batch_size=100, time_budget=None):
+    """
+    Roll every due pund over to its next cycle(s).
+
+    Due punds are split into batches handled by a thread pool; each pund is
+    generated in its own transaction, so a re-run only picks up what is
+    still due. Work not started before ``time_budget`` seconds is deferred
+    to the next run. Returns counts of generated cycles, rolled-over,
+    deferred and failed punds.
+    """
+    today    = today or timezone.now().date()
+    deadline = time.monotonic() + time_budget if time_budget else None
+    pund_ids = due_cycle_punds(today)
+    batches  = [pund_ids[i:i + batch_size] for i in range(0, len(pund_ids), batch_size)]
+
+    totals = {"generated": 0, "punds": 0, "deferred": 0, "failed": 0}
+    if workers <= 1:
+        outcomes = [_generate_due_batch(batch, today, deadline) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(
+                lambda batch: _generate_due_batch_in_thread(batch, today, deadline), batches
+            ))
+    for outcome in outcomes:
+        for key, value in outcome.items():
+            totals[key] += value
+    return totals
@@ -1,16 +1,47 @@
+import csv
+import json
+import re
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 
 from punds.models import Pund, Membership
+from finance.cache import summary_cache_stats
+from finance.ledger import balance_as_of
+from finance.services import (
+    annotated_loans,
+    audit_log_page,
+    cycle_ledger,
+    due_cycle_punds,
+    pund_listing,
+    sweep_penalties,
+)
+from finance.timeline import StructureTimeline
 from finance.models import (
+    BALANCE_FIELDS,
+    AppendOnlyError,
+    LedgerEntry,
+    LedgerSnapshot,
     PundStructure,
     Payment,
     Loan,
     LoanInstallment,
-    FinanceAuditLog
+    FinanceAuditLog,
+    PundFundBalance,
 )
 
 User = get_user_model()
@@ -20,6 +51,9 @@ class FinanceTests(APITestCase):
 
     def setUp(self):
 
+        for alias in ("default", "summaries", "throttle"):
+            caches[alias].clear()
+
         # create users
         self.owner = User.objects.create_user(
             email="owner@test.com",
@@ -338,4 +372,618 @@ class FinanceTests(APITestCase):
 
         response = self.client.get(url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    # ------------------------------------------------
+    # CYCLE PAYMENTS RANGE
+    # ------------------------------------------------
+    def test_cycle_payments_range(self):
+
+        for cycle in (2, 3, 4):
+            Payment.objects.create(
+                pund=self.pund,
+                member=self.member,
+                cycle_number=cycle,
+                amount=1000,
+                is_paid=cycle == 3,
+                due_date=timezone.now().date()
+            )
+
+        url = f"/finance/pund/{self.pund.id}/cycle-payments/?from_cycle=2&to_cycle=3"
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c["cycle_number"] for c in response.data], [2, 3])
+        self.assertEqual(response.data[1]["paid_count"], 1)
+        self.assertEqual(response.data[1]["payments"][0]["member_email"], "member@test.com")
+
+        response = self.client.get(f"/finance/pund/{self.pund.id}/cycle-payments/?from_cycle=x")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    # ------------------------------------------------
+    # FUND BALANCE
+    # ------------------------------------------------
+    def test_fund_balance_tracks_writes(self):
+
+        payment = Payment.objects.create(
+            pund=self.pund,
+            member=self.member,
+            cycle_number=2,
+            amount=1000,
+            due_date=timezone.now().date()
+        )
+
+        url = f"/finance/pund/{self.pund.id}/fund-summary/"
+
+        self.assertEqual(Decimal(self.client.get(url).data["available_fund"]), 10000)
+
+        self.client.post(f"/finance/payment/{payment.id}/mark-paid/")
+
+        response = self.client.get(url)
+
+        self.assertEqual(Decimal(response.data["total_savings"]), 11000)
+        self.assertEqual(Decimal(response.data["available_fund"]), 11000)
+
+        balance = PundFundBalance.objects.get(pund=self.pund)
+        version = Pund.objects.get(id=self.pund.id).version
+        call_command("rebuild_fund_balances", stdout=StringIO())
+        rebuilt = PundFundBalance.objects.get(pund=self.pund)
+
+        self.assertEqual(balance.available_fund, rebuilt.available_fund)
+        self.assertEqual(balance.total_savings, rebuilt.total_savings)
+        self.assertEqual(Pund.objects.get(id=self.pund.id).version, version + 1)
+        self.assertFalse(LedgerEntry.objects.filter(pund=self.pund, kind="ADJUSTMENT").exists())
+
+        # a row changed behind the balance's back: the rebuild journals the correction
+        Payment.objects.filter(id=payment.id).update(amount=1500)
+        call_command("rebuild_fund_balances", stdout=StringIO())
+        rebuilt = PundFundBalance.objects.get(pund=self.pund)
+        adjustment = LedgerEntry.objects.filter(pund=self.pund).last()
+
+        self.assertEqual(adjustment.kind, "ADJUSTMENT")
+        self.assertEqual(adjustment.total_savings, Decimal("500"))
+        _, as_of = balance_as_of(self.pund)
+        for field in BALANCE_FIELDS:
+            self.assertEqual(as_of[field], getattr(rebuilt, field))
+
+
+    # ------------------------------------------------
+    # BULK MARK PAID
+    # ------------------------------------------------
+    def test_bulk_mark_paid(self):
+
+        other = User.objects.create_user(email="other@test.com", password="Password123")
+        first = Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=2, amount=1000
+        )
+        second = Payment.objects.create(
+            pund=self.pund, member=other, cycle_number=2, amount=1000
+        )
+
+        url = f"/finance/pund/{self.pund.id}/cycle/2/mark-paid/"
+
+        response = self.client.post(url, {"payment_ids": [first.id, 999999]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"id": first.id, "status": "paid"},
+            {"id": 999999, "status": "not_found"},
+        ])
+
+        response = self.client.post(url, {"all_except": []}, format="json")
+
+        self.assertEqual(response.data["paid_count"], 1)
+        second.refresh_from_db()
+        self.assertTrue(second.is_paid)
+        self.assertEqual(FinanceAuditLog.objects.filter(pund=self.pund, action="Saving Paid").count(), 2)
+
+
+    # ------------------------------------------------
+    # PENALTY SWEEP
+    # ------------------------------------------------
+    def test_sweep_penalties(self):
+
+        past = timezone.now().date() - timedelta(days=3)
+
+        self.structure.effective_from = past
+        self.structure.save()
+
+        loan = Loan.objects.create(
+            pund=self.pund,
+            member=self.member,
+            principal_amount=5000,
+            interest_percentage=5,
+            total_payable=5000,
+            total_cycles=2,
+            remaining_amount=5000,
+            status="APPROVED",
+            is_active=True
+        )
+        overdue = LoanInstallment.objects.create(
+            loan=loan, cycle_number=1, emi_amount=2500, due_date=past
+        )
+        upcoming = LoanInstallment.objects.create(
+            loan=loan, cycle_number=2, emi_amount=2500, due_date=timezone.now().date()
+        )
+        missed = Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=2, amount=1000, due_date=past
+        )
+
+        response = self.client.get(f"/finance/loan/{loan.id}/detail/")
+
+        self.assertEqual(response.data["installments"][0]["penalty_amount"], "0.00")
+
+        call_command("sweep_penalties", stdout=StringIO())
+
+        overdue.refresh_from_db()
+        upcoming.refresh_from_db()
+        missed.refresh_from_db()
+        self.assertEqual(overdue.penalty_amount, 100)
+        self.assertEqual(upcoming.penalty_amount, 0)
+        self.assertEqual(missed.penalty_amount, 50)
+
+        # a row created after a sweep with an already past due date is still picked up
+        late = Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=3, amount=1000, due_date=past
+        )
+        call_command("sweep_penalties", stdout=StringIO())
+        late.refresh_from_db()
+        self.assertEqual(late.penalty_amount, 50)
+
+
+    # ------------------------------------------------
+    # GENERATE DUE CYCLES
+    # ------------------------------------------------
+    def test_generate_due_cycles(self):
+
+        call_command("generate_due_cycles", "--workers", "1", stdout=StringIO())
+        call_command("generate_due_cycles", "--workers", "1", stdout=StringIO())
+
+        cycles = Payment.objects.filter(pund=self.pund, payment_type="SAVING") \
+            .values_list("cycle_number", flat=True)
+
+        self.assertEqual(sorted(set(cycles)), [1, 2])
+        self.assertEqual(Payment.objects.filter(pund=self.pund, cycle_number=2).count(), 1)
+
+        # rolling over on cycle 2's due date does not fine members who pay that day
+        cycle_2 = Payment.objects.get(pund=self.pund, cycle_number=2)
+        call_command("generate_due_cycles", "--workers", "1", "--date", cycle_2.due_date.isoformat(),
+                     stdout=StringIO())
+        cycle_2.refresh_from_db()
+        self.assertTrue(Payment.objects.filter(pund=self.pund, cycle_number=3).exists())
+        self.assertEqual(cycle_2.penalty_amount, 0)
+
+        sweep_penalties(today=cycle_2.due_date + timedelta(days=1))
+        cycle_2.refresh_from_db()
+        self.assertEqual(cycle_2.penalty_amount, Decimal("50"))
+
+    # ------------------------------------------------
+    # LOAN LISTINGS
+    # ------------------------------------------------
+    def _create_loan(self, status_value="APPROVED"):
+
+        loan = Loan.objects.create(
+            pund=self.pund,
+            member=self.member,
+            principal_amount=1000,
+            interest_percentage=5,
+            total_payable=1000,
+            total_cycles=2,
+            remaining_amount=500,
+            status=status_value,
+            is_active=status_value == "APPROVED"
+        )
+        LoanInstallment.objects.create(
+            loan=loan, cycle_number=1, emi_amount=500, penalty_amount=20,
+            is_paid=True, due_date=timezone.now().date()
+        )
+        LoanInstallment.objects.create(
+            loan=loan, cycle_number=2, emi_amount=500, due_date=timezone.now().date()
+        )
+        return loan
+
+    def test_pund_loans_constant_queries(self):
+
+        url = f"/finance/pund/{self.pund.id}/loans/"
+        self._create_loan()
+
+        with CaptureQueriesContext(connection) as one_loan:
+            response = self.client.get(url)
+
+        self.assertEqual(Decimal(response.data[0]["paid_amount"]), 520)
+        self.assertEqual(response.data[0]["progress"], 50.0)
+
+        self._create_loan("CLOSED")
+        self._create_loan("CLOSED")
+
+        with CaptureQueriesContext(connection) as three_loans:
+            response = self.client.get(url + "?status=closed&page=1")
+
+        self.assertEqual(len(three_loans), len(one_loan) + 1)  # + pagination COUNT
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(url + "?status=unknown")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ------------------------------------------------
+    # AUDIT LOG PAGINATION
+    # ------------------------------------------------
+    def test_audit_logs_keyset_pagination(self):
+
+        for i in range(5):
+            FinanceAuditLog.objects.create(
+                pund=self.pund,
+                user=self.owner if i % 2 else self.member,
+                action="Saving Paid" if i < 4 else "Pund Closed",
+                description=f"log {i}"
+            )
+
+        url = f"/finance/pund/{self.pund.id}/audit-logs/"
+
+        first = self.client.get(url, {"limit": 3})
+        second = self.client.get(url, {"limit": 3, "cursor": first.data["next_cursor"]})
+
+        seen = [r["description"] for r in first.data["results"] + second.data["results"]]
+        self.assertEqual(seen, [f"log {i}" for i in range(4, -1, -1)])
+        self.assertIsNone(second.data["next_cursor"])
+
+        response = self.client.get(url, {"action": "Saving Paid", "user": self.owner.id})
+
+        self.assertEqual([r["description"] for r in response.data["results"]], ["log 3", "log 1"])
+
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ------------------------------------------------
+    # ETAG
+    # ------------------------------------------------
+    def test_fund_summary_etag(self):
+
+        url = f"/finance/pund/{self.pund.id}/fund-summary/"
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        payment = Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=2, amount=1000
+        )
+        self.client.post(f"/finance/payment/{payment.id}/mark-paid/")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_summary_cache_invalidated_by_writes(self):
+
+        url = f"/finance/pund/{self.pund.id}/fund-summary/"
+
+        first = self.client.get(url).data
+        self.client.get(url)
+
+        stats = summary_cache_stats()["fund"]
+        self.assertEqual(stats, {"hits": 1, "misses": 1})
+
+        payment = Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=2, amount=1000
+        )
+        self.client.post(f"/finance/payment/{payment.id}/mark-paid/")
+
+        response = self.client.get(url)
+
+        self.assertEqual(summary_cache_stats()["fund"]["misses"], 2)
+        self.assertEqual(
+            Decimal(response.data["total_savings"]) - Decimal(first["total_savings"]),
+            Decimal("1000"),
+        )
+
+
+    def test_structure_timeline(self):
+
+        today = timezone.now().date()
+        PundStructure.objects.create(
+            pund=self.pund, saving_amount=3000, loan_interest_percentage=5,
+            missed_saving_penalty=50, missed_loan_penalty=100, default_loan_cycles=6,
+            effective_from=today + timedelta(days=14),
+        )
+
+        self.pund.refresh_from_db()  # the create above bumped the version
+        with self.assertNumQueries(1):
+            timeline = StructureTimeline.for_pund(self.pund)
+        with self.assertNumQueries(0):
+            StructureTimeline.for_pund(self.pund)
+
+        self.assertIsNone(timeline.at(today - timedelta(days=1)))
+        self.assertEqual(timeline.at(today), self.structure)
+        self.assertEqual(timeline.at(today + timedelta(days=20)).saving_amount, 3000)
+        self.assertEqual(timeline.latest().saving_amount, 3000)
+
+        self.client.post(f"/finance/pund/{self.pund.id}/set-structure/", {
+            "saving_amount": 4000,
+            "loan_interest_percentage": 6,
+            "missed_saving_penalty": 60,
+            "missed_loan_penalty": 120,
+            "default_loan_cycles": 8,
+            "effective_from": today + timedelta(days=30),
+        })
+
+        self.pund.refresh_from_db()
+        self.assertEqual(StructureTimeline.for_pund(self.pund).latest().saving_amount, 4000)
+
+        # another worker (its own local cache) edits the structure outside the API;
+        # this worker's memo is keyed on the old version and is never read again
+        this_worker  = LocMemCache("timeline-worker-a", {})
+        other_worker = LocMemCache("timeline-worker-b", {})
+        latest = PundStructure.objects.get(pund=self.pund, saving_amount=4000)
+        with mock.patch("finance.timeline.cache", this_worker):
+            self.assertEqual(StructureTimeline.for_pund(self.pund).latest().saving_amount, 4000)
+        with mock.patch("finance.timeline.cache", other_worker):
+            latest.saving_amount = 4500
+            latest.save()
+        with mock.patch("finance.timeline.cache", this_worker):
+            self.pund.refresh_from_db()
+            self.assertEqual(StructureTimeline.for_pund(self.pund).latest().saving_amount, 4500)
+            latest.delete()
+            self.pund.refresh_from_db()
+            self.assertEqual(StructureTimeline.for_pund(self.pund).latest().saving_amount, 3000)
+
+
+    def test_generate_multiple_cycles(self):
+
+        url = f"/finance/pund/{self.pund.id}/generate-cycle/"
+        existing = Payment.objects.filter(pund=self.pund, payment_type="SAVING").count()
+
+        response = self.client.post(url, {"cycles": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([c["cycle_number"] for c in response.data["cycles"]], [2, 3, 4])
+        self.assertEqual(
+            Payment.objects.filter(pund=self.pund, payment_type="SAVING").count(), existing + 3
+        )
+        due_dates = [c["due_date"] for c in response.data["cycles"]]
+        self.assertEqual(due_dates, sorted(due_dates))
+
+        self.assertEqual(self.client.post(url, {"cycles": 0}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_generate_cycle_queries_do_not_grow_with_members(self):
+
+        def generation_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(f"/finance/pund/{self.pund.id}/generate-cycle/")
+            return len(ctx.captured_queries)
+
+        generation_queries()  # first write builds the fund balance row
+        baseline = generation_queries()
+
+        for i in range(20):
+            user = User.objects.create_user(email=f"bulk{i}@test.com")
+            Membership.objects.create(user=user, pund=self.pund, role="MEMBER")
+
+        self.assertEqual(generation_queries(), baseline)
+
+
+    def test_export_statement(self):
+
+        url = f"/finance/pund/{self.pund.id}/export/"
+        self._create_loan()
+        FinanceAuditLog.objects.create(pund=self.pund, user=self.owner, action="NOTE", description='said "hi", twice')
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ["record", "id", "cycle"])
+        self.assertEqual([r[0] for r in rows[1:]], ["payment", "installment", "installment", "audit"])
+        self.assertEqual(rows[2][8], "PAID")
+        self.assertEqual(rows[4][-1], 'said "hi", twice')
+
+        response = self.client.get(url, {"type": "payments,audit", "cycle": 1})
+        rows = list(csv.reader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([r[0] for r in rows[1:]], ["payment"])
+
+        response = self.client.get(url, {"file_format": "xlsx"})
+        workbook = zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        self.assertEqual(sheet.count("<row>"), 5)
+        self.assertIn('said "hi", twice', sheet)
+
+        self.assertEqual(self.client.get(url, {"type": "loans"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(self.member)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reconcile_ledgers(self):
+
+        def reconcile():
+            out, err = StringIO(), StringIO()
+            call_command("reconcile_ledgers", "--chunk-size", "1", stdout=out, stderr=err)
+            return sorted(json.loads(line)["check"] for line in out.getvalue().splitlines())
+
+        loan = self._create_loan()
+        self.assertEqual(reconcile(), ["missing_emi_payment"])
+
+        emi = Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=1, payment_type="EMI",
+            amount=500, penalty_amount=20, is_paid=True, due_date=timezone.now().date(),
+        )
+        self.assertEqual(reconcile(), [])
+
+        Loan.objects.filter(id=loan.id).update(remaining_amount=400)
+        Payment.objects.filter(id=emi.id).update(amount=450)
+        Payment.objects.create(
+            pund=self.pund, member=self.member, cycle_number=2, payment_type="EMI",
+            amount=500, is_paid=True, due_date=timezone.now().date(),
+        )
+        self.assertEqual(reconcile(), ["emi_payment_mismatch", "loan_balance", "orphan_emi_payment"])
+
+        Loan.objects.filter(id=loan.id).update(remaining_amount=0)
+        self.assertIn("loan_status", reconcile())
+
+    @override_settings(LEDGER_SNAPSHOT_INTERVAL=2)
+    def test_ledger_journal_as_of(self):
+
+        url = f"/finance/pund/{self.pund.id}/balance-as-of/"
+        self.client.post(f"/finance/pund/{self.pund.id}/generate-cycle/")
+        payment = Payment.objects.get(pund=self.pund, member=self.member, cycle_number=2)
+        self.client.post(f"/finance/payment/{payment.id}/mark-paid/")
+        self.client.post(f"/finance/pund/{self.pund.id}/generate-cycle/")
+
+        kinds = list(LedgerEntry.objects.filter(pund=self.pund).values_list("seq", "kind"))
+        self.assertEqual(kinds, [
+            (1, "OPENING"), (2, "CYCLE_GENERATED"), (3, "SAVING_PAID"), (4, "CYCLE_GENERATED"),
+        ])
+        self.assertEqual(list(LedgerSnapshot.objects.filter(pund=self.pund).values_list("seq", flat=True)), [2, 4])
+
+        response = self.client.get(url, {"cycle": 1})
+        self.assertEqual(response.data["entry_seq"], 1)
+        self.assertEqual(Decimal(response.data["available_fund"]), Decimal("10000"))
+
+        response = self.client.get(url, {"cycle": 2})
+        self.assertEqual(response.data["entry_seq"], 3)
+        self.assertEqual(Decimal(response.data["available_fund"]), Decimal("11000"))
+        self.assertEqual(Decimal(response.data["unpaid_savings"]), Decimal("0"))
+
+        response = self.client.get(url, {"date": timezone.now().date().isoformat()})
+        balance = PundFundBalance.objects.get(pund=self.pund)
+        for field in ("total_savings", "unpaid_savings", "available_fund"):
+            self.assertEqual(Decimal(response.data[field]), getattr(balance, field))
+
+        yesterday = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(self.client.get(url, {"date": yesterday}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+
+        entry = LedgerEntry.objects.get(pund=self.pund, seq=1)
+        with self.assertRaises(AppendOnlyError):
+            entry.save()
+        with self.assertRaises(AppendOnlyError):
+            LedgerEntry.objects.filter(pund=self.pund).update(reference="edited")
+
+
+class IndexUsageTests(TestCase):
+    """Guards the hot-path indexes: every query below must be answered by an index scan."""
+
+    PUNDS, MEMBERS, CYCLES = 20, 30, 24
+
+    @classmethod
+    def setUpTestData(cls):
+
+        owner = User.objects.create_user(email="seed-owner@test.com")
+        users = User.objects.bulk_create([
+            User(email=f"seed{i}@test.com") for i in range(cls.MEMBERS)
+        ])
+        punds = Pund.objects.bulk_create([
+            Pund(name=f"Seed Pund {i}", pund_type="WEEKLY", created_by=owner)
+            for i in range(cls.PUNDS)
+        ])
+        Membership.objects.bulk_create([
+            Membership(user=u, pund=p, role="MEMBER") for p in punds for u in users
+        ])
+
+        today = timezone.now().date()
+        PundStructure.objects.bulk_create([
+            PundStructure(
+                pund=p, saving_amount=100, loan_interest_percentage=5, missed_saving_penalty=10,
+                missed_loan_penalty=10, effective_from=today - timedelta(weeks=cls.CYCLES - c),
+            )
+            for p in punds for c in range(0, cls.CYCLES, 4)
+        ])
+        Payment.objects.bulk_create([
+            Payment(
+                pund=p, member=u, cycle_number=c, amount=100,
+                is_paid=c < cls.CYCLES, due_date=today - timedelta(weeks=cls.CYCLES - c),
+            )
+            for p in punds for u in users for c in range(1, cls.CYCLES + 1)
+        ], batch_size=2000)
+
+        loans = Loan.objects.bulk_create([
+            Loan(
+                pund=p, member=u, principal_amount=1000, interest_percentage=5,
+                total_payable=1000, total_cycles=10, remaining_amount=500,
+                status="APPROVED", is_active=True,
+            )
+            for p in punds for u in users
+        ])
+        LoanInstallment.objects.bulk_create([
+            LoanInstallment(
+                loan=loan, cycle_number=c, emi_amount=100,
+                is_paid=c <= 5, due_date=today + timedelta(weeks=c - 5),
+            )
+            for loan in loans for c in range(1, 11)
+        ], batch_size=2000)
+        FinanceAuditLog.objects.bulk_create([
+            FinanceAuditLog(pund=p, user=owner, action="Seed", description="seed")
+            for p in punds for _ in range(50)
+        ])
+
+        cls.pund, cls.member, cls.loan = punds[0], users[0], loans[0]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    HOT_TABLES = (Payment, Loan, LoanInstallment, FinanceAuditLog, Membership, PundStructure)
+
+    def assertIndexScans(self, run):
+        """Run ``run`` and EXPLAIN every query it executed; none may scan a hot table."""
+        with CaptureQueriesContext(connection) as ctx:
+            run()
+        self.assertTrue(ctx.captured_queries)
+
+        tables = {model._meta.db_table for model in self.HOT_TABLES}
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            with connection.cursor() as cursor:
+                if connection.vendor == "postgresql":
+                    cursor.execute(f"EXPLAIN {sql}")
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+                    scans = re.findall(r"Seq Scan on (\w+)", plan)
+                elif connection.vendor == "sqlite":
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plan  = "\n".join(row[-1] for row in cursor.fetchall())
+                    scans = re.findall(r"\bSCAN (\w+)\b(?! USING)", plan)
+                    # subqueries use aliases (U0, U1, ...); resolve them from the SQL
+                    aliases = dict(
+                        (alias, table) for table, alias in re.findall(r'"(\w+)" (U\d+)', sql)
+                    )
+                    scans = [aliases.get(name, name) for name in scans]
+                else:
+                    self.skipTest(f"No plan check for {connection.vendor}")
+            self.assertEqual([t for t in scans if t in tables], [], f"{sql}\n{plan}")
+
+    def test_cycle_ledger_uses_indexes(self):
+
+        self.assertIndexScans(lambda: cycle_ledger(self.pund))
+        self.assertIndexScans(lambda: cycle_ledger(self.pund, from_cycle=3, to_cycle=5))
+
+    def test_loan_listings_use_indexes(self):
+
+        self.assertIndexScans(lambda: list(annotated_loans(Loan.objects.filter(pund=self.pund))))
+        self.assertIndexScans(lambda: list(annotated_loans(Loan.objects.filter(member=self.member))))
+
+    def test_audit_log_page_uses_indexes(self):
+
+        logs = FinanceAuditLog.objects.filter(pund=self.pund)
+        page = audit_log_page(logs, 20)
+        self.assertIndexScans(lambda: audit_log_page(logs, 20))
+        self.assertIndexScans(lambda: audit_log_page(logs, 20, cursor=page["next_cursor"]))
+
+    def test_pund_listing_uses_indexes(self):
+
+        self.assertIndexScans(lambda: list(pund_listing(self.member)))
+        self.assertIndexScans(lambda: list(pund_listing(self.member, figures=True)))
+
+    def test_due_cycle_scan_uses_indexes(self):
+
+        self.assertIndexScans(due_cycle_punds)
+
+    def test_penalty_sweep_uses_indexes(self):
+
+        self.assertIndexScans(sweep_penalties)
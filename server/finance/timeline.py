@@ -0,0 +1,75 @@
+from bisect import bisect_right
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from punds.models import Pund
+from .models import PundStructure
+
+TIMELINE_TIMEOUT = 60 * 60
+
+
+def _timeline_key(pund_id, version):
+    # Keyed on the pund version: every PundStructure write bumps it (see below).
+    return f"structure-timeline:{pund_id}:v{version}"
+
+
+class StructureTimeline:
+    """
+    A pund's structure history, loaded once and searched by date.
+
+    Timelines are memoized in the default cache under the pund's version,
+    which every ``PundStructure`` save or delete bumps, from the API, the
+    admin or the shell alike. Stale copies in other workers' local caches
+    are therefore never read again. Bulk queryset writes skip the signals
+    and must bump the version themselves.
+    """
+
+    def __init__(self, structures):
+        self.structures = sorted(structures, key=lambda s: (s.effective_from, s.id))
+        self._dates     = [s.effective_from for s in self.structures]
+
+    def __bool__(self):
+        return bool(self.structures)
+
+    def at(self, day):
+        """Structure in force on ``day`` (latest-created wins on ties), or None."""
+        index = bisect_right(self._dates, day)
+        return self.structures[index - 1] if index else None
+
+    def latest(self):
+        """Most recently effective structure, including one that starts in the future."""
+        return self.structures[-1] if self.structures else None
+
+    # ── loading ──
+
+    @classmethod
+    def for_pund(cls, pund):
+        return cls.for_punds([pund])[pund.id]
+
+    @classmethod
+    def for_punds(cls, punds):
+        """Timelines for many ``Pund`` rows by id: one cache round trip plus one query for the misses."""
+        keys   = {pund.id: _timeline_key(pund.id, pund.version) for pund in punds}
+        cached = cache.get_many(list(keys.values()))
+        loaded = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+        missing = [pk for pk in keys if pk not in loaded]
+        if missing:
+            history = {pk: [] for pk in missing}
+            for structure in PundStructure.objects.filter(pund_id__in=missing):
+                history[structure.pund_id].append(structure)
+            cache.set_many(
+                {keys[pk]: structures for pk, structures in history.items()},
+                TIMELINE_TIMEOUT,
+            )
+            loaded.update(history)
+
+        return {pk: cls(structures) for pk, structures in loaded.items()}
+
+
+@receiver([post_save, post_delete], sender=PundStructure)
+def bump_version_on_structure_change(sender, instance, **kwargs):
+    """A new pund version retires the memoized timeline (and cached summaries / ETags) everywhere."""
+    Pund.objects.filter(id=instance.pund_id).bump_version()
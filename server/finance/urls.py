@@ -2,7 +2,10 @@ from django.urls import path
 from .views import (
     ApproveLoanView,
     AuditLogView,
+    BalanceAsOfView,
+    BulkMarkPaymentsPaidView,
     CyclePaymentsView,
+    ExportStatementView,
     FundSummaryView,
     GenerateCycleView,
     LoanDetailView,
@@ -15,6 +18,7 @@ from .views import (
     RequestLoanView,
     SavingSummaryView,
     SetStructureView,
+    SummaryCacheStatsView,
 )
 
 urlpatterns = [
@@ -25,6 +29,7 @@ urlpatterns = [
     # Payments
     path("pund/<int:pund_id>/cycle-payments/",   CyclePaymentsView.as_view()),
     path("payment/<int:payment_id>/mark-paid/",  MarkPaymentPaidView.as_view()),
+    path("pund/<int:pund_id>/cycle/<int:cycle_number>/mark-paid/", BulkMarkPaymentsPaidView.as_view()),
 
     # Loans
     path("pund/<int:pund_id>/request-loan/",     RequestLoanView.as_view()),
@@ -38,6 +43,9 @@ urlpatterns = [
     path("pund/<int:pund_id>/fund-summary/",     FundSummaryView.as_view()),
     path("pund/<int:pund_id>/saving-summary/",   SavingSummaryView.as_view()),
     path("pund/<int:pund_id>/audit-logs/",       AuditLogView.as_view()),
+    path("pund/<int:pund_id>/balance-as-of/",    BalanceAsOfView.as_view()),
+    path("summary-cache/stats/",                 SummaryCacheStatsView.as_view()),
+    path("pund/<int:pund_id>/export/",           ExportStatementView.as_view()),
 
     # Member-specific
     path("my-loans/",                            MyLoansView.as_view()),
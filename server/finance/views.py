@@ -1,65 +1,101 @@
 from decimal import Decimal, ROUND_HALF_UP
-from datetime import timedelta
+from datetime import date, datetime, time, timedelta
 
-from django.db import models, transaction
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from punds.models import Membership, Pund
+from PundLedger.pagination import list_response
+from punds.access import is_active_member, is_owner, resolve_membership, resolve_pund
+from punds.conditional import etag_matches, not_modified, pund_etag, with_etag
+from punds.models import Pund
+from .cache import (
+    cached_fund_summary,
+    cached_my_financial_summary,
+    cached_saving_summary,
+    summary_cache_stats,
+)
+from .export import EXPORT_KINDS, statement_rows, stream_csv, stream_xlsx
+from .ledger import balance_as_of
 from .models import FinanceAuditLog, Loan, LoanInstallment, Payment, PundStructure
-from .serializers import LoanApproveSerializer, LoanRequestSerializer, PundStructureSerializer
+from .serializers import (
+    BulkMarkPaidSerializer,
+    LoanApproveSerializer,
+    LoanRequestSerializer,
+    PundStructureSerializer,
+)
+from .services import (
+    CycleError,
+    adjust_fund_balance,
+    annotated_loans,
+    audit_log_page,
+    cycle_ledger,
+    generate_cycles,
+    get_fund_balance,
+    my_financial_summary,
+    serialize_my_loan,
+    serialize_pund_loan,
+)
+from .timeline import StructureTimeline
 from users.services import send_loan_approved_email
 
 
 
 # ─── helpers ────────────────────────────────────────────────
 
-def _get_pund(pund_id, active_only=True):
-    qs = Pund.objects.filter(id=pund_id)
-    if active_only:
-        qs = qs.filter(is_active=True)
-    return qs.first()
+def _int_param(request, name):
+    """Read an optional integer query parameter; raises ValueError when malformed."""
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return None
+    return int(value)
 
 
-def _is_owner(user, pund):
-    return Membership.objects.filter(
-        user=user, pund=pund, role="OWNER", is_active=True
-    ).exists()
+def _date_param(request, name):
+    """Read an optional ISO date query parameter; raises ValueError when malformed."""
+    value = request.query_params.get(name)
+    return date.fromisoformat(value) if value else None
 
 
-def _get_membership(user, pund):
-    return Membership.objects.filter(user=user, pund=pund, is_active=True).first()
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
 
 
-def _loan_installment_summary(installments):
-    """Return (total_emi_paid, total_penalty_paid) for a queryset of installments."""
-    paid = installments.filter(is_paid=True)
-    emi_paid     = paid.aggregate(v=models.Sum("emi_amount"))["v"]     or Decimal("0")
-    penalty_paid = paid.aggregate(v=models.Sum("penalty_amount"))["v"] or Decimal("0")
-    return emi_paid, penalty_paid
+def _filter_loan_status(request, loans):
+    """Apply ?status=A,B to a loan queryset; raises ValueError on unknown statuses."""
+    value = request.query_params.get("status")
+    if not value:
+        return loans
+    statuses = [s.strip().upper() for s in value.split(",") if s.strip()]
+    valid    = {choice for choice, _ in Loan.STATUS_CHOICES}
+    unknown  = [s for s in statuses if s not in valid]
+    if unknown:
+        raise ValueError(f"Unknown loan status: {', '.join(unknown)}")
+    return loans.filter(status__in=statuses)
 
 
 def apply_loan_penalty(loan):
-    """Apply missed-loan penalty to overdue unpaid installments (idempotent)."""
+    """
+    Apply missed-loan penalty to overdue unpaid installments (idempotent).
+
+    Only used on the EMI write path so an installment paid before the next
+    ``sweep_penalties`` run still carries its penalty; reads never call it.
+    """
     today = timezone.now().date()
-    structure = PundStructure.objects.filter(
-        pund=loan.pund, effective_from__lte=today
-    ).order_by("-effective_from").first()
+    structure = StructureTimeline.for_pund(loan.pund).at(today)
 
     if not structure:
         return
 
-    overdue = LoanInstallment.objects.filter(
+    LoanInstallment.objects.filter(
         loan=loan, is_paid=False, due_date__lt=today, penalty_amount=0
-    )
-    for inst in overdue:
-        inst.penalty_amount = structure.missed_loan_penalty
-        inst.save()
+    ).update(penalty_amount=structure.missed_loan_penalty)
 
 
 # ─── Structure ──────────────────────────────────────────────
@@ -68,10 +104,10 @@ class SetStructureView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pund_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id, active_only=True)
         if not pund:
             return Response({"error": "Pund not found or inactive"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can set structure"}, status=403)
 
         serializer = PundStructureSerializer(data=request.data)
@@ -81,6 +117,7 @@ class SetStructureView(APIView):
         effective_from = serializer.validated_data.get("effective_from") or \
                          timezone.now().date() + timedelta(days=7)
 
+        # the pund's version is bumped by finance.timeline's post_save receiver
         PundStructure.objects.create(
             pund=pund,
             effective_from=effective_from,
@@ -95,64 +132,44 @@ class SetStructureView(APIView):
 # ─── Cycle ──────────────────────────────────────────────────
 
 class GenerateCycleView(APIView):
+    """Generate the next cycle, or the next ``cycles`` (up to MAX_CYCLES) in one go."""
     permission_classes = [IsAuthenticated]
 
+    MAX_CYCLES = 52
+
     @transaction.atomic
     def post(self, request, pund_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id, active_only=True)
         if not pund:
             return Response({"error": "Pund not found or inactive"}, status=status.HTTP_404_NOT_FOUND)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can generate cycle"}, status=status.HTTP_403_FORBIDDEN)
 
-        structure = PundStructure.objects.filter(pund=pund).order_by("-effective_from").first()
-        if not structure:
-            return Response({"error": "Structure not set"}, status=status.HTTP_400_BAD_REQUEST)
-
-        last_payment = Payment.objects.filter(pund=pund).order_by("-cycle_number").first()
-        next_cycle   = 1 if not last_payment else last_payment.cycle_number + 1
-
-        if Payment.objects.filter(pund=pund, cycle_number=next_cycle).exists():
-            return Response({"error": "Cycle already generated"}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Apply penalty to previous cycle unpaid payments
-        if last_payment:
-            Payment.objects.filter(
-                pund=pund, cycle_number=last_payment.cycle_number, is_paid=False, penalty_amount=0
-            ).update(penalty_amount=structure.missed_saving_penalty)
-
-        # Calculate due date
-        base = structure.effective_from
-        if pund.pund_type == "DAILY":
-            due_date = base + timedelta(days=next_cycle)
-        elif pund.pund_type == "MONTHLY":
-            from dateutil.relativedelta import relativedelta
-            due_date = base + relativedelta(months=next_cycle)
-        else:  # WEEKLY (default)
-            due_date = base + timedelta(weeks=next_cycle)
-
-        members = Membership.objects.filter(pund=pund, role="MEMBER", is_active=True)
-        if not members.exists():
-            return Response({"error": "No active members in this pund"}, status=status.HTTP_400_BAD_REQUEST)
-
-        Payment.objects.bulk_create([
-            Payment(
-                pund=pund,
-                member=m.user,
-                cycle_number=next_cycle,
-                payment_type="SAVING",          # ← new field added
-                amount=structure.saving_amount,
-                due_date=due_date,
-                penalty_amount=0,
-                is_paid=False,
+        try:
+            count = int(request.data.get("cycles") or 1)
+        except (TypeError, ValueError):
+            count = 0
+        if not 1 <= count <= self.MAX_CYCLES:
+            return Response(
+                {"error": f"cycles must be between 1 and {self.MAX_CYCLES}"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            for m in members
-        ])
 
+        try:
+            cycles = generate_cycles(pund, count=count)
+        except CycleError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_cycle, due_date = cycles[0]
+        message = (
+            f"Cycle {next_cycle} generated successfully" if count == 1
+            else f"Cycles {next_cycle}-{cycles[-1][0]} generated successfully"
+        )
         return Response({
-            "message":      f"Cycle {next_cycle} generated successfully",
+            "message":      message,
             "cycle_number": next_cycle,
             "due_date":     due_date,
+            "cycles":       [{"cycle_number": n, "due_date": d} for n, d in cycles],
         }, status=status.HTTP_201_CREATED)
     
 # ─── Payments ───────────────────────────────────────────────
@@ -160,8 +177,13 @@ class GenerateCycleView(APIView):
 class MarkPaymentPaidView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @transaction.atomic
     def post(self, request, payment_id):
-        payment = Payment.objects.filter(id=payment_id).first()
+        # lock the row so concurrent requests (or a bulk mark-paid) cannot both credit it
+        payment = (
+            Payment.objects.select_related("pund").select_for_update(of=("self",))
+            .filter(id=payment_id).first()
+        )
 
         if not payment:
             return Response({"error": "Payment not found"}, status=404)
@@ -175,13 +197,24 @@ class MarkPaymentPaidView(APIView):
         if payment.is_paid:
             return Response({"error": "Payment already marked as paid"}, status=400)
 
-        if not _is_owner(request.user, payment.pund):
+        resolve_membership(request, payment.pund)
+        if not is_owner(request):
             return Response({"error": "Only owner can mark payment"}, status=403)
 
         payment.is_paid = True
         payment.paid_at = timezone.now()
         payment.save()
 
+        adjust_fund_balance(
+            payment.pund, "SAVING_PAID",
+            cycle_number=payment.cycle_number,
+            reference=f"payment:{payment.id}",
+            total_savings=payment.amount,
+            total_penalties=payment.penalty_amount,
+            unpaid_savings=-payment.amount,
+            available_fund=payment.amount + payment.penalty_amount,
+        )
+
         FinanceAuditLog.objects.create(
             pund=payment.pund,
             user=request.user,
@@ -189,99 +222,112 @@ class MarkPaymentPaidView(APIView):
             description=f"Saving payment {payment.id} marked paid",
         )
 
+        Pund.objects.filter(id=payment.pund_id).bump_version()
         return Response({"message": "Payment marked as paid"})
+
+
+class BulkMarkPaymentsPaidView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def post(self, request, pund_id, cycle_number):
+        pund = resolve_pund(request, pund_id, active_only=True)
+        if not pund:
+            return Response({"error": "Pund not found or inactive"}, status=404)
+        if not is_owner(request):
+            return Response({"error": "Only owner can mark payment"}, status=403)
+
+        serializer = BulkMarkPaidSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        payments = Payment.objects.filter(pund=pund, cycle_number=cycle_number, payment_type="SAVING")
+        requested = serializer.validated_data.get("payment_ids")
+        if requested is not None:
+            payments = payments.filter(id__in=requested)
+        else:
+            payments = payments.exclude(id__in=serializer.validated_data["all_except"])
+
+        rows = list(
+            payments.select_for_update()
+            .order_by("id")
+            .values_list("id", "is_paid", "amount", "penalty_amount")
+        )
+        to_pay = [r for r in rows if not r[1]]
+
+        now = timezone.now()
+        Payment.objects.filter(id__in=[r[0] for r in to_pay], is_paid=False).update(is_paid=True, paid_at=now)
+
+        savings   = sum((r[2] for r in to_pay), Decimal("0"))
+        penalties = sum((r[3] for r in to_pay), Decimal("0"))
+        adjust_fund_balance(
+            pund, "SAVING_PAID",
+            cycle_number=cycle_number,
+            reference=f"cycle:{cycle_number}",
+            total_savings=savings,
+            total_penalties=penalties,
+            unpaid_savings=-savings,
+            available_fund=savings + penalties,
+        )
+
+        FinanceAuditLog.objects.bulk_create([
+            FinanceAuditLog(
+                pund=pund,
+                user=request.user,
+                action="Saving Paid",
+                description=f"Saving payment {r[0]} marked paid",
+            )
+            for r in to_pay
+        ])
+
+        if to_pay:
+            Pund.objects.filter(id=pund.id).bump_version()
+
+        results = [{"id": r[0], "status": "already_paid" if r[1] else "paid"} for r in rows]
+        if requested is not None:
+            found = {r[0] for r in rows}
+            results += [{"id": pid, "status": "not_found"} for pid in dict.fromkeys(requested) if pid not in found]
+
+        return Response({
+            "cycle_number": cycle_number,
+            "paid_count":   len(to_pay),
+            "results":      results,
+        })
     
 class CyclePaymentsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pund_id):
-        pund = _get_pund(pund_id, active_only=False)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _get_membership(request.user, pund):
+        if not is_active_member(request):
             return Response({"error": "Not authorized"}, status=403)
 
-        # ✅ ONLY SAVING PAYMENTS
-        cycle_numbers = (
-            Payment.objects.filter(pund=pund, payment_type="SAVING")
-            .values_list("cycle_number", flat=True)
-            .distinct()
-            .order_by("cycle_number")
-        )
-
-        cycles_data = []
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        for cycle_num in cycle_numbers:
+        try:
+            from_cycle = _int_param(request, "from_cycle")
+            to_cycle   = _int_param(request, "to_cycle")
+        except ValueError:
+            return Response({"error": "from_cycle and to_cycle must be integers"}, status=400)
 
-            # ✅ ONLY SAVING PAYMENTS
-            cycle_payments = Payment.objects.filter(
-                pund=pund,
-                cycle_number=cycle_num,
-                payment_type="SAVING"
-            )
+        return with_etag(Response(cycle_ledger(pund, from_cycle=from_cycle, to_cycle=to_cycle)), etag)
 
-            total_expected = cycle_payments.aggregate(
-                v=models.Sum("amount")
-            )["v"] or Decimal("0")
 
-            paid_agg = cycle_payments.filter(is_paid=True).aggregate(
-                total_amount=models.Sum("amount"),
-                total_penalty=models.Sum("penalty_amount"),
-            )
-
-            total_collected = (paid_agg["total_amount"] or Decimal("0")) + \
-                              (paid_agg["total_penalty"] or Decimal("0"))
-
-            total_penalties = cycle_payments.aggregate(
-                v=models.Sum("penalty_amount")
-            )["v"] or Decimal("0")
-
-            paid_count = cycle_payments.filter(is_paid=True).count()
-            total_count = cycle_payments.count()
-
-            first = cycle_payments.order_by("due_date").first()
-
-            cycles_data.append({
-                "cycle_number": cycle_num,
-                "total_expected": str(total_expected),
-                "total_collected": str(total_collected),
-                "total_penalties": str(total_penalties),
-                "paid_count": paid_count,
-                "total_count": total_count,
-                "progress": round(paid_count / total_count * 100, 2) if total_count else 0,
-                "due_date": first.due_date if first else None,
-                "payments": [
-                    {
-                        "id": p.id,
-                        "member_id": p.member.id,
-                        "member_name": p.member.name,
-                        "member_email": p.member.email,
-                        "amount": str(p.amount),
-                        "penalty_amount": str(p.penalty_amount),
-                        "is_paid": p.is_paid,
-                        "due_date": p.due_date,
-                        "paid_at": p.paid_at,
-                    }
-                    for p in cycle_payments
-                ],
-            })
-
-        return Response(cycles_data)
-    
 # ─── Loans ──────────────────────────────────────────────────
 
 class RequestLoanView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pund_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id, active_only=True)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
 
-        is_member = Membership.objects.filter(
-            user=request.user, pund=pund, role="MEMBER", is_active=True
-        ).exists()
-        if not is_member:
+        if not is_active_member(request, role="MEMBER"):
             return Response({"error": "Only member can request loan"}, status=403)
 
         if Loan.objects.filter(pund=pund, member=request.user, is_active=True).exists():
@@ -300,6 +346,7 @@ class RequestLoanView(APIView):
             total_cycles=0,
             remaining_amount=0,
         )
+        Pund.objects.filter(id=pund.id).bump_version()
         return Response({"message": "Loan request submitted"})
 
 
@@ -309,7 +356,7 @@ class ApproveLoanView(APIView):
     @transaction.atomic
     def post(self, request, loan_id):
 
-        loan = get_object_or_404(Loan, id=loan_id)
+        loan = get_object_or_404(Loan.objects.select_related("pund"), id=loan_id)
 
         if loan.status != "PENDING":
             return Response({"error": "Loan already processed"}, status=400)
@@ -319,7 +366,8 @@ class ApproveLoanView(APIView):
         if not pund.is_active:
             return Response({"error": "Pund is closed"}, status=400)
 
-        if not _is_owner(request.user, pund):
+        resolve_membership(request, pund)
+        if not is_owner(request):
             return Response({"error": "Only owner can approve"}, status=403)
 
         # Prevent duplicate active loan
@@ -341,38 +389,15 @@ class ApproveLoanView(APIView):
 
         today = timezone.now().date()
 
-        structure = PundStructure.objects.filter(
-            pund=pund,
-            effective_from__lte=today
-        ).order_by("-effective_from").first()
+        structure = StructureTimeline.for_pund(pund).at(today)
 
         if not structure:
             return Response({"error": "Structure not found"}, status=400)
 
         cycles = serializer.validated_data.get("cycles") or structure.default_loan_cycles
 
-        # Fund availability check
-        collected_agg = Payment.objects.filter(
-            pund=pund,
-            is_paid=True
-        ).aggregate(
-            total_amount=models.Sum("amount"),
-            total_penalty=models.Sum("penalty_amount")
-        )
-
-        total_collected = (
-            (collected_agg["total_amount"] or Decimal("0")) +
-            (collected_agg["total_penalty"] or Decimal("0"))
-        )
-
-        total_active_loans = Loan.objects.filter(
-            pund=pund,
-            status__in=["APPROVED", "ACTIVE"]
-        ).aggregate(
-            total=models.Sum("remaining_amount")
-        )["total"] or Decimal("0")
-
-        available_fund = total_collected - total_active_loans
+        # Fund availability check (row lock serialises concurrent approvals)
+        available_fund = get_fund_balance(pund, for_update=True).available_fund
 
         if loan.principal_amount > available_fund:
             return Response({"error": "Insufficient fund in pund"}, status=400)
@@ -404,6 +429,15 @@ class ApproveLoanView(APIView):
         loan.approved_at = timezone.now()
         loan.save()
 
+        adjust_fund_balance(
+            pund, "LOAN_APPROVED",
+            reference=f"loan:{loan.id}",
+            active_loan_outstanding=total_payable,
+            active_loan_principal=loan.principal_amount,
+            active_loan_payable=total_payable,
+            available_fund=-total_payable,
+        )
+
         # Send email after successful DB commit
         member = loan.member
         transaction.on_commit(
@@ -440,6 +474,7 @@ class ApproveLoanView(APIView):
             description=f"Loan {loan.id} approved for {loan.member.email}",
         )
 
+        Pund.objects.filter(id=pund.id).bump_version()
         return Response({"message": "Loan approved successfully"})
    
     
@@ -448,7 +483,7 @@ class RejectLoanView(APIView):
 
     @transaction.atomic
     def post(self, request, loan_id):
-        loan = Loan.objects.filter(id=loan_id).first()
+        loan = Loan.objects.select_related("pund").filter(id=loan_id).first()
         if not loan:
             return Response({"error": "Loan not found"}, status=404)
         if loan.status != "PENDING":
@@ -457,7 +492,8 @@ class RejectLoanView(APIView):
         pund = loan.pund
         if not pund.is_active:
             return Response({"error": "Pund is closed"}, status=400)
-        if not _is_owner(request.user, pund):
+        resolve_membership(request, pund)
+        if not is_owner(request):
             return Response({"error": "Only owner can reject"}, status=403)
 
         reason = request.data.get("reason", "").strip()
@@ -476,6 +512,7 @@ class RejectLoanView(APIView):
             action="Loan Rejected",
             description=f"Loan {loan.id} rejected. Reason: {reason}",
         )
+        Pund.objects.filter(id=pund.id).bump_version()
         return Response({"message": "Loan rejected successfully"})
 
 
@@ -484,7 +521,12 @@ class MarkLoanInstallmentPaidView(APIView):
 
     @transaction.atomic
     def post(self, request, installment_id):
-        installment = LoanInstallment.objects.select_for_update().filter(id=installment_id).first()        
+        installment = (
+            LoanInstallment.objects.select_for_update(of=("self",))
+            .select_related("loan__pund")
+            .filter(id=installment_id)
+            .first()
+        )        
         
         if not installment:
             return Response({"error": "Installment not found"}, status=404)
@@ -492,7 +534,8 @@ class MarkLoanInstallmentPaidView(APIView):
         loan = installment.loan
         if not loan.pund.is_active:
             return Response({"error": "Pund is closed"}, status=400)
-        if not _is_owner(request.user, loan.pund):
+        resolve_membership(request, loan.pund)
+        if not is_owner(request):
             return Response({"error": "Only owner can mark EMI"}, status=403)
         if installment.is_paid:
             return Response({"error": "Already paid"}, status=400)
@@ -528,12 +571,29 @@ class MarkLoanInstallmentPaidView(APIView):
             description=f"Installment {installment.id} marked paid. Amount: {total_amount}",
         )
 
+        was_active, previous_remaining = loan.is_active, loan.remaining_amount
         loan.remaining_amount = max(Decimal("0"), loan.remaining_amount - installment.emi_amount)
         if loan.remaining_amount <= 0:
             loan.status    = "CLOSED"
             loan.is_active = False
         loan.save()
 
+        if was_active:
+            repaid = previous_remaining - loan.remaining_amount
+            closed = {} if loan.is_active else {
+                "active_loan_principal": -loan.principal_amount,
+                "active_loan_payable":   -loan.total_payable,
+            }
+            adjust_fund_balance(
+                loan.pund, "EMI_PAID",
+                cycle_number=installment.cycle_number,
+                reference=f"installment:{installment.id}",
+                active_loan_outstanding=-repaid,
+                available_fund=repaid,
+                **closed,
+            )
+
+        Pund.objects.filter(id=loan.pund_id).bump_version()
         return Response({
             "message":          "EMI marked as paid",
             "paid_amount":      str(total_amount),
@@ -545,18 +605,16 @@ class LoanDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, loan_id):
-        loan = Loan.objects.filter(id=loan_id).first()
+        loan = Loan.objects.select_related("pund").filter(id=loan_id).first()
         if not loan:
             return Response({"error": "Loan not found"}, status=404)
 
-        membership = _get_membership(request.user, loan.pund)
-        if not membership:
+        membership = resolve_membership(request, loan.pund)
+        if not is_active_member(request):
             return Response({"error": "Not authorized"}, status=403)
         if membership.role == "MEMBER" and loan.member != request.user:
             return Response({"error": "You cannot view other member loans"}, status=403)
 
-        apply_loan_penalty(loan)
-
         return Response({
             "principal":          str(loan.principal_amount),
             "interest_percentage": str(loan.interest_percentage),
@@ -578,64 +636,36 @@ class MyLoansView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        data = []
-        for loan in Loan.objects.filter(member=request.user):
-            installments          = LoanInstallment.objects.filter(loan=loan)
-            emi_paid, penalty_paid = _loan_installment_summary(installments)
-            total_paid            = emi_paid + penalty_paid
-            remaining             = loan.total_payable - emi_paid
-            progress              = float(emi_paid / loan.total_payable * 100) if loan.total_payable else 0
-
-            data.append({
-                "loan_id":            loan.id,
-                "pund":               loan.pund.name,
-                "principal":          str(loan.principal_amount),
-                "remaining":          str(remaining),
-                "total_payable":      str(loan.total_payable),
-                "status":             loan.status,
-                "is_active":          loan.is_active,
-                "paid_amount":        str(total_paid),
-                "emi_paid":           str(emi_paid),
-                "penalties_paid":     str(penalty_paid),
-                "progress":           round(progress, 2),
-                "paid_installments":  installments.filter(is_paid=True).count(),
-                "total_installments": installments.count(),
-            })
-        return Response(data)
+        loans = Loan.objects.filter(member=request.user)
+        try:
+            loans = _filter_loan_status(request, loans)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        return list_response(request, annotated_loans(loans), serialize_my_loan)
 
 
 class PundLoansView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pund_id):
-        pund = _get_pund(pund_id, active_only=False)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can view loans"}, status=403)
 
-        data = []
-        for loan in Loan.objects.filter(pund=pund):
-            installments          = LoanInstallment.objects.filter(loan=loan)
-            emi_paid, penalty_paid = _loan_installment_summary(installments)
-            total_paid            = emi_paid + penalty_paid
-            remaining             = loan.total_payable - emi_paid
-            progress              = float(emi_paid / loan.total_payable * 100) if loan.total_payable else 0
-
-            data.append({
-                "loan_id":        loan.id,
-                "member":         loan.member.email,
-                "principal":      str(loan.principal_amount),
-                "remaining":      str(remaining),
-                "total_payable":  str(loan.total_payable),
-                "interest_amount": str(loan.total_payable - loan.principal_amount),
-                "paid_amount":    str(total_paid),
-                "emi_paid":       str(emi_paid),
-                "penalties_paid": str(penalty_paid),
-                "status":         loan.status,
-                "progress":       round(progress, 2),
-            })
-        return Response(data)
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        loans = Loan.objects.filter(pund=pund)
+        try:
+            loans = _filter_loan_status(request, loans)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        return with_etag(list_response(request, annotated_loans(loans), serialize_pund_loan), etag)
 
 
 # ─── Summaries ──────────────────────────────────────────────
@@ -644,152 +674,181 @@ class FundSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pund_id):
-        pund = Pund.objects.filter(id=pund_id).first()
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-
-        is_member = Membership.objects.filter(
-            user=request.user,
-            pund=pund,
-            is_active=True
-        ).exists()
-
-        if not is_member:
+        if not is_active_member(request):
             return Response({"error": "Not authorized"}, status=403)
 
-        # -------- TOTAL COLLECTED (SAVINGS + PENALTIES) --------
-        total_collected_data = Payment.objects.filter(
-            pund=pund,
-            is_paid=True,
-            payment_type="SAVING"
-        ).aggregate(
-            total_amount=models.Sum("amount"),
-            total_penalty=models.Sum("penalty_amount")
-        )
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        total_savings = total_collected_data["total_amount"] or Decimal("0")
-        total_penalties = total_collected_data["total_penalty"] or Decimal("0")
-        total_collected = total_savings + total_penalties
+        return with_etag(Response(cached_fund_summary(pund)), etag)
 
-        # -------- ACTIVE LOANS --------
-        active_loans = Loan.objects.filter(
-            pund=pund,
-            is_active=True
-        )
 
-        total_outstanding = active_loans.aggregate(
-            total=models.Sum("remaining_amount")
-        )["total"] or Decimal("0")
+class SavingSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        total_principal = active_loans.aggregate(
-            total=models.Sum("principal_amount")
-        )["total"] or Decimal("0")
+    def get(self, request, pund_id):
+        pund = resolve_pund(request, pund_id)
+        if not pund:
+            return Response({"error": "Pund not found"}, status=404)
+        if not is_active_member(request):
+            return Response({"error": "You are not a member of this pund"}, status=403)
 
-        total_payable = active_loans.aggregate(
-            total=models.Sum("total_payable")
-        )["total"] or Decimal("0")
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        total_interest = total_payable - total_principal
+        return with_etag(Response(cached_saving_summary(pund)), etag)
 
-        # ✅ CORRECT AVAILABLE FUND CALCULATION
-        available = total_collected - total_outstanding
 
-        return Response({
-            "total_collected": str(total_collected),
-            "total_savings": str(total_savings),
-            "total_penalties": str(total_penalties),
+class MyFinancialSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
 
-            "active_loan_outstanding": str(total_outstanding),
-            "active_loan_principal": str(total_principal),
-            "active_loan_interest": str(total_interest),
+    def get(self, request, pund_id):
+        pund = Pund.objects.filter(id=pund_id).only("id", "version").first()
+        if not pund:
+            return Response(my_financial_summary(request.user, pund_id))
+        return Response(cached_my_financial_summary(request.user, pund))
 
-            "available_fund": str(available),
-        })
-     
-class SavingSummaryView(APIView):
+
+class BalanceAsOfView(APIView):
+    """
+    Fund figures as they stood at the end of ``?date=`` and/or of ``?cycle=``,
+    read from the nearest journal snapshot plus the entries after it.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pund_id):
-        pund = _get_pund(pund_id, active_only=False)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _get_membership(request.user, pund):
-            return Response({"error": "You are not a member of this pund"}, status=403)
+        if not is_active_member(request):
+            return Response({"error": "Not authorized"}, status=403)
 
-        payments = Payment.objects.filter(pund=pund, payment_type="SAVING")   # ← only savings
-        total_cycles   = payments.values("cycle_number").distinct().count()
-        total_expected = payments.aggregate(v=models.Sum("amount"))["v"] or Decimal("0")
+        try:
+            day   = _date_param(request, "date")
+            cycle = _int_param(request, "cycle")
+        except ValueError:
+            return Response({"error": "Invalid date or cycle"}, status=400)
+        if day is None and cycle is None:
+            return Response({"error": "Pass date and/or cycle"}, status=400)
 
-        paid_agg   = payments.filter(is_paid=True).aggregate(
-            total_amount=models.Sum("amount"), total_penalty=models.Sum("penalty_amount")
-        )
-        total_paid    = (paid_agg["total_amount"] or Decimal("0")) + (paid_agg["total_penalty"] or Decimal("0"))
-        total_unpaid  = payments.filter(is_paid=False).aggregate(v=models.Sum("amount"))["v"] or Decimal("0")
-        total_penalty = payments.aggregate(v=models.Sum("penalty_amount"))["v"] or Decimal("0")
-        total_members = Membership.objects.filter(pund=pund, role="MEMBER", is_active=True).count()
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        return Response({
-            "total_cycles":             total_cycles,
-            "total_members":            total_members,
-            "total_expected_savings":   str(total_expected),
-            "total_paid_savings":       str(total_paid),
-            "total_unpaid_savings":     str(total_unpaid),
-            "total_penalties_collected": str(total_penalty),
-        })
-    
-class MyFinancialSummaryView(APIView):
-    permission_classes = [IsAuthenticated]
+        before = _start_of_day(day + timedelta(days=1)) if day else None
+        entry, balances = balance_as_of(pund, before=before, cycle=cycle)
+        if entry is None:
+            return Response({"error": "No ledger history at that point"}, status=404)
 
-    def get(self, request, pund_id):
-        payments = Payment.objects.filter(
-            member=request.user,
-            pund_id=pund_id,
-            payment_type="SAVING"          
-        )
+        return with_etag(Response({
+            "pund_id":     pund.id,
+            "date":        day,
+            "cycle":       cycle,
+            "entry_seq":   entry.seq,
+            "recorded_at": entry.created_at,
+            **{field: str(value) for field, value in balances.items()},
+        }), etag)
+
+
+class SummaryCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(summary_cache_stats())
 
-        total_savings_paid   = payments.filter(is_paid=True).aggregate(v=models.Sum("amount"))["v"] or Decimal("0")
-        total_saving_penalty = payments.aggregate(v=models.Sum("penalty_amount"))["v"]              or Decimal("0")
-        total_unpaid_savings = payments.filter(is_paid=False).aggregate(v=models.Sum("amount"))["v"] or Decimal("0")
-
-        loan_data   = None
-        active_loan = Loan.objects.filter(member=request.user, is_active=True).first()
-        if active_loan:
-            apply_loan_penalty(active_loan)
-            installments = LoanInstallment.objects.filter(loan=active_loan)
-            emi_paid     = installments.filter(is_paid=True).aggregate(v=models.Sum("emi_amount"))["v"]     or Decimal("0")
-            loan_penalty = installments.aggregate(v=models.Sum("penalty_amount"))["v"]                      or Decimal("0")
-            loan_data    = {
-                "loan_id":           active_loan.id,
-                "principal":         str(active_loan.principal_amount),
-                "remaining_amount":  str(active_loan.remaining_amount),
-                "total_payable":     str(active_loan.total_payable),
-                "status":            active_loan.status,
-                "total_emi_paid":    str(emi_paid),
-                "total_loan_penalty": str(loan_penalty),
-            }
 
-        return Response({
-            "saving_summary": {
-                "total_savings_paid":   str(total_savings_paid),
-                "total_saving_penalty": str(total_saving_penalty),
-                "total_unpaid_savings": str(total_unpaid_savings),
-            },
-            "loan_summary": loan_data,
-        })
-    
 class AuditLogView(APIView):
     permission_classes = [IsAuthenticated]
 
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT     = 200
+
     def get(self, request, pund_id):
-        pund = _get_pund(pund_id, active_only=False)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can view audit logs"}, status=403)
 
-        return Response([{
-            "action":       log.action,
-            "description":  log.description,
-            "performed_by": log.user.email if log.user else None,
-            "timestamp":    log.created_at,
-        } for log in FinanceAuditLog.objects.filter(pund=pund)])
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        params = request.query_params
+        logs   = FinanceAuditLog.objects.filter(pund=pund)
+        try:
+            limit     = min(_int_param(request, "limit") or self.DEFAULT_LIMIT, self.MAX_LIMIT)
+            user_id   = _int_param(request, "user")
+            from_date = _date_param(request, "from_date")
+            to_date   = _date_param(request, "to_date")
+        except ValueError:
+            return Response({"error": "Invalid limit, user or date filter"}, status=400)
+
+        if params.get("action"):
+            logs = logs.filter(action=params["action"])
+        if user_id is not None:
+            logs = logs.filter(user_id=user_id)
+        if from_date:
+            logs = logs.filter(created_at__gte=_start_of_day(from_date))
+        if to_date:
+            logs = logs.filter(created_at__lt=_start_of_day(to_date + timedelta(days=1)))
+
+        try:
+            return with_etag(Response(audit_log_page(logs, limit, cursor=params.get("cursor"))), etag)
+        except ValueError:
+            return Response({"error": "Invalid cursor"}, status=400)
+
+
+# ─── Export ─────────────────────────────────────────────────
+
+class ExportStatementView(APIView):
+    """
+    Stream every payment, installment and audit entry of a pund as CSV or XLSX.
+
+    Filters: ``type`` (comma separated payments/installments/audit),
+    ``cycle``, ``from_date`` and ``to_date``; ``file_format=xlsx`` for a
+    workbook. Rows are read in chunks and written as they arrive.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_cost      = 10
+
+    FORMATS = {
+        "csv":  ("text/csv; charset=utf-8", stream_csv),
+        "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", stream_xlsx),
+    }
+
+    def get(self, request, pund_id):
+        pund = resolve_pund(request, pund_id)
+        if not pund:
+            return Response({"error": "Pund not found"}, status=404)
+        if not is_owner(request):
+            return Response({"error": "Only owner can export statements"}, status=403)
+
+        params      = request.query_params
+        file_format = params.get("file_format") or "csv"
+        if file_format not in self.FORMATS:
+            return Response({"error": f"file_format must be one of: {', '.join(self.FORMATS)}"}, status=400)
+
+        kinds   = [k.strip().lower() for k in (params.get("type") or "").split(",") if k.strip()] or EXPORT_KINDS
+        unknown = [k for k in kinds if k not in EXPORT_KINDS]
+        if unknown:
+            return Response({"error": f"Unknown export type: {', '.join(unknown)}"}, status=400)
+
+        try:
+            cycle     = _int_param(request, "cycle")
+            from_date = _date_param(request, "from_date")
+            to_date   = _date_param(request, "to_date")
+        except ValueError:
+            return Response({"error": "Invalid cycle or date filter"}, status=400)
+
+        content_type, stream = self.FORMATS[file_format]
+        rows     = statement_rows(pund, kinds, from_date=from_date, to_date=to_date, cycle=cycle)
+        response = StreamingHttpResponse(stream(rows), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="pund-{pund.id}-statement.{file_format}"'
+        response["Cache-Control"]       = "no-store"
+        return response
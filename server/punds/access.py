@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, FilteredRelation, Q
+
+from .models import Membership, Pund
+
+
+def _role_cache_timeout():
+    return getattr(settings, "PUND_ROLE_CACHE_TIMEOUT", 30)
+
+
+def _role_key(pund, user):
+    # Keyed on the pund version: add/remove/reactivate/close/reopen all bump it.
+    return f"pund-role:{pund.id}:v{pund.version}:u{user.id}"
+
+
+def _membership(pund, user, membership_id, role, is_active, joined_at):
+    if membership_id is None:
+        return None
+    return Membership(
+        id=membership_id, user=user, pund=pund, role=role, is_active=is_active, joined_at=joined_at,
+    )
+
+
+def resolve_pund(request, pund_id, active_only=False):
+    """
+    Load a pund together with the caller's membership in one joined query.
+
+    Sets ``request.pund`` and ``request.membership`` (the membership may be
+    inactive, or None when the caller never belonged to the pund) and
+    returns the pund, or None when it does not exist.
+    """
+    punds = (
+        Pund.objects.filter(id=pund_id)
+        .annotate(
+            my_membership=FilteredRelation("members", condition=Q(members__user=request.user)),
+            membership_id=F("my_membership__id"),
+            membership_role=F("my_membership__role"),
+            membership_active=F("my_membership__is_active"),
+            membership_joined_at=F("my_membership__joined_at"),
+        )
+    )
+    if active_only:
+        punds = punds.filter(is_active=True)
+
+    pund = punds.first()
+    request.pund       = pund
+    request.membership = pund and _membership(
+        pund, request.user, pund.membership_id, pund.membership_role,
+        pund.membership_active, pund.membership_joined_at,
+    )
+    return pund
+
+
+def resolve_membership(request, pund):
+    """
+    Caller's membership of an already-loaded pund (e.g. ``loan.pund``).
+
+    Goes through a short-TTL role cache, so repeated calls cost no query.
+    """
+    key    = _role_key(pund, request.user)
+    cached = cache.get(key)
+    if cached is None:
+        row = (
+            Membership.objects.filter(pund=pund, user=request.user)
+            .values_list("id", "role", "is_active", "joined_at")
+            .first()
+        )
+        cached = row or ()
+        cache.set(key, cached, _role_cache_timeout())
+
+    request.pund       = pund
+    request.membership = _membership(pund, request.user, *cached) if cached else None
+    return request.membership
+
+
+def is_active_member(request, role=None):
+    membership = request.membership
+    return bool(membership and membership.is_active and (role is None or membership.role == role))
+
+
+def is_owner(request):
+    return is_active_member(request, role="OWNER")
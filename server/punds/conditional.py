@@ -0,0 +1,25 @@
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+
+def pund_etag(pund, user):
+    """Weak ETag for a pund read; changes whenever the pund's version is bumped."""
+    return f'W/"pund-{pund.id}-v{pund.version}-u{user.id}"'
+
+
+def etag_matches(request, etag):
+    """True when the request's If-None-Match names ``etag`` (weak comparison)."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag == "*" or tag.removeprefix("W/") == opaque for tag in parse_etags(header))
+
+
+def not_modified(etag):
+    return Response(status=304, headers={"ETag": etag})
+
+
+def with_etag(response, etag):
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.29 on 2026-10-17 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("punds", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="membership",
+            index=models.Index(
+                fields=["pund", "role", "is_active"], name="membership_pund_role_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.29 on 2026-10-17 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("punds", "0003_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pund",
+            name="version",
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
@@ -3,6 +3,12 @@ from django.db import models
 from django.utils import timezone
 
 
+class PundQuerySet(models.QuerySet):
+    def bump_version(self):
+        """Invalidate cached reads (ETags) of these punds after a write."""
+        return self.update(version=models.F("version") + 1)
+
+
 class Pund(models.Model):
     PUND_TYPE_CHOICES = (
         ("DAILY",   "Daily"),
@@ -20,6 +26,9 @@ class Pund(models.Model):
         related_name="created_punds",
     )
     created_at = models.DateTimeField(default=timezone.now)
+    version    = models.PositiveBigIntegerField(default=1)
+
+    objects = PundQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -39,6 +48,9 @@ class Membership(models.Model):
 
     class Meta:
         unique_together = ("user", "pund")
+        indexes         = [
+            models.Index(fields=["pund", "role", "is_active"], name="membership_pund_role_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.pund.name} ({self.role})"
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from .models import Membership, Pund
+from .models import Pund
 
 User = get_user_model()
 
@@ -19,15 +19,3 @@ class AddMemberSerializer(serializers.Serializer):
     name   = serializers.CharField()
     email  = serializers.EmailField()
     mobile = serializers.CharField()
-
-
-class PundListSerializer(serializers.ModelSerializer):
-    role = serializers.SerializerMethodField()
-
-    class Meta:
-        model  = Pund
-        fields = ["id", "name", "pund_type", "start_date", "role"]
-
-    def get_role(self, obj):
-        user = self.context["request"].user
-        return Membership.objects.get(user=user, pund=obj).role
\ No newline at end of file
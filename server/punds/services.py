@@ -0,0 +1,128 @@
+import csv
+import io
+
+from django.contrib.auth import get_user_model
+
+from users.outbox import enqueue_emails
+from users.services import invite_email
+from .models import Membership, Pund
+from .serializers import AddMemberSerializer
+
+User = get_user_model()
+
+MEMBER_IMPORT_FIELDS = ("name", "email", "mobile")
+
+
+class MemberImportError(Exception):
+    """Raised when an import payload cannot be read at all."""
+
+
+def parse_member_csv(text):
+    """Rows of a CSV with a ``name,email,mobile`` header (any order, any case)."""
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise MemberImportError("CSV is empty")
+    headers = {(h or "").strip().lower(): h for h in reader.fieldnames}
+    missing = [f for f in MEMBER_IMPORT_FIELDS if f not in headers]
+    if missing:
+        raise MemberImportError(f"CSV is missing column(s): {', '.join(missing)}")
+    return [{f: (row.get(headers[f]) or "").strip() for f in MEMBER_IMPORT_FIELDS} for row in reader]
+
+
+def _validate_rows(rows):
+    """Per-row ``(data, errors)``: field validation plus duplicates inside the import."""
+    checked, seen_emails, seen_mobiles = [], set(), set()
+    for raw in rows:
+        serializer = AddMemberSerializer(data=raw)
+        if not serializer.is_valid():
+            checked.append((None, {f: [str(e) for e in errs] for f, errs in serializer.errors.items()}))
+            continue
+
+        data = dict(serializer.validated_data)
+        data["email"]  = data["email"].lower().strip()
+        data["mobile"] = data["mobile"].strip()
+        if data["email"] in seen_emails:
+            checked.append((data, {"email": ["Duplicate email in this import"]}))
+            continue
+        if data["mobile"] in seen_mobiles:
+            checked.append((data, {"mobile": ["Duplicate mobile in this import"]}))
+            continue
+        seen_emails.add(data["email"])
+        seen_mobiles.add(data["mobile"])
+        checked.append((data, None))
+    return checked
+
+
+def import_members(pund, rows, best_effort=False):
+    """
+    Add ``rows`` (name, email, mobile) to ``pund`` as members with a fixed number of queries.
+
+    Existing users are matched in one ``email__in`` query; missing users
+    and memberships are bulk-created, inactive memberships reactivated in
+    one UPDATE, and invites for new users queued in one outbox INSERT.
+    Unless ``best_effort``, nothing is written when any row fails.
+    Call inside a transaction. Returns ``(applied, report)``.
+    """
+    checked = _validate_rows(rows)
+    emails  = [data["email"] for data, errors in checked if not errors]
+    users   = {u.email: u for u in User.objects.filter(email__in=emails)}
+    owners  = dict(
+        User.objects.filter(mobile__in=[data["mobile"] for data, errors in checked if not errors])
+        .values_list("mobile", "email")
+    )
+    memberships = {
+        m.user_id: m for m in Membership.objects.filter(pund=pund, user__in=users.values())
+    }
+
+    report, plan = [], []
+    for number, (data, errors) in enumerate(checked, start=1):
+        entry = {"row": number, "email": data["email"] if data else rows[number - 1].get("email")}
+        if not errors:
+            user       = users.get(data["email"])
+            membership = user and memberships.get(user.id)
+            # like AddMemberView, an existing user's mobile is only filled in, never replaced
+            sets_mobile = user is None or not user.mobile
+            if membership and membership.is_active:
+                errors = {"email": ["User already member"]}
+            elif sets_mobile and owners.get(data["mobile"], data["email"]) != data["email"]:
+                errors = {"mobile": ["Mobile already in use"]}
+
+        if errors:
+            report.append({**entry, "status": "error", "errors": errors})
+            continue
+        entry["status"] = "reactivated" if membership else "added"
+        report.append(entry)
+        plan.append((data, user, membership))
+
+    if len(plan) < len(checked) and not best_effort:
+        return False, report
+
+    new_users = User.objects.bulk_create([
+        User(email=data["email"], name=data["name"], mobile=data["mobile"], is_active=False)
+        for data, user, _ in plan if user is None
+    ])
+    created = {u.email: u for u in new_users}
+
+    filled = []
+    for data, user, _ in plan:
+        if user is not None and (not user.name or not user.mobile):
+            user.name   = user.name or data["name"]
+            user.mobile = user.mobile or data["mobile"]
+            filled.append(user)
+    if filled:
+        User.objects.bulk_update(filled, ["name", "mobile"])
+
+    Membership.objects.bulk_create([
+        Membership(user=user or created[data["email"]], pund=pund, role="MEMBER", is_active=True)
+        for data, user, membership in plan if membership is None
+    ])
+    reactivate = [membership.id for _, _, membership in plan if membership is not None]
+    if reactivate:
+        Membership.objects.filter(id__in=reactivate).update(is_active=True)
+
+    enqueue_emails([
+        (*invite_email(user, pund.name), user.email) for user in new_users
+    ])
+    if plan:
+        Pund.objects.filter(id=pund.id).bump_version()
+    return True, report
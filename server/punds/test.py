@@ -1,8 +1,15 @@
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 
+from users.models import EmailOutbox
+from .access import resolve_membership, resolve_pund
 from .models import Pund, Membership
 
 User = get_user_model()
@@ -12,6 +19,9 @@ class PundTests(APITestCase):
 
     def setUp(self):
 
+        for alias in ("default", "summaries", "throttle"):
+            caches[alias].clear()
+
         # owner user
         self.owner = User.objects.create_user(
             email="owner@test.com",
@@ -201,4 +211,115 @@ class PundTests(APITestCase):
             "name": "Updated Member"
         })
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    # ─────────────────────────
+    # DASHBOARD
+    # ─────────────────────────
+    def test_dashboard(self):
+
+        url = f"/punds/{self.pund.id}/dashboard/"
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data) - {"pund_id", "role"},
+            {"detail", "fund", "savings", "loans", "audit"}
+        )
+        self.assertEqual(response.data["detail"]["role"], "OWNER")
+
+        response = self.client.get(url, {"include": "fund"})
+
+        self.assertEqual(set(response.data), {"pund_id", "role", "fund"})
+
+        response = self.client.get(url, {"include": "my_summary"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(url, {"include": "everything"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_access_resolver(self):
+
+        Membership.objects.create(user=self.member, pund=self.pund, role="MEMBER")
+        request = SimpleNamespace(user=self.member)
+
+        with self.assertNumQueries(1):
+            pund = resolve_pund(request, self.pund.id)
+        self.assertEqual(request.membership.role, "MEMBER")
+        self.assertTrue(request.membership.is_active)
+
+        with self.assertNumQueries(1):
+            resolve_membership(request, pund)
+        with self.assertNumQueries(0):
+            resolve_membership(request, pund)
+
+        self.client.post(f"/punds/{self.pund.id}/remove-member/{self.member.id}/")
+        pund = resolve_pund(request, self.pund.id)
+
+        self.assertFalse(resolve_membership(request, pund).is_active)
+
+        outsider = SimpleNamespace(user=User.objects.create_user(email="outsider@test.com"))
+        resolve_pund(outsider, self.pund.id)
+        self.assertIsNone(outsider.membership)
+
+
+    def test_my_all_punds_constant_queries(self):
+
+        def listing_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get("/punds/my-all/", {"figures": "1", "page": 1})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(ctx.captured_queries), response.data
+
+        baseline, _ = listing_queries()
+
+        for i in range(5):
+            pund = Pund.objects.create(name=f"Extra Pund {i}", pund_type="WEEKLY", created_by=self.owner)
+            Membership.objects.create(user=self.owner, pund=pund, role="OWNER")
+            Membership.objects.create(user=self.member, pund=pund, role="MEMBER")
+
+        queries, data = listing_queries()
+
+        self.assertEqual(queries, baseline)
+        self.assertEqual(data["count"], 6)
+        self.assertEqual(data["results"][-1]["member_count"], 1)
+        self.assertIn("my_unpaid_dues", data["results"][0])
+
+
+    def test_bulk_add_members(self):
+
+        url = f"/punds/{self.pund.id}/add-members/"
+        Membership.objects.create(user=self.member, pund=self.pund, role="MEMBER", is_active=False)
+
+        csv_body = (
+            "Name,Email,Mobile\n"
+            "Member,MEMBER@test.com,9000000001\n"
+            "New One,new1@test.com,9000000002\n"
+            "New Two,new2@test.com,9000000003\n"
+            "Broken,not-an-email,9000000004\n"
+        )
+
+        response = self.client.post(url, csv_body, content_type="text/csv")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(email="new1@test.com").exists())
+        self.assertEqual(response.data["rows"][3]["status"], "error")
+
+        with self.assertNumQueries(13):  # 12 + the token-state read (no shared cache in tests)
+            response = self.client.post(f"{url}?mode=best_effort", csv_body, content_type="text/csv")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["summary"], {"added": 2, "reactivated": 1, "error": 1})
+        self.assertEqual(
+            Membership.objects.filter(pund=self.pund, role="MEMBER", is_active=True).count(), 3
+        )
+        self.assertEqual(EmailOutbox.objects.filter(recipient__startswith="new").count(), 2)
+
+        response = self.client.post(url, {"members": [
+            {"name": "New One", "email": "new1@test.com", "mobile": "9000000002"},
+        ]}, format="json")
+        self.assertEqual(response.data["rows"][0]["errors"], {"email": ["User already member"]})
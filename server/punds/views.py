@@ -6,36 +6,37 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from finance.models import FinanceAuditLog, Loan, Payment, PundStructure
+from PundLedger.pagination import list_response
+from finance.models import FinanceAuditLog, Loan, Payment
+from finance.cache import cached_fund_summary, cached_my_financial_summary, cached_saving_summary
 from finance.serializers import PaymentSerializer
+from finance.services import (
+    active_member_count,
+    annotated_loans,
+    audit_log_page,
+    pund_listing,
+    serialize_pund_listing,
+    serialize_pund_loan,
+)
+from finance.timeline import StructureTimeline
 from users.services import send_invite_email
+from .access import is_owner, resolve_pund
+from .conditional import etag_matches, not_modified, pund_etag, with_etag
 from .models import Membership, Pund
 from .serializers import AddMemberSerializer, CreatePundSerializer
+from .services import MemberImportError, import_members, parse_member_csv
 
 User = get_user_model()
 
 
 # ─── helpers ────────────────────────────────────────────────
 
-def _get_pund(pund_id, active_only=False):
-    qs = Pund.objects.filter(id=pund_id)
-    if active_only:
-        qs = qs.filter(is_active=True)
-    return qs.first()
-
-
-def _is_owner(user, pund):
-    return Membership.objects.filter(
-        user=user, pund=pund, role="OWNER", is_active=True
-    ).exists()
-
-
 def _member_count(pund):
-    return Membership.objects.filter(pund=pund, role="MEMBER", is_active=True).count()
+    return active_member_count(pund)
 
 
 def _structure_data(pund):
-    structure = PundStructure.objects.filter(pund=pund).order_by("-effective_from").first()
+    structure = StructureTimeline.for_pund(pund).latest()
     if not structure:
         return None
     return {
@@ -89,10 +90,10 @@ class AddMemberView(APIView):
 
     @transaction.atomic
     def post(self, request, pund_id):
-        pund = _get_pund(pund_id, active_only=True)
+        pund = resolve_pund(request, pund_id, active_only=True)
         if not pund:
             return Response({"error": "Pund not found or inactive"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can add members"}, status=403)
 
         serializer = AddMemberSerializer(data=request.data)
@@ -122,6 +123,7 @@ class AddMemberView(APIView):
                 return Response({"error": "User already member"}, status=400)
             membership.is_active = True
             membership.save()
+            Pund.objects.filter(id=pund.id).bump_version()
             return Response({"message": "Member reactivated"}, status=200)
 
         try:
@@ -129,36 +131,81 @@ class AddMemberView(APIView):
         except IntegrityError:
             return Response({"error": "Membership already exists"}, status=400)
 
+        Pund.objects.filter(id=pund.id).bump_version()
         if created:
             send_invite_email(user, pund.name)
 
         return Response({"message": "Member added successfully"}, status=201)
 
 
+class BulkAddMembersView(APIView):
+    """
+    Add many members at once from JSON ``{"members": [...]}`` or a CSV
+    (uploaded as ``file`` or sent as ``text/csv``) with name, email, mobile.
+    ``mode=best_effort`` applies the valid rows; the default ``atomic``
+    mode writes nothing unless every row is valid.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_cost      = 10
+
+    MAX_ROWS = 500
+    MODES    = ("atomic", "best_effort")
+
+    def _rows(self, request):
+        if request.content_type.startswith("text/csv"):
+            return parse_member_csv(request.body.decode("utf-8-sig"))
+        if "file" in request.FILES:
+            return parse_member_csv(request.FILES["file"].read().decode("utf-8-sig"))
+        rows = request.data.get("members")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise MemberImportError("Send members as a list of {name, email, mobile} objects or a CSV file")
+        return rows
+
+    @transaction.atomic
+    def post(self, request, pund_id):
+        pund = resolve_pund(request, pund_id, active_only=True)
+        if not pund:
+            return Response({"error": "Pund not found or inactive"}, status=404)
+        if not is_owner(request):
+            return Response({"error": "Only owner can add members"}, status=403)
+
+        mode = request.query_params.get("mode") or "atomic"
+        if mode not in self.MODES:
+            return Response({"error": f"mode must be one of: {', '.join(self.MODES)}"}, status=400)
+
+        try:
+            rows = self._rows(request)
+        except (MemberImportError, UnicodeDecodeError) as exc:
+            return Response({"error": str(exc)}, status=400)
+        if not rows:
+            return Response({"error": "No members to import"}, status=400)
+        if len(rows) > self.MAX_ROWS:
+            return Response({"error": f"At most {self.MAX_ROWS} members per import"}, status=400)
+
+        applied, report = import_members(pund, rows, best_effort=mode == "best_effort")
+        summary = {outcome: sum(r["status"] == outcome for r in report) for outcome in ("added", "reactivated", "error")}
+        return Response(
+            {"mode": mode, "applied": applied, "summary": summary, "rows": report},
+            status=200 if applied else 400,
+        )
+
+
 class MyAllPundsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        memberships = Membership.objects.filter(user=request.user).select_related("pund")
-        return Response([{
-            "pund_id":           m.pund.id,
-            "pund_name":         m.pund.name,
-            "pund_type":         m.pund.pund_type,
-            "pund_active":       m.pund.is_active,
-            "membership_active": m.is_active,
-            "role":              m.role,
-            "member_count":      _member_count(m.pund),
-        } for m in memberships])
+        figures = request.query_params.get("figures") in ("1", "true")
+        return list_response(request, pund_listing(request.user, figures=figures), serialize_pund_listing)
 
 
 class ClosePundView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pund_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can close pund"}, status=403)
 
         pund.is_active = False
@@ -170,6 +217,7 @@ class ClosePundView(APIView):
             description=f"Pund {pund.name} closed",
         )
         Membership.objects.filter(pund=pund).update(is_active=False)
+        Pund.objects.filter(id=pund.id).bump_version()
 
         return Response({"message": "Pund closed successfully"})
 
@@ -178,63 +226,133 @@ class ReopenPundView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pund_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can reopen"}, status=403)
 
         pund.is_active = True
         pund.save()
         Membership.objects.filter(pund=pund).update(is_active=True)
+        Pund.objects.filter(id=pund.id).bump_version()
 
         return Response({"message": "Pund reopened successfully"})
 
 
+def _pund_detail_data(user, pund, membership, member_count):
+    base = {
+        "pund_id":      pund.id,
+        "pund_name":    pund.name,
+        "pund_type":    pund.pund_type,
+        "pund_active":  pund.is_active,
+        "structure":    _structure_data(pund),
+        "member_count": member_count,
+    }
+
+    if membership.role == "OWNER":
+        member_list = [{
+            "id":                m.user.id,
+            "membership_id":     m.id,
+            "email":             m.user.email,
+            "name":              m.user.name,
+            "mobile":            m.user.mobile,
+            "role":              m.role,
+            "membership_active": m.is_active,
+            "joined_at":         getattr(m, "created_at", None),
+        } for m in Membership.objects.filter(pund=pund).select_related("user")]
+
+        return {"role": "OWNER", "members": member_list, **base}
+
+    # Member view
+    payments   = Payment.objects.filter(pund=pund, member=user)
+    serializer = PaymentSerializer(payments, many=True)
+    return {
+        "role":               "MEMBER",
+        "membership_active":  membership.is_active,
+        "my_payments":        serializer.data,
+        **base,
+    }
+
+
 class PundDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pund_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
 
-        membership = Membership.objects.filter(user=request.user, pund=pund).first()
+        membership = request.membership
         if not membership:
             return Response({"error": "Not an active member"}, status=403)
 
-        base = {
-            "pund_id":      pund.id,
-            "pund_name":    pund.name,
-            "pund_type":    pund.pund_type,
-            "pund_active":  pund.is_active,
-            "structure":    _structure_data(pund),
-            "member_count": _member_count(pund),
-        }
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        if membership.role == "OWNER":
-            member_list = [{
-                "id":                m.user.id,
-                "membership_id":     m.id,
-                "email":             m.user.email,
-                "name":              m.user.name,
-                "mobile":            m.user.mobile,
-                "role":              m.role,
-                "membership_active": m.is_active,
-                "joined_at":         getattr(m, "created_at", None),
-            } for m in Membership.objects.filter(pund=pund).select_related("user")]
-
-            return Response({"role": "OWNER", "members": member_list, **base})
-
-        # Member view
-        payments   = Payment.objects.filter(pund=pund, member=request.user)
-        serializer = PaymentSerializer(payments, many=True)
-        return Response({
-            "role":               "MEMBER",
-            "membership_active":  membership.is_active,
-            "my_payments":        serializer.data,
-            **base,
-        })
+        return with_etag(
+            Response(_pund_detail_data(request.user, pund, membership, _member_count(pund))), etag
+        )
+
+
+class PundDashboardView(APIView):
+    """Everything the pund page needs in one request; ``?include=`` picks sections."""
+    permission_classes = [IsAuthenticated]
+
+    OWNER_SECTIONS  = ("detail", "fund", "savings", "loans", "audit")
+    MEMBER_SECTIONS = ("detail", "fund", "savings", "my_summary")
+    AUDIT_LIMIT     = 50
+
+    def get(self, request, pund_id):
+        pund = resolve_pund(request, pund_id)
+        if not pund:
+            return Response({"error": "Pund not found"}, status=404)
+
+        membership = request.membership
+        if not membership:
+            return Response({"error": "Not an active member"}, status=403)
+
+        etag = pund_etag(pund, request.user)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        if not membership.is_active:
+            allowed = ("detail",)
+        elif membership.role == "OWNER":
+            allowed = self.OWNER_SECTIONS
+        else:
+            allowed = self.MEMBER_SECTIONS
+
+        include = request.query_params.get("include")
+        if include:
+            sections = list(dict.fromkeys(s.strip() for s in include.split(",") if s.strip()))
+        else:
+            sections = list(allowed)
+        unknown = [s for s in sections if s not in self.OWNER_SECTIONS + self.MEMBER_SECTIONS]
+        if unknown:
+            return Response({"error": f"Unknown section: {', '.join(unknown)}"}, status=400)
+        denied = [s for s in sections if s not in allowed]
+        if denied:
+            return Response({"error": f"Not allowed to view: {', '.join(denied)}"}, status=403)
+
+        member_count = _member_count(pund) if {"detail", "savings"} & set(sections) else None
+        data = {"pund_id": pund.id, "role": membership.role}
+
+        if "detail" in sections:
+            data["detail"] = _pund_detail_data(request.user, pund, membership, member_count)
+        if "fund" in sections:
+            data["fund"] = cached_fund_summary(pund)
+        if "savings" in sections:
+            data["savings"] = cached_saving_summary(pund, member_count=member_count)
+        if "my_summary" in sections:
+            data["my_summary"] = cached_my_financial_summary(request.user, pund)
+        if "loans" in sections:
+            data["loans"] = [serialize_pund_loan(loan) for loan in annotated_loans(Loan.objects.filter(pund=pund))]
+        if "audit" in sections:
+            data["audit"] = audit_log_page(FinanceAuditLog.objects.filter(pund=pund), self.AUDIT_LIMIT)
+
+        return with_etag(Response(data), etag)
 
 
 class RemoveMemberView(APIView):
@@ -242,10 +360,10 @@ class RemoveMemberView(APIView):
 
     @transaction.atomic
     def post(self, request, pund_id, member_id):
-        pund = _get_pund(pund_id, active_only=True)
+        pund = resolve_pund(request, pund_id, active_only=True)
         if not pund:
             return Response({"error": "Pund not found or inactive"}, status=status.HTTP_404_NOT_FOUND)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can remove members"}, status=status.HTTP_403_FORBIDDEN)
 
         membership = Membership.objects.filter(user_id=member_id, pund=pund, is_active=True).first()
@@ -262,6 +380,7 @@ class RemoveMemberView(APIView):
 
         membership.is_active = False
         membership.save()
+        Pund.objects.filter(id=pund.id).bump_version()
         return Response({"message": "Member removed successfully"})
 
 
@@ -270,10 +389,10 @@ class ReactivateMemberView(APIView):
 
     @transaction.atomic
     def post(self, request, pund_id, member_id):
-        pund = _get_pund(pund_id)
+        pund = resolve_pund(request, pund_id)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can reactivate members"}, status=403)
 
         membership = Membership.objects.filter(pund=pund, user_id=member_id, is_active=False).first()
@@ -282,6 +401,7 @@ class ReactivateMemberView(APIView):
 
         membership.is_active = True
         membership.save()
+        Pund.objects.filter(id=pund.id).bump_version()
         return Response({"message": "Member reactivated successfully"})
 
 
@@ -290,10 +410,10 @@ class OwnerEditMemberView(APIView):
 
     @transaction.atomic
     def patch(self, request, pund_id, user_id):
-        pund = _get_pund(pund_id, active_only=True)
+        pund = resolve_pund(request, pund_id, active_only=True)
         if not pund:
             return Response({"error": "Pund not found"}, status=404)
-        if not _is_owner(request.user, pund):
+        if not is_owner(request):
             return Response({"error": "Only owner can edit member"}, status=status.HTTP_403_FORBIDDEN)
 
         membership = Membership.objects.filter(pund=pund, user_id=user_id, is_active=True).first()
@@ -319,6 +439,7 @@ class OwnerEditMemberView(APIView):
                     return Response({"error": "Email already in use"}, status=400)
                 member.email = email
                 member.save()
+                Pund.objects.filter(members__user=member).bump_version()
                 return Response({"message": "Email corrected successfully"})
             return Response(
                 {"error": "Cannot edit email. Verified members must change email themselves."},
@@ -326,5 +447,6 @@ class OwnerEditMemberView(APIView):
             )
 
         member.save()
+        Pund.objects.filter(members__user=member).bump_version()
         return Response({"message": "Member updated successfully"})
     
\ No newline at end of file
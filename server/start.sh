@@ -0,0 +1,3 @@
+# Render start command: the email worker runs next to the web process, restarted if it exits.
+(while true; do python manage.py deliver_emails --loop; sleep 5; done) &
+exec gunicorn PundLedger.wsgi:application --bind 0.0.0.0:${PORT:-8000}
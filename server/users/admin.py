@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import EmailOutbox, User
 
 
 @admin.register(User)
@@ -17,4 +17,18 @@ class UserAdmin(BaseUserAdmin):
         ("Permissions",      {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
         ("Verification",     {"fields": ("email_verified",)}),
         ("Important Dates",  {"fields": ("last_login", "created_at")}),
-    )
\ No newline at end of file
+    )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and "password" in form.changed_data:  # is_active changes revoke in User.save
+            obj.revoke_tokens()
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display    = ("recipient", "subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter     = ("status",)
+    search_fields   = ("recipient", "subject")
+    ordering        = ("-created_at",)
+    readonly_fields = ("provider_id", "last_error", "created_at", "sent_at")
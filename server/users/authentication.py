@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+TOKEN_VERSION_CLAIM = "tv"
+TOKEN_STATE_TIMEOUT = 5 * 60
+
+
+def _state_key(user_id):
+    return f"token-state:{user_id}"
+
+
+def _state_cache():
+    """
+    The shared cache holding token state, or None to read it from the database.
+
+    A per-process cache would let other workers accept revoked tokens until
+    their copy expires, so state is only cached in a store every worker sees.
+    """
+    alias = getattr(settings, "TOKEN_STATE_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def remember_token_state(user):
+    state_cache = _state_cache()
+    if state_cache is not None:
+        state_cache.set(_state_key(user.id), (user.token_version, user.is_active), TOKEN_STATE_TIMEOUT)
+
+
+def token_state(user_id):
+    """``(token_version, is_active)`` for a user, served from the shared cache if any; None if the user is gone."""
+    state_cache = _state_cache()
+    state = state_cache.get(_state_key(user_id)) if state_cache is not None else None
+    if state is None:
+        state = User.objects.filter(id=user_id).values_list("token_version", "is_active").first()
+        if state is None:
+            return None
+        if state_cache is not None:
+            state_cache.set(_state_key(user_id), tuple(state), TOKEN_STATE_TIMEOUT)
+    return state
+
+
+def tokens_for_user(user):
+    """A refresh token (and, through it, access tokens) carrying the user's token version."""
+    refresh = RefreshToken.for_user(user)
+    refresh[TOKEN_VERSION_CLAIM] = user.token_version
+    remember_token_state(user)
+    return refresh
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the signed claims instead of loading the user.
+
+    Revocation and deactivation are checked against the token state (cached
+    when TOKEN_STATE_CACHE_ALIAS names a shared cache); views get a ``User.claims_only`` instance whose row loads lazily.
+    Tokens issued without a version claim fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, ValidationError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = token_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        token_version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token[TOKEN_VERSION_CLAIM] != token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        return User.claims_only(user_id, token_version, is_active)
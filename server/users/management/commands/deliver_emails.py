@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails; with --loop keep polling for new ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int,
+                            help="Emails per provider call (default: EMAIL_OUTBOX_BATCH_SIZE).")
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep running, polling the outbox every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            totals = drain_outbox(batch_size=options["batch_size"])
+            if any(totals.values()) or not options["loop"]:
+                self.stdout.write(
+                    f"{totals['sent']} sent, {totals['retried']} to retry, {totals['failed']} failed"
+                )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Email delivery complete"))
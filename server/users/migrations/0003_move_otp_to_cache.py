@@ -0,0 +1,25 @@
+# Generated by Django 4.2.29 on 2026-10-17 15:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="user",
+            name="otp",
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="otp_attempts",
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="otp_created_at",
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.29 on 2026-10-17 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_token_version"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="emailoutbox",
+            name="outbox_pending_idx",
+        ),
+        migrations.AlterField(
+            model_name="emailoutbox",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("SENDING", "Sending"),
+                    ("SENT", "Sent"),
+                    ("FAILED", "Failed"),
+                ],
+                default="PENDING",
+                max_length=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emailoutbox",
+            index=models.Index(
+                condition=models.Q(("status__in", ("PENDING", "SENDING"))),
+                fields=["next_attempt_at", "id"],
+                name="outbox_pending_idx",
+            ),
+        ),
+    ]
@@ -31,10 +31,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=False)
     is_staff  = models.BooleanField(default=False)
 
-    otp            = models.CharField(max_length=6, blank=True, null=True)
-    otp_created_at = models.DateTimeField(blank=True, null=True)
-    otp_attempts   = models.IntegerField(default=0)
     email_verified = models.BooleanField(default=False)
+    token_version  = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(default=timezone.now)
 
@@ -50,4 +48,86 @@ class User(AbstractBaseUser, PermissionsMixin):
     objects        = UserManager()
 
     def __str__(self):
-        return self.email
\ No newline at end of file
+        return self.email
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._loaded_is_active = user.__dict__.get("is_active")
+        return user
+
+    @classmethod
+    def claims_only(cls, user_id, token_version, is_active):
+        """
+        A user built from verified token claims and token state without touching the database.
+
+        The first access to any other field loads the whole row in one query.
+        """
+        user = cls.from_db(None, ["id", "is_active", "token_version"], [user_id, is_active, token_version])
+        user._claims_only = True
+        return user
+
+    def save(self, *args, **kwargs):
+        """
+        Saving a change to ``is_active`` revokes the user's tokens.
+
+        That refreshes the cached token state, so stateless authentication
+        sees a deactivation at once. ``QuerySet.update(is_active=...)``
+        bypasses this and must be followed by ``revoke_tokens()``.
+        """
+        update_fields = kwargs.get("update_fields")
+        active_changed = (
+            not self._state.adding
+            and (update_fields is None or "is_active" in update_fields)
+            and self.__dict__.get("_loaded_is_active", self.is_active) != self.is_active
+        )
+        super().save(*args, **kwargs)
+        self._loaded_is_active = self.is_active
+        if active_changed:
+            self.revoke_tokens()
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        if fields is not None and self.__dict__.pop("_claims_only", False):
+            fields = list(self.get_deferred_fields())
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
+    def revoke_tokens(self):
+        """Invalidate every JWT issued to this user so far."""
+        from .authentication import remember_token_state
+
+        User.objects.filter(id=self.id).update(token_version=models.F("token_version") + 1)
+        self.refresh_from_db(fields=["token_version", "is_active"])
+        remember_token_state(self)
+
+
+class EmailOutbox(models.Model):
+    """Outbound email queued by request code and delivered by ``deliver_emails``."""
+
+    STATUS_CHOICES = (
+        ("PENDING", "Pending"),
+        ("SENDING", "Sending"),
+        ("SENT",    "Sent"),
+        ("FAILED",  "Failed"),
+    )
+
+    recipient       = models.EmailField()
+    subject         = models.CharField(max_length=255)
+    html            = models.TextField()
+    status          = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    attempts        = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error      = models.TextField(blank=True)
+    provider_id     = models.CharField(max_length=100, blank=True)
+    created_at      = models.DateTimeField(default=timezone.now)
+    sent_at         = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at", "id"], name="outbox_pending_idx",
+                condition=models.Q(status__in=("PENDING", "SENDING")),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} - {self.subject} ({self.status})"
@@ -0,0 +1,88 @@
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+OTP_EXPIRY_MINUTES    = 5
+OTP_MAX_ATTEMPTS      = 5
+VERIFIED_EXPIRY_HOURS = 1
+
+
+class OTPError(Exception):
+    """Raised when an OTP check fails; the message is safe to show to the user."""
+
+
+def _cache():
+    return caches[getattr(settings, "OTP_CACHE_ALIAS", "default")]
+
+
+def _key(kind, email):
+    return f"otp:{kind}:{email.strip().lower()}"
+
+
+def _digest(email, code):
+    return salted_hmac("users.otp", f"{email.strip().lower()}:{code}").hexdigest()
+
+
+def generate_otp():
+    return str(secrets.randbelow(900000) + 100000)
+
+
+def issue_otp(email):
+    """
+    Create a fresh OTP for ``email`` and return it.
+
+    Only a digest is stored; it and its attempt counter expire on their own
+    after OTP_EXPIRY_MINUTES, so nothing needs cleaning up.
+    """
+    code    = generate_otp()
+    timeout = OTP_EXPIRY_MINUTES * 60
+    _cache().set_many({
+        _key("code", email):     _digest(email, code),
+        _key("attempts", email): 0,
+    }, timeout)
+    return code
+
+
+def check_otp(email, code, consume=False):
+    """
+    Raise ``OTPError`` unless ``code`` is the live OTP for ``email``.
+
+    Every check counts against OTP_MAX_ATTEMPTS through a cache counter.
+    The counter is only atomic on Redis: the DatabaseCache fallback increments
+    with a read-modify-write, so checks racing in parallel can go a few past
+    the limit, bounded by the otp / otp_email throttles.
+    With ``consume`` a successful check also discards the OTP.
+    """
+    cache  = _cache()
+    stored = cache.get(_key("code", email))
+    if stored is None:
+        raise OTPError("OTP expired or not requested")
+    try:
+        attempts = cache.incr(_key("attempts", email))
+    except ValueError:  # counter expired together with the code
+        raise OTPError("OTP expired or not requested")
+    if attempts > OTP_MAX_ATTEMPTS:
+        raise OTPError("Too many OTP attempts")
+    if not constant_time_compare(stored, _digest(email, code or "")):
+        raise OTPError("Invalid OTP")
+    if consume:
+        discard_otp(email)
+
+
+def discard_otp(email):
+    _cache().delete_many([_key("code", email), _key("attempts", email)])
+
+
+def mark_email_verified(email):
+    """Remember that ``email`` passed OTP verification, so signup can create the account."""
+    _cache().set(_key("verified", email), True, VERIFIED_EXPIRY_HOURS * 60 * 60)
+
+
+def is_email_verified(email):
+    return bool(_cache().get(_key("verified", email)))
+
+
+def clear_email_verified(email):
+    _cache().delete(_key("verified", email))
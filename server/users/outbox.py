@@ -0,0 +1,196 @@
+import logging
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS  = 6 * 60 * 60
+SENDING_LEASE      = timedelta(minutes=10)
+
+
+class EmailRejected(Exception):
+    """The provider refused the request itself (bad recipient, invalid payload); retrying will not help."""
+
+
+# ─── Transports ─────────────────────────────────────────────
+
+class ResendTransport:
+    """Resend's batch endpoint over one keep-alive HTTP session."""
+
+    URL       = "https://api.resend.com/emails/batch"
+    TIMEOUT   = 10
+    max_batch = 100
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {settings.RESEND_API_KEY}"})
+
+    def send_batch(self, messages):
+        """
+        Send ``messages``; returns provider ids in order.
+
+        Raises EmailRejected on a 4xx other than 429 (Resend validates the
+        whole batch, so one bad message rejects all of them) and
+        ``requests`` errors on anything else.
+        """
+        response = self.session.post(self.URL, timeout=self.TIMEOUT, json=[{
+            "from":    settings.EMAIL_FROM,
+            "to":      [message.recipient],
+            "subject": message.subject,
+            "html":    message.html,
+        } for message in messages])
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            raise EmailRejected(f"{response.status_code}: {response.text[:500]}")
+        response.raise_for_status()
+        return [item.get("id", "") for item in response.json().get("data", [])]
+
+
+class LocmemTransport:
+    """Collects messages in ``LocmemTransport.sent`` instead of sending them (tests, local dev)."""
+
+    sent      = []
+    max_batch = 100
+
+    def send_batch(self, messages):
+        LocmemTransport.sent.extend(messages)
+        return [f"locmem-{message.id}" for message in messages]
+
+
+_transports = {}
+
+
+def get_transport():
+    """The configured transport, created once per process so its session is reused."""
+    path = settings.EMAIL_TRANSPORT
+    if path not in _transports:
+        _transports[path] = import_string(path)()
+    return _transports[path]
+
+
+# ─── Delivery ───────────────────────────────────────────────
+
+def enqueue_email(subject, html, recipient):
+    return EmailOutbox.objects.create(subject=subject, html=html, recipient=recipient)
+
+
+def enqueue_emails(messages):
+    """Queue many ``(subject, html, recipient)`` emails in one INSERT."""
+    return EmailOutbox.objects.bulk_create([
+        EmailOutbox(subject=subject, html=html, recipient=recipient)
+        for subject, html, recipient in messages
+    ])
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def _claim(batch_size, now):
+    """
+    Mark up to ``batch_size`` due emails SENDING and return them.
+
+    The claim is one short SELECT ... FOR UPDATE SKIP LOCKED transaction, so
+    any number of workers can run side by side without holding row locks
+    through the provider call. A SENDING row whose worker died is claimable
+    again once its lease (SENDING_LEASE) runs out.
+    """
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=("PENDING", "SENDING"), next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        EmailOutbox.objects.filter(id__in=[message.id for message in batch]).update(
+            status="SENDING", next_attempt_at=now + SENDING_LEASE,
+        )
+    return batch
+
+
+def _send(transport, messages):
+    """
+    Yield ``(message, provider_id, error, rejected)`` for each of ``messages``.
+
+    A rejected batch is split in halves until the rejected messages are on
+    their own, so one bad recipient does not hold back the rest.
+    """
+    try:
+        provider_ids = list(transport.send_batch(messages))
+    except EmailRejected as exc:
+        if len(messages) == 1:
+            yield messages[0], "", exc, True
+            return
+        middle = len(messages) // 2
+        yield from _send(transport, messages[:middle])
+        yield from _send(transport, messages[middle:])
+        return
+    except Exception as exc:
+        logger.warning("Email batch of %d failed: %s", len(messages), exc)
+        for message in messages:
+            yield message, "", exc, False
+        return
+
+    provider_ids += [""] * (len(messages) - len(provider_ids))
+    for message, provider_id in zip(messages, provider_ids):
+        yield message, provider_id or "", None, False
+
+
+def deliver_outbox(batch_size=None, transport=None):
+    """
+    Claim one batch of due emails, send it, and record the outcome.
+
+    The provider is called outside the claiming transaction. A message the
+    provider rejects is marked FAILED on its own; other failures are
+    retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS, then
+    marked FAILED. Returns counts of sent, retried and failed emails.
+    """
+    transport  = transport or get_transport()
+    batch_size = min(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE, transport.max_batch)
+    counts     = {"sent": 0, "retried": 0, "failed": 0}
+    now        = timezone.now()
+
+    batch = _claim(batch_size, now)
+    if not batch:
+        return counts
+
+    for message, provider_id, error, rejected in _send(transport, batch):
+        message.attempts += 1
+        if error is None:
+            message.status      = "SENT"
+            message.provider_id = provider_id
+            message.sent_at     = now
+            message.last_error  = ""
+            counts["sent"] += 1
+            continue
+
+        message.last_error = str(error)[:1000]
+        if rejected or message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            message.status = "FAILED"
+            counts["failed"] += 1
+        else:
+            message.status          = "PENDING"
+            message.next_attempt_at = now + _retry_delay(message.attempts)
+            counts["retried"] += 1
+
+    EmailOutbox.objects.bulk_update(
+        batch, ["status", "attempts", "next_attempt_at", "last_error", "provider_id", "sent_at"]
+    )
+    return counts
+
+
+def drain_outbox(batch_size=None, transport=None):
+    """Deliver batches until nothing is due; returns the summed counts."""
+    totals = {"sent": 0, "retried": 0, "failed": 0}
+    while True:
+        counts = deliver_outbox(batch_size=batch_size, transport=transport)
+        for key, value in counts.items():
+            totals[key] += value
+        if not any(counts.values()):
+            return totals
@@ -1,49 +1,12 @@
-import secrets
-from datetime import timedelta
-
 from django.conf import settings
-from django.utils import timezone
-import resend
-
 
-def generate_otp():
-    return str(secrets.randbelow(900000) + 100000)
+from .otp import issue_otp
+from .outbox import enqueue_email
 
 
 def send_html_email(subject, html_content, recipient):
-
-    resend.api_key = settings.RESEND_API_KEY
-
-    try:
-        resend.Emails.send({
-            "from": "PUNDX <dlegacy@pundx.co.in>",
-            "to": [recipient],
-            "subject": subject,
-            "html": html_content,
-        })
-
-        print("Email sent successfully")
-
-    except Exception as e:
-        print("EMAIL ERROR:", e)
-
-
-def verify_otp(user, otp):
-
-    if not user.otp or user.otp != otp:
-        user.otp_attempts += 1
-        user.save()
-        return False, "Invalid OTP"
-
-    if timezone.now() > user.otp_created_at + timedelta(minutes=5):
-        return False, "OTP Expired"
-
-    user.email_verified = True
-    user.otp = None
-    user.otp_created_at = None
-    user.save()
-
-    return True, "OTP Verified"
+    """Queue an email; ``python manage.py deliver_emails`` sends it outside the request."""
+    enqueue_email(subject, html_content, recipient)
 
 
 def email_template(title, content):
@@ -100,7 +63,8 @@ def email_template(title, content):
     """
 
 
-def send_invite_email(user, pund_name):
+def invite_email(user, pund_name):
+    """Subject and HTML of the invitation sent to a newly added member."""
 
     subject = f"You've been added to {pund_name}"
 
@@ -129,7 +93,12 @@ def send_invite_email(user, pund_name):
     </div>
     """
 
-    html_content = email_template("Group Invitation", content)
+    return subject, email_template("Group Invitation", content)
+
+
+def send_invite_email(user, pund_name):
+
+    subject, html_content = invite_email(user, pund_name)
 
     send_html_email(subject, html_content, user.email)
 
@@ -168,14 +137,9 @@ def send_loan_approved_email(user, loan):
     send_html_email(subject, html_content, user.email) 
 
 
-def send_otp_email(user, target_email=None):
-
-    otp = generate_otp()
+def send_otp_email(email):
 
-    user.otp = otp
-    user.otp_created_at = timezone.now()
-    user.otp_attempts = 0
-    user.save()
+    otp = issue_otp(email)
 
     subject = "PUNDX - Your Verification Code"
 
@@ -205,7 +169,7 @@ def send_otp_email(user, target_email=None):
     <h2 style="color:#1E88E5;margin-bottom:10px;">Verify Your Email</h2>
 
     <p style="color:#555;font-size:15px;">
-    Hello {user.email},<br><br>
+    Hello {email},<br><br>
     Use the following OTP to verify your PUNDX account.
     </p>
 
@@ -252,4 +216,4 @@ def send_otp_email(user, target_email=None):
     </html>
     """
 
-    send_html_email(subject, html_content, target_email or user.email)
+    send_html_email(subject, html_content, email)
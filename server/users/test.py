@@ -1,14 +1,29 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from punds.models import Membership, Pund
 
-from .models import User
+from .authentication import StatelessJWTAuthentication
+from .models import EmailOutbox, User
+from .otp import OTPError, check_otp, issue_otp
+from .outbox import EmailRejected, LocmemTransport, deliver_outbox, drain_outbox
+from .throttles import OTPEmailThrottle, OTPThrottle
 
 
 class UserAuthTests(APITestCase):
 
     def setUp(self):
+        for alias in ("default", "otp", "throttle"):
+            caches[alias].clear()
+
         self.email = "test@example.com"
         self.password = "StrongPass123"
 
@@ -35,6 +50,17 @@ class UserAuthTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("message", response.data)
 
+    def test_send_otp_throttled_per_email(self):
+        url = reverse("send-otp")
+
+        # a different IP each time, so only the per-email limit (5/minute) applies
+        codes = [
+            self.client.post(url, {"email": "flood@example.com"}, REMOTE_ADDR=f"10.0.1.{i}").status_code
+            for i in range(6)
+        ]
+
+        self.assertEqual(codes, [status.HTTP_200_OK] * 5 + [status.HTTP_429_TOO_MANY_REQUESTS])
+
 
     # ─────────────────────────────
     # VERIFY OTP
@@ -43,16 +69,15 @@ class UserAuthTests(APITestCase):
 
         user = User.objects.create(
             email="verify@test.com",
-            otp="123456",
-            otp_created_at=timezone.now(),
             is_active=False
         )
+        otp = issue_otp(user.email)
 
         url = reverse("verify-otp")
 
         response = self.client.post(url, {
             "email": user.email,
-            "otp": "123456"
+            "otp": otp
         })
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -84,6 +109,9 @@ class UserAuthTests(APITestCase):
             email_verified=True,
             is_active=False
         )
+        # invited to a pund before registering
+        pund = Pund.objects.create(name="Invite Pund", pund_type="MONTHLY", created_by=self.user)
+        Membership.objects.create(user=user, pund=pund, role="MEMBER")
 
         url = reverse("register")
 
@@ -98,6 +126,7 @@ class UserAuthTests(APITestCase):
 
         user.refresh_from_db()
         self.assertTrue(user.is_active)
+        self.assertEqual(Pund.objects.get(id=pund.id).version, pund.version + 1)
 
 
     # ─────────────────────────────
@@ -121,16 +150,15 @@ class UserAuthTests(APITestCase):
 
         user = User.objects.create(
             email="reset@test.com",
-            otp="123456",
-            otp_created_at=timezone.now(),
             is_active=True
         )
+        otp = issue_otp(user.email)
 
         url = reverse("reset-password")
 
         response = self.client.post(url, {
             "email": user.email,
-            "otp": "123456",
+            "otp": otp,
             "new_password": "NewPass123"
         })
 
@@ -199,4 +227,206 @@ class UserAuthTests(APITestCase):
             "name": "Updated Name"
         })
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+    # ─────────────────────────────
+    # EMAIL OUTBOX
+    # ─────────────────────────────
+    def test_email_outbox_delivery(self):
+
+        self.client.post(reverse("send-otp"), {"email": "outbox@example.com"})
+
+        message = EmailOutbox.objects.get(recipient="outbox@example.com")
+        self.assertEqual(message.status, "PENDING")
+
+        transport = LocmemTransport()
+        LocmemTransport.sent.clear()
+        totals = drain_outbox(transport=transport)
+
+        message.refresh_from_db()
+        self.assertEqual(totals["sent"], 1)
+        self.assertEqual(message.status, "SENT")
+        self.assertEqual(message.provider_id, f"locmem-{message.id}")
+        self.assertEqual([m.id for m in LocmemTransport.sent], [message.id])
+
+    def test_email_outbox_retry_backoff(self):
+
+        class FailingTransport:
+            max_batch = 10
+
+            def send_batch(self, messages):
+                raise ConnectionError("provider down")
+
+        message = EmailOutbox.objects.create(recipient="retry@example.com", subject="Hi", html="<p>Hi</p>")
+
+        counts = deliver_outbox(transport=FailingTransport())
+        message.refresh_from_db()
+
+        self.assertEqual(counts["retried"], 1)
+        self.assertEqual(message.status, "PENDING")
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertIn("provider down", message.last_error)
+
+        # not due yet, so a second run claims nothing
+        self.assertEqual(deliver_outbox(transport=FailingTransport())["retried"], 0)
+
+    def test_email_outbox_rejected_message_fails_alone(self):
+
+        class StrictTransport(LocmemTransport):
+
+            def send_batch(self, messages):
+                if any(m.recipient == "bad@example.com" for m in messages):
+                    raise EmailRejected("422: invalid recipient")
+                return super().send_batch(messages)
+
+        for recipient in ("a@example.com", "bad@example.com", "b@example.com"):
+            EmailOutbox.objects.create(recipient=recipient, subject="Hi", html="<p>Hi</p>")
+
+        LocmemTransport.sent.clear()
+        counts = deliver_outbox(transport=StrictTransport())
+
+        self.assertEqual((counts["sent"], counts["failed"], counts["retried"]), (2, 1, 0))
+        self.assertEqual(
+            dict(EmailOutbox.objects.values_list("recipient", "status")),
+            {"a@example.com": "SENT", "bad@example.com": "FAILED", "b@example.com": "SENT"},
+        )
+
+
+    # ─────────────────────────────
+    # OTP STORE
+    # ─────────────────────────────
+    def test_signup_otp_flow_without_user_row(self):
+
+        email = "signup@example.com"
+        self.client.post(reverse("send-otp"), {"email": email})
+
+        self.assertFalse(User.objects.filter(email=email).exists())
+
+        otp = issue_otp(email)
+        response = self.client.post(reverse("verify-otp"), {"email": email, "otp": otp})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse("register"), {
+            "email": email, "name": "Signup", "mobile": "9876500000", "password": "TestPass123",
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(User.objects.get(email=email).email_verified)
+
+    def test_otp_attempt_limit(self):
+
+        otp = issue_otp(self.email)
+
+        # checked directly: five requests through the view would trip OTPThrottle first
+        for _ in range(5):
+            with self.assertRaisesMessage(OTPError, "Invalid OTP"):
+                check_otp(self.email, "000000")
+
+        response = self.client.post(reverse("verify-otp"), {"email": self.email, "otp": otp})
+        self.assertEqual(response.data["error"], "Too many OTP attempts")
+
+
+    # ─────────────────────────────
+    # STATELESS JWT
+    # ─────────────────────────────
+    def test_stateless_jwt_and_revocation(self):
+
+        login = self.client.post(reverse("login"), {"email": self.email, "password": self.password})
+        access = AccessToken(login.data["access"])
+        auth = StatelessJWTAuthentication()
+
+        with self.assertNumQueries(1):  # no shared cache: state comes from the user row
+            auth.get_user(access)
+        with override_settings(TOKEN_STATE_CACHE_ALIAS="default"):
+            auth.get_user(access)
+            with self.assertNumQueries(0):
+                user = auth.get_user(access)
+        self.assertEqual(user.pk, self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.email)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + login.data["access"])
+        response = self.client.post(reverse("change-password"), {
+            "current_password": self.password,
+            "new_password": "AnotherPass123",
+            "confirm_password": "AnotherPass123",
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertRaises(AuthenticationFailed):
+            auth.get_user(access)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + response.data["access"])
+        self.assertEqual(self.client.get(reverse("edit-profile")).status_code, status.HTTP_200_OK)
+
+    def test_deactivation_rejects_cached_tokens(self):
+
+        login = self.client.post(reverse("login"), {"email": self.email, "password": self.password})
+        access = AccessToken(login.data["access"])
+        auth = StatelessJWTAuthentication()
+
+        with override_settings(TOKEN_STATE_CACHE_ALIAS="default"):
+            auth.get_user(access)  # token state now cached
+
+            user = User.objects.get(id=self.user.id)
+            user.is_active = False
+            user.save()
+            with self.assertRaisesMessage(AuthenticationFailed, "inactive"):
+                auth.get_user(access)
+
+            user.is_active = True
+            user.save()
+            with self.assertRaisesMessage(AuthenticationFailed, "revoked"):
+                auth.get_user(access)
+
+
+    # ─────────────────────────────
+    # SLIDING WINDOW THROTTLE
+    # ─────────────────────────────
+    def test_sliding_window_throttle(self):
+
+        class ThreePerMinute(OTPEmailThrottle):
+            rate = "3/minute"
+
+        class ThreePerMinutePerIP(OTPThrottle):
+            rate = "3/minute"
+
+        class View:
+            throttle_cost = 1
+
+        factory = APIRequestFactory()
+
+        def allowed(email, ip="10.0.0.1", cost=1, throttle=ThreePerMinute):
+            request = factory.post("/", {"email": email}, format="json", REMOTE_ADDR=ip)
+            request.data = {"email": email}
+            View.throttle_cost = cost
+            return throttle().allow_request(request, View)
+
+        with mock.patch("users.throttles.time.time", return_value=600.0):
+            # keyed on the email, not the caller's address
+            self.assertEqual([allowed("A@x.com", ip=f"10.0.0.{i}") for i in range(4)], [True, True, True, False])
+            self.assertTrue(allowed("b@x.com"))
+            self.assertFalse(allowed("c@x.com", cost=4))
+            self.assertTrue(allowed("c@x.com", cost=3))
+
+        # half way into the next window, half of the previous three still count
+        with mock.patch("users.throttles.time.time", return_value=690.0):
+            self.assertTrue(allowed("a@x.com"))
+            self.assertFalse(allowed("a@x.com"))
+
+        with mock.patch("users.throttles.time.time", return_value=780.0):
+            self.assertTrue(allowed("a@x.com"))
+
+        # callers' weights multiply the view's cost
+        with mock.patch("users.throttles.time.time", return_value=800.0), \
+                override_settings(THROTTLE_COST_WEIGHTS={"anon": 3}):
+            self.assertTrue(allowed("d@x.com"))
+            self.assertFalse(allowed("d@x.com"))
+
+        # the per-IP scope stops one client spraying many addresses
+        with mock.patch("users.throttles.time.time", return_value=900.0):
+            self.assertEqual(
+                [allowed(f"user{i}@x.com", ip="10.0.0.9", throttle=ThreePerMinutePerIP) for i in range(4)],
+                [True, True, True, False],
+            )
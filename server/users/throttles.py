@@ -1,22 +1,157 @@
-from rest_framework.throttling import SimpleRateThrottle
+import time
 
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
 
-class LoginThrottle(SimpleRateThrottle):
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Sliding-window counter throttle backed by the shared cache.
+
+    Each key keeps one integer per fixed window; the current count is the
+    previous window weighted by how much of it still overlaps plus the
+    current window. A check is one GET and one atomic INCR, so limits hold
+    across every worker using the same cache (Redis in production, local
+    memory as the stand-in). A request counts ``throttle_cost`` of its view
+    times the caller's ``get_weight``.
+    """
+
+    scope = None
+    rate  = None
+
+    def __init__(self):
+        if not self.rate:
+            self.rate = api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        self.num_requests, self.period = self.parse_rate(self.rate)
+        self.cache = caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+        self._wait = None
+
+    @staticmethod
+    def parse_rate(rate):
+        num, period = rate.split("/")
+        return int(num), PERIODS[period[0]]
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError(".get_cache_key() must be overridden")
+
+    def get_weight(self, request):
+        """
+        Cost multiplier for the caller, from THROTTLE_COST_WEIGHTS ("anon" / "user").
+
+        Only the authentication state is consulted: reading anything else off
+        a stateless JWT user would load its row. Override for finer weights.
+        """
+        user = getattr(request, "user", None)
+        role = "user" if user is not None and user.is_authenticated else "anon"
+        return getattr(settings, "THROTTLE_COST_WEIGHTS", {}).get(role, 1)
+
+    def get_cost(self, request, view):
+        return getattr(view, "throttle_cost", 1) * self.get_weight(request)
+
+    def _incr(self, key, amount):
+        try:
+            return self.cache.incr(key, amount)
+        except ValueError:
+            # first hit in this window; counters outlive the window that follows them
+            if self.cache.add(key, amount, timeout=2 * self.period):
+                return amount
+            return self.cache.incr(key, amount)
+
+    def allow_request(self, request, view):
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+
+        now      = time.time()
+        window   = int(now // self.period)
+        overlap  = 1 - (now % self.period) / self.period
+        base     = f"throttle:{self.scope}:{ident}"
+        cost     = self.get_cost(request, view)
+
+        previous = self.cache.get(f"{base}:{window - 1}", 0)
+        current  = self._incr(f"{base}:{window}", cost)
+        if previous * overlap + current <= self.num_requests:
+            return True
+
+        # rejected requests do not count against the client
+        self.cache.decr(f"{base}:{window}", cost)
+        current -= cost
+        self._wait = self._seconds_until_allowed(previous, current, cost, now % self.period)
+        return False
+
+    def _seconds_until_allowed(self, previous, current, cost, elapsed):
+        room = self.num_requests - current - cost
+        if room < 0 or not previous:
+            return self.period - elapsed
+        # the previous window's weight must decay to ``room``
+        fraction_needed = 1 - room / previous
+        return max(0.0, fraction_needed * self.period - elapsed)
+
+    def wait(self):
+        return self._wait
+
+
+class AnonThrottle(SlidingWindowThrottle):
+    scope = "anon"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserThrottle(SlidingWindowThrottle):
+    scope = "user"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return self.get_ident(request)
+
+
+class LoginThrottle(SlidingWindowThrottle):
     scope = "login"
 
     def get_cache_key(self, request, view):
         return self.get_ident(request)
 
 
-class OTPThrottle(SimpleRateThrottle):
+class _EmailThrottle(SlidingWindowThrottle):
+    """
+    Keyed on the submitted email so one address cannot be hammered from many IPs.
+
+    Always paired with a per-IP scope, which stops one client from spraying
+    requests across many addresses.
+    """
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(email, str) and email.strip():
+            return f"email:{email.strip().lower()}"
+        return None
+
+
+class OTPThrottle(SlidingWindowThrottle):
     scope = "otp"
 
     def get_cache_key(self, request, view):
         return self.get_ident(request)
 
 
-class PasswordResetThrottle(SimpleRateThrottle):
+class OTPEmailThrottle(_EmailThrottle):
+    scope = "otp_email"
+
+
+class PasswordResetThrottle(SlidingWindowThrottle):
     scope = "password_reset"
 
     def get_cache_key(self, request, view):
-        return self.get_ident(request)
\ No newline at end of file
+        return self.get_ident(request)
+
+
+class PasswordResetEmailThrottle(_EmailThrottle):
+    scope = "password_reset_email"
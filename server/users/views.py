@@ -1,17 +1,19 @@
-from datetime import timedelta
-
 from django.contrib.auth import authenticate
-from django.utils import timezone
+from django.db import IntegrityError
 
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from .throttles import LoginThrottle, OTPThrottle, PasswordResetThrottle
+from punds.models import Pund
+from .throttles import (
+    LoginThrottle, OTPEmailThrottle, OTPThrottle, PasswordResetEmailThrottle, PasswordResetThrottle,
+)
 
+from .authentication import tokens_for_user
 from .models import User
+from .otp import OTPError, check_otp, clear_email_verified, is_email_verified, mark_email_verified
 from .serializers import (
     ChangePasswordSerializer,
     LoginSerializer,
@@ -23,15 +25,10 @@ from .serializers import (
 )
 from .services import send_otp_email
 
-OTP_EXPIRY_MINUTES = 5
-
-
-def _otp_expired(user):
-    return timezone.now() > user.otp_created_at + timedelta(minutes=OTP_EXPIRY_MINUTES)
-
 
 class SendOTPView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPThrottle, OTPEmailThrottle]
 
     def post(self, request):
 
@@ -58,17 +55,14 @@ class SendOTPView(APIView):
                 status=400
             )
 
-        # Create user if not exists
-        if not user:
-            user = User.objects.create(email=email)
-
-        send_otp_email(user)
+        # No account row until registration; the OTP lives in the OTP store
+        send_otp_email(email)
 
         return Response({"message": "OTP sent successfully"})
 
 class VerifyOTPView(APIView):
     permission_classes = [AllowAny]
-    throttle_classes = [OTPThrottle]
+    throttle_classes = [OTPThrottle, OTPEmailThrottle]
 
     def post(self, request):
         serializer = VerifyOTPSerializer(data=request.data)
@@ -78,26 +72,14 @@ class VerifyOTPView(APIView):
         email = serializer.validated_data["email"]
         otp   = serializer.validated_data["otp"]
 
+        # Not consumed: the forgot-password flow verifies first, then resets with the same OTP
         try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+            check_otp(email, otp)
+        except OTPError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if user.otp_attempts >= 5:
-            return Response({"error": "Too many OTP attempts"}, status=status.HTTP_400_BAD_REQUEST)
-
-        if not user.otp or user.otp != otp:
-            user.otp_attempts += 1
-            user.save()
-            return Response({"error": "Invalid OTP"}, status=status.HTTP_400_BAD_REQUEST)
-
-        if _otp_expired(user):
-            return Response({"error": "OTP expired"}, status=status.HTTP_400_BAD_REQUEST)
-
-        user.email_verified        = True
-        user.otp_verified_for_reset = True
-        user.otp_attempts          = 0
-        user.save()
+        mark_email_verified(email)
+        User.objects.filter(email=email, email_verified=False).update(email_verified=True)
         return Response({"message": "OTP verified successfully"})
 
 
@@ -120,19 +102,26 @@ class RegisterView(APIView):
                 status=400
             )
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            return Response({"error": "Send OTP first"}, status=400)
-
-        if not user.email_verified:
+        user = User.objects.filter(email=email).first()
+        if not (user and user.email_verified) and not is_email_verified(email):
             return Response({"error": "Verify email first"}, status=400)
 
+        invited = user is not None  # added to punds before registering
+        if not invited:
+            user = User(email=email)
+        user.email_verified = True
         user.name = serializer.validated_data["name"]
         user.mobile = mobile
         user.is_active = True
         user.set_password(serializer.validated_data["password"])
-        user.save()
+        try:
+            user.save()
+        except IntegrityError:
+            return Response({"error": "Email or mobile already registered"}, status=400)
+        if invited:
+            # member lists, dashboards and summaries show the new name / mobile
+            Pund.objects.filter(members__user=user).bump_version()
+        clear_email_verified(email)
 
         return Response({"message": "Registration completed successfully"})
 
@@ -156,13 +145,13 @@ class LoginView(APIView):
         if not user.is_active:
             return Response({"error": "Account not active"}, status=status.HTTP_400_BAD_REQUEST)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         return Response({"refresh": str(refresh), "access": str(refresh.access_token)})
 
 
 class ForgotPasswordSendOTPView(APIView):
     permission_classes = [AllowAny]
-    throttle_classes = [PasswordResetThrottle]
+    throttle_classes = [PasswordResetThrottle, PasswordResetEmailThrottle]
 
     def post(self, request):
         serializer = SendOTPSerializer(data=request.data)
@@ -178,7 +167,7 @@ class ForgotPasswordSendOTPView(APIView):
         if not user.is_active:
             return Response({"error": "Account not active"}, status=status.HTTP_400_BAD_REQUEST)
 
-        send_otp_email(user)
+        send_otp_email(user.email)
         return Response({"message": "OTP sent for password reset"})
 
 
@@ -199,18 +188,14 @@ class ResetPasswordView(APIView):
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=400)
 
-        if not user.otp or not user.otp_created_at:
-            return Response({"error": "No OTP found"}, status=400)
-        if user.otp != otp:
-            return Response({"error": "Invalid OTP"}, status=400)
-        if _otp_expired(user):
-            return Response({"error": "OTP expired"}, status=400)
+        try:
+            check_otp(email, otp, consume=True)
+        except OTPError as exc:
+            return Response({"error": str(exc)}, status=400)
 
         user.set_password(new_password)
-        user.otp                    = None
-        user.otp_created_at         = None
-        user.otp_verified_for_reset = False
-        user.save()
+        user.save(update_fields=["password"])
+        user.revoke_tokens()
         return Response({"message": "Password reset successful"})
 
 
@@ -228,7 +213,15 @@ class ChangePasswordView(APIView):
 
         user.set_password(serializer.validated_data["new_password"])
         user.save()
-        return Response({"message": "Password changed successfully"})
+        user.revoke_tokens()
+
+        # other sessions are signed out; this one continues with fresh tokens
+        refresh = tokens_for_user(user)
+        return Response({
+            "message": "Password changed successfully",
+            "refresh": str(refresh),
+            "access":  str(refresh.access_token),
+        })
 
 
 class EditProfileView(APIView):
@@ -253,10 +246,11 @@ class EditProfileView(APIView):
                 return Response({"error": "Email already in use"}, status=400)
             user.pending_email = email
             user.save()
-            send_otp_email(user, target_email=email)
+            send_otp_email(email)
             return Response({"message": "OTP sent to new email. Verify to complete change."})
 
         user.save()
+        Pund.objects.filter(members__user=user).bump_version()
         return Response({"message": "Profile updated successfully"})
 
 
@@ -269,15 +263,15 @@ class VerifyEmailChangeView(APIView):
 
         if not user.pending_email:
             return Response({"error": "No pending email change"}, status=400)
-        if user.otp != otp:
-            return Response({"error": "Invalid OTP"}, status=400)
-        if _otp_expired(user):
-            return Response({"error": "OTP expired"}, status=400)
+        try:
+            check_otp(user.pending_email, otp, consume=True)
+        except OTPError as exc:
+            return Response({"error": str(exc)}, status=400)
 
         user.email         = user.pending_email
         user.pending_email = None
         user.email_verified = True
-        user.otp           = None
         user.save()
+        Pund.objects.filter(members__user=user).bump_version()
         return Response({"message": "Email updated successfully"})
     
\ No newline at end of file